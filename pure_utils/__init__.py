@@ -5,6 +5,7 @@ __version__ = "0.9.0"
 from .common import *  # noqa: F401, F403
 from .containers import *  # noqa: F401, F403
 from .debug import *  # noqa: F401, F403
+from .metrics import *  # noqa: F401, F403
 from .profiler import *  # noqa: F401, F403
 from .repeaters import *  # noqa: F401, F403
 from .strings import *  # noqa: F401, F403
@@ -0,0 +1,194 @@
+"""Internal module with latency stats (aggregated execution time measurements)."""
+
+from collections import deque
+from threading import Lock
+from typing import Mapping
+
+# Number of bits of the sub-bucket index (2**4 = 16 sub-buckets per power of two),
+# so relative error of quantiles does not exceed 1 / 16 (~6%).
+SUB_BUCKET_BITS: int = 4
+SUB_BUCKETS_COUNT: int = 1 << SUB_BUCKET_BITS
+# Values below this threshold are counted in exact (one per value) buckets
+EXACT_THRESHOLD: int = SUB_BUCKETS_COUNT << 1
+# Enough buckets for any 64-bit value
+BUCKETS_COUNT: int = EXACT_THRESHOLD + (64 - SUB_BUCKET_BITS) * SUB_BUCKETS_COUNT
+
+DEFAULT_QUANTILES: tuple[float, ...] = (0.5, 0.9, 0.99, 0.999)
+# Number of pending (not aggregated yet) measurements, after which they are aggregated
+FOLD_THRESHOLD: int = 1024
+
+
+class LatencyStats:
+    """Thread-safe aggregated stats of latencies (in nanoseconds).
+
+    Along with count/min/max/mean, latencies are counted into log-bucketed histogram
+    (HDR-like: each power of two is split into 16 linear sub-buckets), which takes fixed
+    memory and allows estimating quantiles (p50, p99, p999, etc.) with relative error
+    less than 6%.
+
+    Recording is lock-free: measurements are appended to the pending queue (atomic operation),
+    which is aggregated in batches (under the lock) - when it grows large enough,
+    or when the stats are read.
+    """
+
+    __slots__ = ("_count", "_total", "_min", "_max", "_buckets", "_pending", "_lock", "__weakref__")
+
+    def __init__(self) -> None:
+        """Initialize latency stats object."""
+        self._lock = Lock()
+        self._pending: deque[int] = deque()
+        self._buckets = [0] * BUCKETS_COUNT
+        self._count = self._total = self._min = self._max = 0
+
+    def __repr__(self) -> str:
+        """Get string representation of latency stats object."""
+        fields = ", ".join(f"{key}={value}" for key, value in self.snapshot().items())
+        return f"{self.__class__.__name__}({fields})"
+
+    @property
+    def count(self) -> int:
+        """Get number of measurements."""
+        self._fold()
+        return self._count
+
+    @property
+    def total(self) -> int:
+        """Get total latency of all measurements."""
+        self._fold()
+        return self._total
+
+    @property
+    def min(self) -> int:
+        """Get minimal latency."""
+        self._fold()
+        return self._min
+
+    @property
+    def max(self) -> int:
+        """Get maximal latency."""
+        self._fold()
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        """Get mean latency."""
+        self._fold()
+        return self._total / self._count if self._count else 0.0
+
+    def record(self, value: int) -> None:
+        """Record the latency.
+
+        Args:
+            value: Latency in nanoseconds.
+
+        Raises:
+            ValueError: If the latency is negative.
+        """
+        if value < 0:
+            raise ValueError("Latency must not be negative")
+
+        pending = self._pending
+        pending.append(value)
+
+        if len(pending) >= FOLD_THRESHOLD:
+            self._fold()
+
+    def quantile(self, q: float) -> int:
+        """Estimate the latency quantile.
+
+        Args:
+            q: Quantile in the range [0, 1] (e.g. 0.99 for p99).
+
+        Returns:
+            Estimated latency in nanoseconds (0, if there are no measurements).
+
+        Raises:
+            ValueError: If quantile is not in range [0, 1].
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be in range [0, 1]")
+
+        self._fold()
+
+        with self._lock:
+            if not self._count:
+                return 0
+
+            rank = max(1, round(q * self._count))
+            seen = 0
+
+            for index, bucket_count in enumerate(self._buckets):
+                seen += bucket_count
+                if seen >= rank:
+                    return min(max(self._bucket_value(index), self._min), self._max)
+
+            return self._max
+
+    def snapshot(self, quantiles: tuple[float, ...] = DEFAULT_QUANTILES) -> Mapping[str, float]:
+        """Get the current stats.
+
+        Args:
+            quantiles: Quantiles to estimate (p50, p90, p99 and p999 by default).
+
+        Returns:
+            A dictionary with count, min, max, mean (in nanoseconds) and the quantiles
+            (named as "p50", "p99", "p999", etc.).
+        """
+        self._fold()
+
+        result: dict[str, float] = {
+            "count": self._count,
+            "min": self._min,
+            "max": self._max,
+            "mean": self.mean,
+        }
+
+        for q in quantiles:
+            result[f"p{round(q * 100, 6):g}".replace(".", "")] = self.quantile(q)
+
+        return result
+
+    def reset(self) -> None:
+        """Drop all measurements."""
+        with self._lock:
+            self._pending.clear()
+            self._buckets = [0] * BUCKETS_COUNT
+            self._count = self._total = self._min = self._max = 0
+
+    def _fold(self) -> None:
+        # Aggregate pending measurements in a batch (concurrent appends are not blocked)
+        with self._lock:
+            pending = self._pending
+            if not pending:
+                return
+
+            popleft = pending.popleft
+            batch = [popleft() for _ in range(len(pending))]
+            buckets = self._buckets
+
+            for value in batch:
+                bit_length = value.bit_length()
+
+                if bit_length <= SUB_BUCKET_BITS + 1:
+                    buckets[value] += 1
+                else:
+                    # Index of the power of two range (the first one follows exact buckets),
+                    # plus index of the linear sub-bucket (the top bits of the value)
+                    shift = bit_length - SUB_BUCKET_BITS - 1
+                    buckets[(shift << SUB_BUCKET_BITS) + (value >> shift)] += 1
+
+            self._min = min(batch) if not self._count else min(self._min, min(batch))
+            self._max = max(self._max, max(batch))
+            self._total += sum(batch)
+            self._count += len(batch)
+
+    @staticmethod
+    def _bucket_value(index: int) -> int:
+        # Middle value of the bucket
+        if index < EXACT_THRESHOLD:
+            return index
+
+        shift, sub_bucket = divmod(index - EXACT_THRESHOLD, SUB_BUCKETS_COUNT)
+        shift += 1
+
+        return ((SUB_BUCKETS_COUNT + sub_bucket) << shift) + (1 << (shift - 1))
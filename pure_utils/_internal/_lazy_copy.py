@@ -0,0 +1,163 @@
+"""Internal module with lazy (copy-on-access) object proxy."""
+
+import operator
+from copy import deepcopy
+from typing import Any, Callable, Iterator
+
+# Types of the immutable objects, which are never copied (deepcopy returns them as is)
+IMMUTABLE_TYPES: frozenset[type] = frozenset(
+    (type(None), type(Ellipsis), bool, int, float, complex, str, bytes, range)
+)
+
+
+class LazyCopyProxy:
+    """Proxy of the object, which makes its deep copy only on the first access.
+
+    All attribute access and common protocol operations (items, iteration, length,
+    comparison, arithmetic, formatting, calls, etc.) are delegated to the deep copy
+    of the target, so the original object is never changed through the proxy. If the proxy
+    is not accessed at all, no copy is made.
+
+    The copy is made at the first access, not at creation of the proxy: if the target
+    is changed before (e.g., by the wrapped function), the copy has these changes.
+
+    Note: the proxy is not an instance of the target's class (for `isinstance` checks,
+    e.g. in `json.dumps`), so such code must get the copy explicitly (with `copy.deepcopy`).
+    """
+
+    __slots__ = ("_target", "_copied", "__weakref__")
+
+    def __init__(self, target: Any) -> None:
+        """Initialize proxy object."""
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_copied", False)
+
+    def __getattr__(self, name: str) -> Any:
+        """Get attribute of the copy of the target."""
+        return getattr(self._unwrap(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set attribute of the copy of the target."""
+        setattr(self._unwrap(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        """Delete attribute of the copy of the target."""
+        delattr(self._unwrap(), name)
+
+    def __getitem__(self, key: Any) -> Any:
+        """Get item of the copy of the target."""
+        return self._unwrap()[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Set item of the copy of the target."""
+        self._unwrap()[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        """Delete item of the copy of the target."""
+        del self._unwrap()[key]
+
+    def __iter__(self) -> Iterator:
+        """Iterate over the copy of the target."""
+        return iter(self._unwrap())
+
+    def __len__(self) -> int:
+        """Get length of the copy of the target."""
+        return len(self._unwrap())
+
+    def __contains__(self, item: Any) -> bool:
+        """Check that the copy of the target contains item."""
+        return item in self._unwrap()
+
+    def __bool__(self) -> bool:
+        """Get truth value of the copy of the target."""
+        return bool(self._unwrap())
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare the copy of the target with other object."""
+        return bool(self._unwrap() == other)
+
+    def __hash__(self) -> int:
+        """Get hash of the copy of the target."""
+        return hash(self._unwrap())
+
+    def __str__(self) -> str:
+        """Get string of the copy of the target."""
+        return str(self._unwrap())
+
+    def __repr__(self) -> str:
+        """Get string representation of the copy of the target."""
+        return repr(self._unwrap())
+
+    def __format__(self, format_spec: str) -> str:
+        """Format the copy of the target."""
+        return format(self._unwrap(), format_spec)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        """Call the copy of the target."""
+        return self._unwrap()(*args, **kwargs)
+
+    def _unwrap(self) -> Any:
+        if not self._copied:
+            object.__setattr__(self, "_target", deepcopy(self._target))
+            object.__setattr__(self, "_copied", True)
+        return self._target
+
+
+def lazy_copy(obj: Any) -> Any:
+    """Wrap object to the lazy copy proxy (immutable objects are returned as is).
+
+    Args:
+        obj: Source object.
+
+    Returns:
+        Proxy of the object or the object itself.
+    """
+    return obj if type(obj) in IMMUTABLE_TYPES else LazyCopyProxy(obj)
+
+
+def _forward_unary(func: Callable[[Any], Any]) -> Callable[[LazyCopyProxy], Any]:
+    return lambda self: func(self._unwrap())
+
+
+def _forward_binary(func: Callable[[Any, Any], Any]) -> Callable[[LazyCopyProxy, Any], Any]:
+    return lambda self, other: func(self._unwrap(), other)
+
+
+def _forward_reflected(func: Callable[[Any, Any], Any]) -> Callable[[LazyCopyProxy, Any], Any]:
+    return lambda self, other: func(other, self._unwrap())
+
+
+# Numeric and ordering protocols are delegated to the copy of the target too
+for _name in ("neg", "pos", "abs", "invert", "index"):
+    setattr(LazyCopyProxy, f"__{_name}__", _forward_unary(getattr(operator, _name)))
+
+for _name, _func in (("int", int), ("float", float), ("complex", complex)):
+    setattr(LazyCopyProxy, f"__{_name}__", _forward_unary(_func))
+
+for _name in ("lt", "le", "gt", "ge", "ne"):
+    setattr(LazyCopyProxy, f"__{_name}__", _forward_binary(getattr(operator, _name)))
+
+for _name in (
+    "add",
+    "sub",
+    "mul",
+    "matmul",
+    "truediv",
+    "floordiv",
+    "mod",
+    "pow",
+    "lshift",
+    "rshift",
+    "and",
+    "xor",
+    "or",
+):
+    _func = getattr(operator, f"{_name}_" if _name in ("and", "or") else _name)
+    setattr(LazyCopyProxy, f"__{_name}__", _forward_binary(_func))
+    setattr(LazyCopyProxy, f"__r{_name}__", _forward_reflected(_func))
+
+setattr(LazyCopyProxy, "__divmod__", _forward_binary(divmod))
+setattr(LazyCopyProxy, "__rdivmod__", _forward_reflected(divmod))
+setattr(LazyCopyProxy, "__round__", lambda self, *args: round(self._unwrap(), *args))
+
+del _name, _func
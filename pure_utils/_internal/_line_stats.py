@@ -0,0 +1,24 @@
+"""Internal module with line profiler stats."""
+
+from typing import NamedTuple, Sequence, TypeAlias
+
+
+class LineTiming(NamedTuple):
+    """Timing of the source line (time in seconds, including time of called functions)."""
+
+    lineno: int
+    hits: int
+    time: float
+
+
+class FunctionLineStats(NamedTuple):
+    """Line by line timings of the profiled function."""
+
+    filename: str
+    firstlineno: int
+    name: str
+    total_time: float
+    lines: Sequence[LineTiming]
+
+
+LineStats: TypeAlias = Sequence[FunctionLineStats]
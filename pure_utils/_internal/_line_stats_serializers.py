@@ -0,0 +1,64 @@
+"""Internal module with line profiler stats serializers."""
+
+from abc import ABC, abstractmethod
+from linecache import getline
+from typing import Mapping, TypeAlias
+
+from ._line_stats import FunctionLineStats, LineStats
+
+SerializedLineStatsT: TypeAlias = str | bytes | Mapping
+
+
+class LineStatsSerializer(ABC):
+    """Base class for serializer of line profiling results."""
+
+    __slots__ = ("lstats", "__weakref__")
+
+    def __init__(self, lstats: LineStats) -> None:
+        """Initialize base stats serializer object."""
+        self.lstats = lstats
+
+    @abstractmethod
+    def serialize(self) -> SerializedLineStatsT:
+        """Interface for serialization method of line profiling results."""
+        pass
+
+
+class LineStatsStringSerializer(LineStatsSerializer):
+    """Serialize line profiler result to string (with the source code of lines)."""
+
+    __slots__ = ("title",)
+
+    def __init__(self, *args, **kwargs):
+        """Initialize serializer."""
+        super().__init__(*args, **kwargs)
+
+        self.title = "    line      hits   time (us)  per hit (us)  % time  line contents"
+
+    def us(self, x: float) -> str:
+        """Convert seconds to microseconds with one digit after point."""
+        return f"{x * 1e6:.1f}"
+
+    def prepare_function(self, fstats: FunctionLineStats) -> str:
+        """Prepare the function stats as a string representation."""
+        lines = [
+            f"{fstats.filename}:{fstats.firstlineno}({fstats.name}) "
+            f"in {fstats.total_time:.3f} seconds\n\n",
+            f"{self.title}\n",
+        ]
+
+        for timing in fstats.lines:
+            percent = timing.time / fstats.total_time * 100 if fstats.total_time else 0.0
+            per_hit = timing.time / timing.hits if timing.hits else 0.0
+            source = getline(fstats.filename, timing.lineno).rstrip()
+
+            lines.append(
+                f"{timing.lineno:8d} {timing.hits:9d} {self.us(timing.time):>11} "
+                f"{self.us(per_hit):>13} {percent:7.1f}  {source}\n"
+            )
+
+        return "".join(lines)
+
+    def serialize(self) -> str:
+        """Serialize line stats to string."""
+        return "\n".join(self.prepare_function(fstats) for fstats in self.lstats)
@@ -0,0 +1,113 @@
+"""Internal module with memory allocation stats (based on the tracemalloc)."""
+
+import tracemalloc
+from threading import Lock
+from typing import NamedTuple, Sequence
+
+
+class MemoryLineStats(NamedTuple):
+    """Memory allocated by the source line (difference between the end and the start)."""
+
+    filename: str
+    lineno: int
+    size: int
+    blocks: int
+
+
+class MemoryStats(NamedTuple):
+    """Memory allocation stats of the profiled code.
+
+    Attributes:
+        peak: Peak of allocated memory (in bytes), relative to the start.
+        net: Allocated memory at the end minus allocated memory at the start (in bytes).
+        blocks: Net number of allocated memory blocks (objects).
+        lines: Stats of the source lines, ordered by absolute allocated memory.
+    """
+
+    peak: int
+    net: int
+    blocks: int
+    lines: Sequence[MemoryLineStats]
+
+
+_tracing_lock = Lock()
+_tracing_sessions = 0
+_tracing_owned = False
+# Peaks of traced memory of the active sessions (tracemalloc has only one, process-wide peak)
+_tracing_peaks: dict[object, int] = {}
+
+
+def start_tracing(frames: int) -> None:
+    """Start tracing of memory allocations (if it is not started yet).
+
+    Tracing is shared between the sessions: it is stopped with the last session
+    (and only if it was started by the first one).
+
+    Args:
+        frames: Number of frames of the traceback of each allocation.
+    """
+    global _tracing_sessions, _tracing_owned
+
+    with _tracing_lock:
+        if not _tracing_sessions and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            _tracing_owned = True
+
+        _tracing_sessions += 1
+
+
+def stop_tracing() -> None:
+    """Stop tracing of memory allocations (if this is the last session)."""
+    global _tracing_sessions, _tracing_owned
+
+    with _tracing_lock:
+        _tracing_sessions -= 1
+
+        if not _tracing_sessions and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+def reset_peak(session: object) -> int:
+    """Reset peak of traced memory for the new session.
+
+    Peaks of the other active sessions (enclosing or concurrent) are kept.
+
+    Args:
+        session: Session object.
+
+    Returns:
+        Traced memory (in bytes) at the start of the session.
+    """
+    with _tracing_lock:
+        _update_peaks()
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        _tracing_peaks[session] = current
+
+    return current
+
+
+def pop_peak(session: object) -> tuple[int, int]:
+    """Get traced memory and peak of traced memory of the session (and forget the session).
+
+    Args:
+        session: Session object (its peak must be reset before).
+
+    Returns:
+        Current traced memory and peak of traced memory since the start of the session.
+    """
+    with _tracing_lock:
+        _update_peaks()
+        current, _ = tracemalloc.get_traced_memory()
+
+        return current, _tracing_peaks.pop(session)
+
+
+def _update_peaks() -> None:
+    # Fold the process-wide peak into the peaks of the active sessions
+    # (must be called under the lock)
+    _, peak = tracemalloc.get_traced_memory()
+
+    for session, session_peak in _tracing_peaks.items():
+        _tracing_peaks[session] = max(session_peak, peak)
@@ -0,0 +1,81 @@
+"""Internal module with memory stats serializers."""
+
+from abc import ABC, abstractmethod
+from typing import Mapping, TypeAlias
+
+from ._memory_stats import MemoryStats
+
+SerializedMemoryStatsT: TypeAlias = str | bytes | Mapping
+
+
+class MemoryStatsSerializer(ABC):
+    """Base class for serializer of memory profiling results."""
+
+    __slots__ = ("mstats", "amount", "__weakref__")
+
+    def __init__(self, mstats: MemoryStats, amount: int) -> None:
+        """Initialize base stats serializer object."""
+        self.mstats = mstats
+        self.amount = amount
+
+    @abstractmethod
+    def serialize(self) -> SerializedMemoryStatsT:
+        """Interface for serialization method of memory profiling results."""
+        pass
+
+
+class MemoryStatsStringSerializer(MemoryStatsSerializer):
+    """Serialize memory profiler result to string."""
+
+    __slots__ = ("title",)
+
+    def __init__(self, *args, **kwargs):
+        """Initialize serializer."""
+        super().__init__(*args, **kwargs)
+
+        self.title = "        size    blocks filename:lineno"
+
+    def format_size(self, size: int) -> str:
+        """Format size in bytes with binary units (e.g. "-1.5 KiB")."""
+        value = float(size)
+
+        for unit in ("B", "KiB", "MiB", "GiB"):
+            if abs(value) < 1024 or unit == "GiB":
+                break
+            value /= 1024
+
+        return f"{size} B" if unit == "B" else f"{value:.1f} {unit}"
+
+    def serialize(self) -> str:
+        """Serialize MemoryStats object to string."""
+        lines = [
+            f"peak {self.format_size(self.mstats.peak)}, "
+            f"net {self.format_size(self.mstats.net)} ({self.mstats.blocks:+d} blocks)\n"
+        ]
+
+        if self.mstats.lines:
+            lines.append(f"\nTop {self.amount} lines by allocated memory:\n\n")
+            lines.append(f"{self.title}\n")
+
+            for line in self.mstats.lines[: self.amount]:
+                lines.append(
+                    f"{self.format_size(line.size).rjust(12)} {line.blocks:+9d} "
+                    f"{line.filename}:{line.lineno}\n"
+                )
+
+        return "".join(lines)
+
+
+class MemoryStatsDictSerializer(MemoryStatsSerializer):
+    """Serialize memory profiler result to dictionary (e.g., for structured logging)."""
+
+    __slots__ = ()
+
+    def serialize(self) -> Mapping:
+        """Serialize MemoryStats object to dictionary."""
+        return {
+            "peak": self.mstats.peak,
+            "net": self.mstats.net,
+            "blocks": self.mstats.blocks,
+            "lines": [line._asdict() for line in self.mstats.lines[: self.amount]],
+        }
@@ -0,0 +1,128 @@
+"""Internal module with metrics snapshot serializers."""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Mapping, TypeAlias
+
+from ._metrics_snapshot import MetricSnapshot, MetricsSnapshotT, format_float
+
+SerializedMetricsT: TypeAlias = str | bytes | Mapping
+
+# Prometheus types of the metric kinds
+PROMETHEUS_TYPES: Mapping[str, str] = {
+    "counter": "counter",
+    "gauge": "gauge",
+    "timer": "summary",
+    "histogram": "histogram",
+}
+
+
+class MetricsSerializer(ABC):
+    """Base class for serializer of metrics snapshot."""
+
+    __slots__ = ("snapshot", "__weakref__")
+
+    def __init__(self, snapshot: MetricsSnapshotT) -> None:
+        """Initialize base metrics serializer object."""
+        self.snapshot = snapshot
+
+    @abstractmethod
+    def serialize(self) -> SerializedMetricsT:
+        """Interface for serialization method of metrics snapshot."""
+        pass
+
+
+class MetricsPrometheusSerializer(MetricsSerializer):
+    """Serialize metrics snapshot to Prometheus text format (e.g., for node exporter)."""
+
+    __slots__ = ()
+
+    def serialize(self) -> str:
+        """Serialize metrics snapshot to string."""
+        lines, name = [], None
+
+        for metric in self.snapshot:
+            # Metrics with the same name (and different labels) share the description
+            if metric.name != name:
+                name = metric.name
+                description = metric.description.replace("\\", "\\\\").replace("\n", "\\n")
+                lines.append(f"# HELP {name} {description}\n")
+                lines.append(f"# TYPE {name} {PROMETHEUS_TYPES[metric.kind]}\n")
+
+            lines.extend(self.serialize_samples(metric))
+
+        return "".join(lines)
+
+    def serialize_samples(self, metric: MetricSnapshot) -> list[str]:
+        """Serialize samples (lines with values) of one metric."""
+        if not isinstance(metric.value, Mapping):
+            return [self.serialize_sample(metric.name, metric.labels, metric.value)]
+
+        if metric.kind == "timer":
+            samples = [
+                self.serialize_sample(metric.name, {**metric.labels, "quantile": q}, value)
+                for q, value in metric.value["quantiles"].items()
+            ]
+        else:
+            samples = [
+                self.serialize_sample(f"{metric.name}_bucket", {**metric.labels, "le": le}, count)
+                for le, count in metric.value["buckets"].items()
+            ]
+
+        samples.append(
+            self.serialize_sample(f"{metric.name}_sum", metric.labels, metric.value["sum"])
+        )
+        samples.append(
+            self.serialize_sample(f"{metric.name}_count", metric.labels, metric.value["count"])
+        )
+
+        return samples
+
+    def serialize_sample(self, name: str, labels: Mapping[str, str], value: float) -> str:
+        """Serialize one sample to the line (e.g. 'requests_total{method="GET"} 10')."""
+        if labels:
+            pairs = ",".join(
+                f'{key}="{self.escape_label(label_value)}"' for key, label_value in labels.items()
+            )
+            name = f"{name}{{{pairs}}}"
+
+        return f"{name} {value if isinstance(value, int) else format_float(value)}\n"
+
+    @staticmethod
+    def escape_label(value: str) -> str:
+        """Escape label value (backslash, double-quote and line feed)."""
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsDictSerializer(MetricsSerializer):
+    """Serialize metrics snapshot to dictionary (e.g., for structured logging)."""
+
+    __slots__ = ()
+
+    def serialize(self) -> Mapping:
+        """Serialize metrics snapshot to dictionary (metrics are grouped by names)."""
+        result: dict[str, dict] = {}
+
+        for metric in self.snapshot:
+            if metric.name not in result:
+                result[metric.name] = {
+                    "type": metric.kind,
+                    "description": metric.description,
+                    "metrics": [],
+                }
+
+            result[metric.name]["metrics"].append(
+                {"labels": dict(metric.labels), "value": metric.value}
+            )
+
+        return result
+
+
+class MetricsJSONSerializer(MetricsDictSerializer):
+    """Serialize metrics snapshot to JSON string."""
+
+    __slots__ = ()
+
+    def serialize(self) -> str:  # type: ignore[override]
+        """Serialize metrics snapshot to JSON string."""
+        return json.dumps(super().serialize(), sort_keys=True)
@@ -0,0 +1,35 @@
+"""Internal module with metrics snapshot declarations."""
+
+from math import isinf, isnan
+from typing import Any, Mapping, NamedTuple, TypeAlias
+
+MetricValueT: TypeAlias = int | float | Mapping[str, Any]
+
+
+class MetricSnapshot(NamedTuple):
+    """Point-in-time state of one metric.
+
+    Value is a number for counters and gauges, and a mapping for timers (count, sum,
+    min, max, mean and quantiles, in seconds) and histograms (count, sum and cumulative
+    counts of the buckets, by their upper bounds).
+    """
+
+    name: str
+    kind: str
+    description: str
+    labels: Mapping[str, str]
+    value: MetricValueT
+
+
+MetricsSnapshotT: TypeAlias = list[MetricSnapshot]
+
+
+def format_float(value: float) -> str:
+    """Format number as in Prometheus text format (e.g. "0.5", "+Inf", "NaN")."""
+    if isnan(value):
+        return "NaN"
+
+    if isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(value)
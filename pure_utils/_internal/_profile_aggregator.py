@@ -0,0 +1,195 @@
+"""Internal module with aggregating (long-lived) profiler of function calls."""
+
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from threading import Lock
+from time import monotonic
+from typing import Awaitable, Callable, Optional
+
+from pure_utils.profiler import Profiler
+from pure_utils.types import P, T
+
+from ._profile_stats_serializers import SerializedProfileStatsT
+
+
+class ProfileAggregator:
+    """Long-lived profiler, which accumulates stats across many calls of the function.
+
+    The merged report is produced every N profiled calls and/or T seconds (in the background
+    thread, off the path of the calls) and on demand (with `flush`). After each report,
+    the accumulated stats are dropped.
+
+    Only one call at a time is profiled (the profiler can't be shared between threads and
+    concurrent coroutines), concurrent calls are executed without profiling. The lock guards
+    only the state of the aggregator and is never held while the profiled call is running
+    (so a suspended coroutine never blocks `flush`).
+    """
+
+    __slots__ = (
+        "_make_profiler",
+        "_report",
+        "_flush_every",
+        "_flush_interval",
+        "_profiler",
+        "_lock",
+        "_busy",
+        "_flush_pending",
+        "_calls",
+        "_flushed_at",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        make_profiler: Callable[[], Profiler],
+        report: Callable[[Profiler], SerializedProfileStatsT],
+        *,
+        flush_every: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ) -> None:
+        """Initialize aggregator object.
+
+        Args:
+            make_profiler: Factory of profilers.
+            report: Function, which serializes (and outputs) the profiler result.
+            flush_every: Number of profiled calls, after which the report is produced.
+            flush_interval: Interval in seconds, after which the report is produced.
+        """
+        self._make_profiler = make_profiler
+        self._report = report
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+        self._profiler = make_profiler()
+        self._lock = Lock()
+        # Some call is being profiled right now
+        self._busy = False
+        # The report was requested while some call was being profiled
+        self._flush_pending = False
+        self._calls = 0
+        self._flushed_at = monotonic()
+
+    def profile(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Call function with profiling (if no other call is being profiled right now).
+
+        Args:
+            func: Function for profiling
+            *args: Profiling function positional arguments.
+            **kwargs: Profiling function named arguments.
+
+        Return:
+            Native profiling function return value.
+        """
+        profiler = self._acquire()
+
+        if profiler is None:
+            return func(*args, **kwargs)
+
+        try:
+            return profiler.profile(func, *args, **kwargs)
+        finally:
+            self._release()
+
+    async def aprofile(
+        self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Call coroutine function with profiling (if no other call is being profiled right now).
+
+        Args:
+            func: Coroutine function for profiling.
+            *args: Profiling function positional arguments.
+            **kwargs: Profiling function named arguments.
+
+        Return:
+            Native profiling coroutine return value.
+        """
+        profiler = self._acquire()
+
+        if profiler is None:
+            return await func(*args, **kwargs)
+
+        try:
+            return await profiler.aprofile(func, *args, **kwargs)
+        finally:
+            self._release()
+
+    def flush(self) -> Optional[SerializedProfileStatsT]:
+        """Produce the report of accumulated stats right now.
+
+        If some call is being profiled right now, the report is deferred until it finishes
+        (and is produced in the background thread, as the periodic ones).
+
+        Returns:
+            Serialized profiler result (None, if there were no profiled calls,
+            or the report is deferred).
+        """
+        with self._lock:
+            if self._busy:
+                self._flush_pending = True
+                return None
+
+            profiler = self._swap()
+
+        return self._report(profiler) if profiler else None
+
+    def _acquire(self) -> Optional[Profiler]:
+        # Take the profiler for the call (None, if it is used by another call)
+        with self._lock:
+            if self._busy:
+                return None
+
+            self._busy = True
+            return self._profiler
+
+    def _release(self) -> None:
+        with self._lock:
+            self._busy = False
+            self._calls += 1
+
+            if (
+                self._flush_pending
+                or (self._flush_every and self._calls >= self._flush_every)
+                or (self._flush_interval and monotonic() - self._flushed_at >= self._flush_interval)
+            ):
+                self._flush_pending = False
+                profiler = self._swap()
+            else:
+                profiler = None
+
+        if profiler:
+            _get_flush_executor().submit(self._report, profiler)
+
+    def _swap(self) -> Optional[Profiler]:
+        # Replace the profiler with new one (must be called under the lock)
+        if not self._calls:
+            return None
+
+        profiler, self._profiler = self._profiler, self._make_profiler()
+        self._calls, self._flushed_at = 0, monotonic()
+
+        return profiler
+
+
+_flush_executor: Optional[Executor] = None
+_flush_executor_lock = Lock()
+
+
+def _get_flush_executor() -> Executor:
+    global _flush_executor
+
+    with _flush_executor_lock:
+        if _flush_executor is None:
+            _flush_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pure-utils-profile-flush"
+            )
+
+        return _flush_executor
+
+
+def _reset_after_fork() -> None:
+    # Executor threads are not inherited by the child process
+    global _flush_executor, _flush_executor_lock
+    _flush_executor, _flush_executor_lock = None, Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
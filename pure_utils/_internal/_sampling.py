@@ -0,0 +1,205 @@
+"""Internal module with statistical (sampling) profiler machinery."""
+
+import os
+from collections import Counter, defaultdict
+from sys import _current_frames
+from threading import Condition, Lock, Thread, get_ident
+from time import sleep
+from types import CodeType, FrameType
+from typing import Optional
+from weakref import WeakSet
+
+
+class SampledProfile:
+    """Sampled call stacks, compatible with `pstats.Stats` (as the `cProfile.Profile`).
+
+    In the result, number of calls is the number of samples, where the function was
+    on the call stack, and times are estimated as number of samples multiplied by
+    the real (measured) sampling interval.
+    """
+
+    __slots__ = ("samples", "ticks", "elapsed", "stats", "__weakref__")
+
+    def __init__(self) -> None:
+        """Initialize sampled profile object."""
+        # Call stacks (code objects, from the innermost) with the number of samples
+        self.samples: Counter[tuple[CodeType, ...]] = Counter()
+        # Number of sampler ticks and wall time while profiling was active
+        self.ticks = 0
+        self.elapsed = 0.0
+        self.stats: dict = {}
+
+    def create_stats(self) -> None:
+        """Convert samples to the `pstats` format."""
+        weight = self.elapsed / self.ticks if self.ticks else 0.0
+        ncalls: Counter[tuple] = Counter()
+        tottime: Counter[tuple] = Counter()
+        callers: defaultdict[tuple, Counter[tuple]] = defaultdict(Counter)
+
+        for stack, count in self.samples.items():
+            labels = [(code.co_filename, code.co_firstlineno, code.co_name) for code in stack]
+            tottime[labels[0]] += count
+
+            for label in set(labels):
+                ncalls[label] += count
+
+            for callee, caller in zip(labels, labels[1:]):
+                callers[callee][caller] += count
+
+        self.stats = {
+            label: (
+                count,
+                count,
+                tottime[label] * weight,
+                count * weight,
+                {caller: (n, n, 0.0, n * weight) for caller, n in callers[label].items()},
+            )
+            for label, count in ncalls.items()
+        }
+
+
+class SamplingSession:
+    """Active sampling of the call stack of one thread (below/at the root frame)."""
+
+    __slots__ = ("thread_id", "root", "include_root", "profile", "__weakref__")
+
+    def __init__(
+        self, thread_id: int, root: FrameType, include_root: bool, profile: SampledProfile
+    ) -> None:
+        """Initialize sampling session object."""
+        self.thread_id = thread_id
+        self.root = root
+        self.include_root = include_root
+        self.profile = profile
+
+    def sample(self, frame: Optional[FrameType]) -> None:
+        """Take sample of the call stack (ignored, if the root frame is not on the stack).
+
+        Args:
+            frame: Current (innermost) frame of the thread.
+        """
+        root, stack = self.root, []
+
+        while frame is not None:
+            if frame is root:
+                if self.include_root:
+                    stack.append(frame.f_code)
+                if stack:
+                    self.profile.samples[tuple(stack)] += 1
+                return
+
+            stack.append(frame.f_code)
+            frame = frame.f_back
+
+
+class Sampler:
+    """Background thread, which samples call stacks of active sessions at a fixed interval.
+
+    The thread is started on the first session, and sleeps (without ticking)
+    while there are no active sessions.
+    """
+
+    __slots__ = ("interval", "_sessions", "_wakeup", "_thread", "__weakref__")
+
+    def __init__(self, interval: float) -> None:
+        """Initialize sampler object."""
+        self.interval = interval
+        self._sessions: set[SamplingSession] = set()
+        self._wakeup = Condition(Lock())
+        self._thread: Optional[Thread] = None
+        _all_samplers.add(self)
+
+    def start(
+        self, profile: SampledProfile, root: FrameType, *, include_root: bool
+    ) -> SamplingSession:
+        """Start sampling of the current thread.
+
+        Args:
+            profile: Profile for samples.
+            root: The outermost sampled frame.
+            include_root: If enable, the root frame itself is sampled too.
+
+        Returns:
+            Sampling session (to stop it).
+        """
+        session = SamplingSession(get_ident(), root, include_root, profile)
+
+        with self._wakeup:
+            self._sessions.add(session)
+
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="pure-utils-sampler", daemon=True)
+                self._thread.start()
+
+            self._wakeup.notify()
+
+        return session
+
+    def stop(self, session: SamplingSession) -> None:
+        """Stop sampling session (waits for the sample being taken right now).
+
+        Args:
+            session: Sampling session.
+        """
+        with self._wakeup:
+            self._sessions.discard(session)
+
+    def _reset_after_fork(self) -> None:
+        # The thread (and sessions of the other threads) don't exist in the child process,
+        # and the lock could be held by them
+        thread_id = get_ident()
+        self._sessions = {_ for _ in self._sessions if _.thread_id == thread_id}
+        self._wakeup = Condition(Lock())
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                self._wakeup.wait_for(lambda: self._sessions)
+
+            sleep(self.interval)
+            frames = _current_frames()
+
+            with self._wakeup:
+                for session in self._sessions:
+                    session.profile.ticks += 1
+                    session.sample(frames.get(session.thread_id))
+
+            # Don't keep the frames (and their locals) alive until the next tick
+            del frames
+
+
+_samplers: dict[float, Sampler] = {}
+_samplers_lock = Lock()
+# All samplers (including the ones, which are referenced by profilers only)
+_all_samplers: WeakSet[Sampler] = WeakSet()
+
+
+def get_sampler(interval: float) -> Sampler:
+    """Get shared sampler with the given interval.
+
+    Args:
+        interval: Sampling interval in seconds.
+
+    Returns:
+        Sampler object.
+    """
+    with _samplers_lock:
+        if interval not in _samplers:
+            _samplers[interval] = Sampler(interval)
+
+        return _samplers[interval]
+
+
+def _reset_after_fork() -> None:
+    # Sampler threads are not inherited by the child process (they are restarted
+    # on the next session)
+    global _samplers_lock
+    _samplers_lock = Lock()
+
+    for sampler in _all_samplers:
+        sampler._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,11 +1,44 @@
 """The common purpose utilities."""
 
-from typing import TypeVar
+import os
+from asyncio import CancelledError
+from asyncio import Future as AsyncFuture
+from asyncio import TimeoutError as AsyncTimeoutError
+from asyncio import get_running_loop, shield, wait_for, wrap_future
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache, partial
+from inspect import Parameter, Signature, signature
+from threading import Condition, Lock, RLock
+from time import monotonic
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Iterator,
+    Literal,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+from weakref import WeakSet, WeakValueDictionary
 
-__all__ = ["Singleton"]
+__all__ = ["Multiton", "ObjectPool", "PoolStats", "Singleton"]
 
 
 T = TypeVar("T", bound="Singleton")
+M = TypeVar("M", bound="Multiton")
+PooledT = TypeVar("PooledT")
+
+EvictionT = Literal["none", "weak", "lru"]
+
+DEFAULT_MULTITON_EVICTION: EvictionT = "none"
+DEFAULT_MULTITON_MAXSIZE: int = 128
+DEFAULT_MULTITON_KEYS_CACHE_SIZE: int = 1024
+DEFAULT_POOL_MAX_SIZE: int = 16
 
 
 class Singleton(type):
@@ -18,12 +51,517 @@ class Singleton(type):
     >>> class SomeSigletonClass(metaclass=Singleton):
     ...     pass
     >>> some = SomeSigletonClass()
+
+    Creation of singleton object is thread-safe: it's guarded by the lock of the class,
+    which is taken only until the object is created (double-checked locking).
     """
 
     _instances: dict = {}
+    _locks: dict = {}
+
+    def __init__(cls, *args, **kwargs) -> None:
+        """Initialize singleton class (with the lock for creation of its object)."""
+        super().__init__(*args, **kwargs)
+        cls._locks[cls] = RLock()
 
     def __call__(cls: T, *args, **kwargs) -> T:
         """Get or create (first call) singleton object."""
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
+        instance = cls._instances.get(cls)
+
+        if instance is None:
+            with cls._locks[cls]:
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
+
+        return instance
+
+
+class Multiton(type):
+    """A metaclass, implements the multiton pattern for inheritors.
+
+    One object is created per distinct (normalized) constructor arguments: positional
+    and named forms of the same arguments, as well as omitted default values, produce
+    the same key. Arguments must be hashable.
+
+    The eviction policy of objects is specified by class keyword arguments:
+        eviction: "none" (default) - objects are kept until `evict()`/`clear()` calls,
+                  "weak" - objects are kept while they are referenced somewhere else,
+                  "lru" - at most `maxsize` recently used objects are kept.
+        maxsize: Maximum number of objects for "lru" eviction policy (128 by default).
+
+    Objects are dropped in the child process after `os.fork()`, so the child process
+    never shares objects (e.g. connections) with the parent process.
+
+    Usage:
+
+    >>> from pure_utils import Multiton
+
+    >>> class TenantClient(metaclass=Multiton, eviction="lru", maxsize=100):
+    ...     def __init__(self, tenant, timeout=30):
+    ...         self.tenant = tenant
+    >>> TenantClient("a") is TenantClient(tenant="a", timeout=30)
+    True
+    >>> TenantClient("a") is TenantClient("b")
+    False
+
+    >>> TenantClient.evict("a")
+    >>> TenantClient.clear()
+    """
+
+    _classes: WeakSet = WeakSet()
+
+    def __new__(
+        mcs,
+        name: str,
+        bases: tuple[type, ...],
+        namespace: dict[str, Any],
+        /,
+        *,
+        eviction: Optional[EvictionT] = None,
+        maxsize: Optional[int] = None,
+        **kwargs,
+    ):
+        """Create multiton class (class keyword arguments are consumed by the metaclass)."""
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+    def __init__(
+        cls,
+        name: str,
+        bases: tuple[type, ...],
+        namespace: dict[str, Any],
+        /,
+        *,
+        eviction: Optional[EvictionT] = None,
+        maxsize: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        """Initialize multiton class (policy is inherited from the base class, if omitted)."""
+        super().__init__(name, bases, namespace, **kwargs)
+
+        cls._multiton_eviction: EvictionT = (
+            getattr(cls, "_multiton_eviction", DEFAULT_MULTITON_EVICTION)
+            if eviction is None
+            else eviction
+        )
+        cls._multiton_maxsize: int = (
+            getattr(cls, "_multiton_maxsize", DEFAULT_MULTITON_MAXSIZE)
+            if maxsize is None
+            else maxsize
+        )
+
+        if cls._multiton_eviction not in ("none", "weak", "lru"):
+            raise ValueError(f"Unknown eviction policy: {cls._multiton_eviction!r}")
+
+        if cls._multiton_maxsize <= 0:
+            raise ValueError("Maximum number of objects must be a positive integer")
+
+        cls._multiton_key = lru_cache(maxsize=DEFAULT_MULTITON_KEYS_CACHE_SIZE)(
+            partial(_normalize_arguments, _init_signature(cls))
+        )
+        cls._multiton_lock = RLock()
+        cls._multiton_instances: MutableMapping = cls._multiton_storage()
+
+        Multiton._classes.add(cls)
+
+    def __call__(cls: M, *args, **kwargs) -> M:
+        """Get or create (first call with these arguments) multiton object."""
+        key = cls._multiton_key(args, frozenset(kwargs.items()))
+        instances = cls._multiton_instances
+        instance = instances.get(key)
+
+        if instance is None:
+            with cls._multiton_lock:
+                instance = instances.get(key)
+                if instance is None:
+                    instance = instances[key] = super(Multiton, cls).__call__(*args, **kwargs)
+                    if cls._multiton_eviction == "lru" and len(instances) > cls._multiton_maxsize:
+                        instances.popitem(last=False)  # type: ignore[call-arg]
+        elif cls._multiton_eviction == "lru":
+            try:
+                instances.move_to_end(key)  # type: ignore[attr-defined]
+            except KeyError:
+                # Concurrently evicted, but still valid for the current caller
+                pass
+
+        return instance
+
+    def evict(cls, *args, **kwargs) -> None:
+        """Evict object, which was created with the specified constructor arguments."""
+        with cls._multiton_lock:
+            cls._multiton_instances.pop(cls._multiton_key(args, frozenset(kwargs.items())), None)
+
+    def clear(cls) -> None:
+        """Evict all objects of the class."""
+        with cls._multiton_lock:
+            cls._multiton_instances.clear()
+
+    def _multiton_storage(cls) -> MutableMapping:
+        if cls._multiton_eviction == "weak":
+            return WeakValueDictionary()
+
+        if cls._multiton_eviction == "lru":
+            return OrderedDict()
+
+        return {}
+
+
+class PoolStats(NamedTuple):
+    """Usage counters of the object pool."""
+
+    hits: int
+    """Number of checkouts of the idle (already created) objects."""
+    misses: int
+    """Number of checkouts, which required creation of a new object."""
+    waits: int
+    """Number of checkouts, which waited for release of an object (pool size was exhausted)."""
+    evictions: int
+    """Number of objects evicted from the pool (idle too long or failed reset)."""
+    size: int
+    """Current number of objects created by the pool (idle and checked out)."""
+    idle: int
+    """Current number of idle objects."""
+
+
+class ObjectPool(Generic[PooledT]):
+    """Thread-safe bounded pool of reusable objects, which are expensive to create.
+
+    Objects are created by the factory on demand, until the pool size is exhausted,
+    after which checkouts wait for release of objects. Released objects are reset
+    (by the optional `reset` function) and reused by the following checkouts (the most
+    recently released first). Objects, which are idle longer than `max_idle` seconds,
+    are evicted from the pool.
+
+    Usage:
+
+    >>> from zlib import compressobj
+    >>> from pure_utils import ObjectPool
+
+    >>> pool = ObjectPool(compressobj, max_size=4, max_idle=60)
+
+    >>> with pool.checkout() as compressor:
+    ...     data = compressor.compress(b"some data") + compressor.flush()
+
+    >>> async with pool.acheckout() as compressor:
+    ...     data = compressor.compress(b"some data") + compressor.flush()
+
+    >>> print(pool.stats)
+    PoolStats(hits=1, misses=1, waits=0, evictions=0, size=1, idle=1)
+    """
+
+    __slots__ = (
+        "factory",
+        "max_size",
+        "max_idle",
+        "reset",
+        "_idle",
+        "_size",
+        "_condition",
+        "_waiters",
+        "_hits",
+        "_misses",
+        "_waits",
+        "_evictions",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        factory: Callable[[], PooledT],
+        /,
+        *,
+        max_size: int = DEFAULT_POOL_MAX_SIZE,
+        reset: Optional[Callable[[PooledT], Any]] = None,
+        max_idle: Optional[float] = None,
+    ) -> None:
+        """Initialize object pool.
+
+        Args:
+            factory: A function, which creates a new object.
+            max_size: Maximum number of objects created by the pool (16 by default).
+            reset: Optional function, which resets a state of the released object.
+                   If it raises an exception, the object is evicted from the pool.
+            max_idle: Optional time (in seconds), after which idle objects are evicted.
+
+        Raises:
+            ValueError: If maximum size of the pool is less than one.
+        """
+        if max_size <= 0:
+            raise ValueError("Maximum size of the pool must be a positive integer")
+
+        self.factory = factory
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.reset = reset
+        # Idle objects with their release time (the oldest on the left)
+        self._idle: deque[tuple[PooledT, float]] = deque()
+        self._size = 0
+        self._condition = Condition()
+        # Futures of the coroutines, waiting for release of an object (in acheckout)
+        self._waiters: deque[AsyncFuture] = deque()
+        self._hits = self._misses = self._waits = self._evictions = 0
+
+    @property
+    def stats(self) -> PoolStats:
+        """Get usage counters of the pool."""
+        with self._condition:
+            return PoolStats(
+                self._hits, self._misses, self._waits, self._evictions, self._size, len(self._idle)
+            )
+
+    def acquire(self, *, timeout: Optional[float] = None) -> PooledT:
+        """Take the object from the pool (it must be released after use).
+
+        Args:
+            timeout: Optional maximum time (in seconds) to wait for release of an object,
+                     when the pool size is exhausted (waits forever by default).
+
+        Returns:
+            Idle or newly created object.
+
+        Raises:
+            TimeoutError: If no object was released during the timeout.
+        """
+        return self._acquire(timeout)
+
+    def release(self, obj: PooledT, /) -> None:
+        """Return the object to the pool.
+
+        Args:
+            obj: Object, previously taken from the pool.
+        """
+        try:
+            if self.reset:
+                self.reset(obj)
+        except Exception:
+            self._discard(evicted=True)
+            return
+
+        with self._condition:
+            self._idle.append((obj, monotonic()))
+            self._evict_idle()
+            self._notify()
+
+    @contextmanager
+    def checkout(self, *, timeout: Optional[float] = None) -> Iterator[PooledT]:
+        """Take the object from the pool for the duration of the context.
+
+        Args:
+            timeout: Optional maximum time (in seconds) to wait for release of an object.
+
+        Returns:
+            Context manager with the object.
+        """
+        obj = self.acquire(timeout=timeout)
+
+        try:
+            yield obj
+        finally:
+            self.release(obj)
+
+    @asynccontextmanager
+    async def acheckout(self, *, timeout: Optional[float] = None) -> AsyncIterator[PooledT]:
+        """Take the object from the pool for the duration of the asynchronous context.
+
+        Waiting for release of an object (when the pool size is exhausted)
+        doesn't block the event loop.
+
+        Args:
+            timeout: Optional maximum time (in seconds) to wait for release of an object.
+
+        Returns:
+            Asynchronous context manager with the object.
+        """
+        obj = await self._acquire_async(timeout)
+
+        try:
+            yield obj
+        finally:
+            self.release(obj)
+
+    def clear(self) -> None:
+        """Evict all idle objects from the pool."""
+        with self._condition:
+            self._evictions += len(self._idle)
+            self._size -= len(self._idle)
+            self._notify(len(self._idle))
+            self._idle.clear()
+
+    async def _acquire_async(self, timeout: Optional[float]) -> PooledT:
+        # Idle object is taken right away, the waiting is done in the event loop (the waiter
+        # is woken up by release) and the thread is used only for creation of the object
+        loop = get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        waited = False
+
+        while True:
+            with self._condition:
+                self._evict_idle()
+
+                if self._idle:
+                    self._hits += 1
+                    return self._idle.pop()[0]
+
+                if self._size < self.max_size:
+                    self._misses += 1
+                    self._size += 1
+                    break
+
+                self._waits += not waited
+                waiter = loop.create_future()
+                self._waiters.append(waiter)
+
+            waited = True
+            await self._wait_async(waiter, None if deadline is None else deadline - loop.time())
+
+        future = _get_create_executor().submit(self._create)
+
+        try:
+            return await shield(wrap_future(future))
+        except CancelledError:
+            # The object could be created already, so it must be returned back
+            # (the callback doesn't depend on the event loop)
+            if future.cancel():
+                self._discard()
+            else:
+                future.add_done_callback(self._release_created)
+            raise
+
+    async def _wait_async(self, waiter: AsyncFuture, timeout: Optional[float]) -> None:
+        try:
+            await wait_for(waiter, timeout)
+        except BaseException as exc:
+            with self._condition:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # The waiter was woken up, but stopped waiting (timeout or cancellation),
+                    # so pass the notification (about release) to the other waiters
+                    self._notify()
+
+            if isinstance(exc, AsyncTimeoutError):
+                raise TimeoutError("No objects were released in the pool during the timeout")
+            raise
+
+    def _acquire(self, timeout: Optional[float]) -> PooledT:
+        with self._condition:
+            self._evict_idle()
+
+            if not self._idle and self._size >= self.max_size:
+                self._waits += 1
+                if not self._condition.wait_for(
+                    lambda: self._idle or self._size < self.max_size, timeout
+                ):
+                    raise TimeoutError("No objects were released in the pool during the timeout")
+
+            if self._idle:
+                self._hits += 1
+                return self._idle.pop()[0]
+
+            self._misses += 1
+            self._size += 1
+
+        return self._create()
+
+    def _create(self) -> PooledT:
+        try:
+            return self.factory()
+        except BaseException:
+            self._discard()
+            raise
+
+    def _release_created(self, future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            self.release(future.result())
+
+    def _notify(self, n: int = 1) -> None:
+        # Wake up the waiting threads and coroutines (must be called under the lock)
+        self._condition.notify(n)
+
+        while n and self._waiters:
+            waiter = self._waiters.popleft()
+
+            try:
+                waiter.get_loop().call_soon_threadsafe(_wake_up, waiter)
+            except RuntimeError:
+                # The event loop of the waiter is closed
+                continue
+
+            n -= 1
+
+    def _evict_idle(self) -> None:
+        if self.max_idle is None:
+            return
+
+        deadline = monotonic() - self.max_idle
+
+        while self._idle and self._idle[0][1] < deadline:
+            self._idle.popleft()
+            self._size -= 1
+            self._evictions += 1
+            self._notify()
+
+    def _discard(self, *, evicted: bool = False) -> None:
+        with self._condition:
+            self._size -= 1
+            self._evictions += evicted
+            self._notify()
+
+
+def _init_signature(cls: type) -> Signature:
+    # Signature of the class itself is the signature of the metaclass __call__
+    init_signature = signature(cls.__init__)  # type: ignore[misc]
+    return init_signature.replace(parameters=tuple(init_signature.parameters.values())[1:])
+
+
+def _normalize_arguments(
+    init_signature: Signature, args: tuple[Any, ...], kwargs: frozenset[tuple[str, Any]]
+) -> tuple[Any, ...]:
+    bound = init_signature.bind(*args, **dict(kwargs))
+    bound.apply_defaults()
+
+    return tuple(
+        (
+            frozenset(value.items())
+            if init_signature.parameters[name].kind is Parameter.VAR_KEYWORD
+            else value
+        )
+        for name, value in bound.arguments.items()
+    )
+
+
+def _wake_up(waiter: AsyncFuture) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_create_executor: Optional[Executor] = None
+_create_executor_lock = Lock()
+
+
+def _get_create_executor() -> Executor:
+    global _create_executor
+
+    with _create_executor_lock:
+        if _create_executor is None:
+            _create_executor = ThreadPoolExecutor(thread_name_prefix="pure-utils-pool-create")
+
+        return _create_executor
+
+
+def _reset_after_fork() -> None:
+    # Locks could be held by threads, which don't exist in the child process
+    # (executor threads are not inherited too)
+    global _create_executor, _create_executor_lock
+    _create_executor, _create_executor_lock = None, Lock()
+
+    for cls in Singleton._locks:
+        Singleton._locks[cls] = RLock()
+
+    for cls in Multiton._classes:
+        cls._multiton_lock = RLock()
+        cls._multiton_instances = cls._multiton_storage()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
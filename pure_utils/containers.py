@@ -1,22 +1,87 @@
 """Utilities for working with data containers (lists, dicts, tuples, sets, etc.)."""
 
-from typing import Any, Generator, Mapping, Optional, Sequence
+import re
+from array import array
+from collections import Counter, deque, namedtuple
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import lru_cache
+from heapq import merge
+from itertools import chain, groupby, islice, repeat
+from math import ceil, log
+from operator import attrgetter, itemgetter, le
+from os import cpu_count
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Sized,
+    overload,
+)
 
 from .types import KeysT, T
 
 __all__ = [
+    "BloomFilter",
+    "LazySeq",
+    "Path",
+    "RecordBatch",
+    "SequenceView",
+    "Unpacker",
     "bisect",
+    "deepflatten",
     "first",
     "flatten",
+    "get_in",
     "get_or_else",
+    "ipaginate",
+    "isymmdiff",
     "omit",
+    "omit_many",
     "paginate",
     "pick",
+    "pick_many",
+    "pmap",
+    "split_into",
     "symmdiff",
+    "symmdiff_many",
+    "symmdiff_approx",
+    "unique",
     "unpack",
+    "unpack_many",
 ]
 
 
+DEFAULT_ATOMIC_TYPES: tuple[type, ...] = (str, bytes, bytearray, Mapping)
+DEFAULT_PATH_CACHE_SIZE: int = 1024
+DEFAULT_PATH_SEPARATOR: str = "."
+DEFAULT_SORTED_MERGE_THRESHOLD: int = 100_000
+DEFAULT_PMAP_CHUNK_SIZE: int = 256
+DEFAULT_ROW_TYPES_CACHE_SIZE: int = 256
+DEFAULT_BLOOM_CAPACITY: int = 1_000_000
+DEFAULT_BLOOM_ERROR_RATE: float = 0.01
+DEFAULT_PMAP_CHUNKS_PER_WORKER: int = 2
+
+_MISSING: Any = object()
+_SEQUENCE_TYPES: tuple[type, ...] = (list, tuple)
+# Omitted keys are deleted from the copy of the container, if they are up to 1/N of it
+_OMIT_BY_DELETION_SHARE: int = 8
+_INDEX_PATTERN: re.Pattern = re.compile(r"-?[0-9]+")
+
+
 def bisect(collection: list[T], /) -> tuple[list[T], list[T]]:
     """Bisect the list into two parts/halves based on the number of elements.
 
@@ -97,11 +162,93 @@ def flatten(collection: Sequence[T], /) -> Generator[Sequence[T] | T, None, None
     >>> print(result)
     [1, 2, 3, 4, 5]
     """
-    if isinstance(collection, (list, tuple, set)):
-        for _ in collection:
-            yield from flatten(_)
-    else:
+    yield from _iflatten(collection, lambda _: issubclass(_, (list, tuple, set)), None)
+
+
+def deepflatten(
+    collection: Iterable[T],
+    /,
+    *,
+    depth: Optional[int] = None,
+    atomic: tuple[type, ...] = DEFAULT_ATOMIC_TYPES,
+) -> Generator[Any, None, None]:
+    """Make any iterable collection flat, descending into arbitrary nested iterables.
+
+    In contrast to `flatten`, it descends into any iterable (generators, deques,
+    custom iterable types, etc.), except for instances of the `atomic` types.
+
+    The collection is walked with an explicit stack (without recursion), so the nesting depth
+    is not limited by the interpreter recursion limit, and the cost per element does not depend
+    on its nesting level.
+
+    Args:
+        collection: Iterable collection to flatten.
+        depth: Optional maximum number of nesting levels to flatten (unlimited by default).
+        atomic: Iterable types, which must not be flattened (str, bytes, bytearray and Mapping
+                by default).
+
+    Returns:
+        Generator of the flatten function.
+
+    Raises:
+        ValueError: If collection contains a reference to itself (cycle).
+
+    Usage:
+
+    >>> from collections import deque
+    >>> from pure_utils import deepflatten
+
+    >>> seq = [1, (_ for _ in (2, 3)), deque([4, ["five", {"six": 6}]])]
+    >>> print(list(deepflatten(seq)))
+    [1, 2, 3, 4, 'five', {'six': 6}]
+
+    >>> seq = [1, [2, [3, [4]]]]
+    >>> print(list(deepflatten(seq, depth=1)))
+    [1, 2, [3, [4]]]
+    """
+    yield from _iflatten(
+        collection, lambda _: issubclass(_, Iterable) and not issubclass(_, atomic), depth
+    )
+
+
+def _iflatten(
+    collection: Any, is_nested_type: Callable[[type], bool], depth: Optional[int]
+) -> Generator[Any, None, None]:
+    # Checks of nested types are cached, because ABC subclass checks are slow
+    nested_types: dict[type, bool] = {}
+
+    def is_nested(obj: Any) -> bool:
+        obj_type = type(obj)
+        try:
+            return nested_types[obj_type]
+        except KeyError:
+            return nested_types.setdefault(obj_type, is_nested_type(obj_type))
+
+    if not is_nested(collection):
         yield collection
+        return
+
+    max_depth = float("inf") if depth is None else depth
+    stack = [iter(collection)]
+    # Identifiers of the collections on the current path (from root to top of the stack)
+    path = [id(collection)]
+    visited = {id(collection)}
+
+    while stack:
+        for item in stack[-1]:
+            if len(stack) <= max_depth and is_nested(item):
+                if id(item) in visited:
+                    raise ValueError("The source collection must not contain cycles")
+
+                stack.append(iter(item))
+                path.append(id(item))
+                visited.add(id(item))
+                break
+
+            yield item
+        else:
+            stack.pop()
+            visited.discard(path.pop())
 
 
 def get_or_else(collection: Sequence[T], index: int, default: Optional[T] = None, /) -> Optional[T]:
@@ -138,15 +285,172 @@ def get_or_else(collection: Sequence[T], index: int, default: Optional[T] = None
         return default
 
 
-def symmdiff(collection1: KeysT, collection2: KeysT, /) -> Sequence[T]:
+def get_in(container: Any, path: "str | Sequence[Any] | Path", default: Any = None, /) -> Any:
+    """Get value of the nested element by path, and if it is missing, return the default value.
+
+    Used for safety to get the value from deeply nested mappings and sequences
+    (e.g. JSON payloads).
+
+    Path strings are parsed into `Path` objects once and cached (in bounded LRU cache),
+    so repeated lookups by the same path are not parsed again.
+
+    Args:
+        container: Nested data container (mappings and sequences).
+        path: Dotted path string (e.g. "users.0.name"), sequence of keys/indexes or `Path` object.
+        default: Optional default value, returned when no element by the specified path.
+
+    Returns:
+        The value of the nested element by the specified path,
+        or default value, when no element by this path.
+
+    Usage:
+
+    >>> from pure_utils import get_in
+
+    >>> payload = {"users": [{"name": "Bob", "tags": ["admin"]}]}
+    >>> print(get_in(payload, "users.0.name"))
+    Bob
+    >>> print(get_in(payload, ("users", 0, "tags", -1)))
+    admin
+    >>> print(get_in(payload, "users.1.name", "does not exists"))
+    does not exists
+    """
+    if not isinstance(path, Path):
+        path = _to_path(path)
+
+    return path.get(container, default)
+
+
+def _to_path(path: str | Sequence[Any]) -> "Path":
+    if not isinstance(path, (str, tuple)):
+        return Path(path)
+
+    try:
+        return _compile_path(path)
+    except TypeError:
+        # Tuple path with unhashable keys can't be cached
+        return Path(path)
+
+
+@lru_cache(maxsize=DEFAULT_PATH_CACHE_SIZE)
+def _compile_path(path: str | tuple[Any, ...]) -> "Path":
+    return Path(path)
+
+
+def split_into(collection: Sequence[T], n: int, /) -> list["SequenceView[T]"] | list[memoryview]:
+    """Split the collection into `n` balanced chunks (sizes of chunks differ by at most one).
+
+    Chunks are views over the original collection, not copies: memoryview for objects
+    supporting the buffer protocol (bytes, bytearray, array.array, mmap)
+    and `SequenceView` for other sequences (lists, tuples, etc.).
+
+    Note that the memoryview can't be pickled (e.g. to pass it to a process pool),
+    convert it to bytes (or use `SequenceView`) for this.
+
+    The function does not modify the original collection.
+
+    Args:
+        collection: Source collection.
+        n: Number of chunks.
+
+    Returns:
+        A list of `n` chunks (views over the original collection).
+        If the collection is smaller than `n`, the trailing chunks are empty.
+
+    Raises:
+        ValueError: If number of chunks is less than one.
+
+    Usage:
+
+    >>> from pure_utils import split_into
+
+    >>> chunks = split_into([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 3)
+    >>> print([list(_) for _ in chunks])
+    [[1, 2, 3, 4], [5, 6, 7], [8, 9, 10]]
+
+    >>> chunks = split_into(b"abcdefg", 2)
+    >>> print([bytes(_) for _ in chunks])
+    [b'abcd', b'efg']
+    """
+    if n <= 0:
+        raise ValueError("Number of chunks must be a positive integer")
+
+    view: Any
+
+    try:
+        view = memoryview(collection)  # type: ignore[arg-type]
+    except TypeError:
+        view = SequenceView(collection)
+
+    size, remainder = divmod(len(view), n)
+    bounds = [_ * size + min(_, remainder) for _ in range(n + 1)]
+
+    return [view[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+
+@overload
+def symmdiff(
+    collection1: KeysT,
+    collection2: KeysT,
+    /,
+    *,
+    presorted: bool = ...,
+    count_only: Literal[False] = ...,
+    with_side: bool = ...,
+) -> Sequence[Any]: ...
+
+
+@overload
+def symmdiff(
+    collection1: KeysT,
+    collection2: KeysT,
+    /,
+    *,
+    presorted: bool = ...,
+    count_only: Literal[True],
+    with_side: bool = ...,
+) -> int: ...
+
+
+@overload
+def symmdiff(
+    collection1: KeysT,
+    collection2: KeysT,
+    /,
+    *,
+    presorted: bool = ...,
+    count_only: bool,
+    with_side: bool = ...,
+) -> Sequence[Any] | int: ...
+
+
+def symmdiff(
+    collection1: KeysT,
+    collection2: KeysT,
+    /,
+    *,
+    presorted: bool = False,
+    count_only: bool = False,
+    with_side: bool = False,
+) -> Sequence[Any] | int:
     """Obtain the symmetric difference of two sequences.
 
+    Small or unsorted sequences are compared through sets. If both collections are sorted
+    (declared with `presorted`, or detected automatically for large sequences), they are
+    compared by merging, without building intermediate sets (see `isymmdiff`).
+
     Args:
         collection1: The first sequence to form a set on the LEFT.
         collection2: The second sequence to form a set on the RIGHT.
+        presorted: If enable, both collections are treated as sorted (in ascending order)
+                   iterables, and compared by merging.
+        count_only: If enable, return only the number of elements of the symmetric difference.
+        with_side: If enable, each element is returned as two-element tuple (element, side),
+                   where side is 0 for the LEFT collection and 1 for the RIGHT collection.
 
     Returns:
-        The symmetric difference of two sequences as a list.
+        The symmetric difference of two sequences as a list (sorted, if compared by merging),
+        or the number of its elements, when `count_only` is enabled.
 
     Usage:
 
@@ -156,15 +460,326 @@ def symmdiff(collection1: KeysT, collection2: KeysT, /) -> Sequence[T]:
     >>> collection2 = ["e", "b", "a"]
     >>> result = symmdiff(collection1, collection2)
     >>> print(result)
-    ["c", "e"]
+    ['c', 'e']
+
+    >>> print(symmdiff([1, 2, 3], [2, 3, 4], presorted=True, with_side=True))
+    [(1, 0), (4, 1)]
+    >>> print(symmdiff([1, 2, 3], [2, 3, 4], count_only=True))
+    2
+    """
+    return symmdiff_many(
+        collection1,
+        collection2,
+        presorted=presorted,
+        count_only=count_only,
+        with_side=with_side,
+    )
+
+
+@overload
+def symmdiff_many(
+    *collections: Iterable[Any],
+    presorted: bool = ...,
+    count_only: Literal[False] = ...,
+    with_side: bool = ...,
+) -> Sequence[Any]: ...
+
+
+@overload
+def symmdiff_many(
+    *collections: Iterable[Any],
+    presorted: bool = ...,
+    count_only: Literal[True],
+    with_side: bool = ...,
+) -> int: ...
+
+
+@overload
+def symmdiff_many(
+    *collections: Iterable[Any],
+    presorted: bool = ...,
+    count_only: bool,
+    with_side: bool = ...,
+) -> Sequence[Any] | int: ...
+
+
+def symmdiff_many(
+    *collections: Iterable[Any],
+    presorted: bool = False,
+    count_only: bool = False,
+    with_side: bool = False,
+) -> Sequence[Any] | int:
+    """Obtain the elements, which are present in only one of the collections.
+
+    N-way variant of `symmdiff`. Note that for more than two collections the result differs
+    from the chained `symmdiff` calls: elements present in an odd number (three or more)
+    of collections are not included in the result.
+
+    Args:
+        *collections: Collections to compare.
+        presorted: If enable, all collections are treated as sorted (in ascending order)
+                   iterables, and compared by merging.
+        count_only: If enable, return only the number of elements of the result.
+        with_side: If enable, each element is returned as two-element tuple (element, side),
+                   where side is the index of the collection containing the element.
+
+    Returns:
+        A list of elements, which are present in only one of the collections
+        (sorted, if compared by merging), or the number of its elements,
+        when `count_only` is enabled.
+
+    Usage:
+
+    >>> from pure_utils import symmdiff_many
+
+    >>> print(sorted(symmdiff_many([1, 2, 3], [2, 3, 4], [3, 5])))
+    [1, 4, 5]
+    >>> print(symmdiff_many([1, 2, 3], [2, 3, 4], [3, 5], presorted=True, with_side=True))
+    [(1, 0), (4, 1), (5, 2)]
+    """
+    result: Iterable[Any]
+
+    if presorted:
+        result = isymmdiff(*collections, with_side=with_side)
+    elif _are_sorted_sequences(collections):
+        try:
+            result = list(isymmdiff(*collections, with_side=with_side))
+        except TypeError:
+            # Elements of different collections are not comparable
+            result = _symmdiff_by_sets(collections, with_side)
+    else:
+        result = _symmdiff_by_sets(collections, with_side)
+
+    if count_only:
+        return len(result) if isinstance(result, Sized) else sum(1 for _ in result)
+
+    return list(result)
+
+
+def symmdiff_approx(
+    collection1: Iterable[Any],
+    collection2: Iterable[Any],
+    /,
+    *,
+    capacity: int = DEFAULT_BLOOM_CAPACITY,
+    error_rate: float = DEFAULT_BLOOM_ERROR_RATE,
+) -> Generator[Any, None, None]:
+    """Lazily obtain the approximate symmetric difference of two collections (in bounded memory).
+
+    Instead of exact sets, the collections are represented by Bloom filters
+    (see `BloomFilter`), so the memory usage is fixed up front - three filters
+    of the specified capacity and error rate (`BloomFilter.estimate_size`).
+
+    Elements are never wrongly included into the result, but due to false positives
+    some elements (about `error_rate` share) may be missed.
+
+    The first collection is iterated twice, so it must be re-iterable (not a generator).
+
+    Args:
+        collection1: The first collection (re-iterable).
+        collection2: The second collection.
+        capacity: Expected number of unique elements in each collection.
+        error_rate: Acceptable false positive rate (0.01 by default).
+
+    Returns:
+        Generator of elements of the symmetric difference
+        (first, elements of the second collection, then of the first one).
+
+    Usage:
+
+    >>> from pure_utils import symmdiff_approx
+
+    >>> result = symmdiff_approx(range(0, 10), range(5, 15), capacity=100)
+    >>> print(sorted(result))
+    [0, 1, 2, 3, 4, 10, 11, 12, 13, 14]
+    """
+    # Filters are created right away, so invalid arguments are reported on call
+    filters = tuple(BloomFilter(capacity, error_rate) for _ in range(3))
+    return _symmdiff_approx(collection1, collection2, *filters)
+
+
+def _symmdiff_approx(
+    collection1: Iterable[Any],
+    collection2: Iterable[Any],
+    filter1: "BloomFilter",
+    filter2: "BloomFilter",
+    emitted: "BloomFilter",
+) -> Generator[Any, None, None]:
+    for item in collection1:
+        filter1.add(item)
+
+    for item in collection2:
+        # The result of adding to the filter is also used for deduplication
+        if not filter2.add(item) and item not in filter1:
+            yield item
+
+    for item in collection1:
+        if item not in filter2 and not emitted.add(item):
+            yield item
+
+
+def unique(
+    iterable: Iterable[T],
+    /,
+    *,
+    approx: bool = False,
+    capacity: int = DEFAULT_BLOOM_CAPACITY,
+    error_rate: float = DEFAULT_BLOOM_ERROR_RATE,
+) -> Generator[T, None, None]:
+    """Lazily deduplicate elements of the iterable (the order of elements is preserved).
+
+    By default, seen elements are stored into exact set. In approximate mode, they are
+    stored into Bloom filter (see `BloomFilter`) with fixed memory usage, but due to false
+    positives some unique elements (about `error_rate` share) may be dropped.
+
+    Args:
+        iterable: Any iterable collection of hashable elements.
+        approx: If enable, use Bloom filter instead of set.
+        capacity: Expected number of unique elements (for approximate mode).
+        error_rate: Acceptable false positive rate (for approximate mode, 0.01 by default).
+
+    Returns:
+        Generator of the first occurrences of elements.
+
+    Usage:
+
+    >>> from pure_utils import unique
+
+    >>> print(list(unique([3, 1, 3, 2, 1])))
+    [3, 1, 2]
+    >>> print(list(unique([3, 1, 3, 2, 1], approx=True, capacity=100)))
+    [3, 1, 2]
     """
-    return list(set(collection1).symmetric_difference(set(collection2)))
+    if approx:
+        bloom = BloomFilter(capacity, error_rate)
+        return (_ for _ in iterable if not bloom.add(_))
+
+    return _unique_exact(iterable)
+
+
+def _unique_exact(iterable: Iterable[T]) -> Generator[T, None, None]:
+    seen: set[T] = set()
+    seen_add = seen.add
+
+    for item in iterable:
+        if item not in seen:
+            seen_add(item)
+            yield item
+
+
+def isymmdiff(*collections: Iterable[Any], with_side: bool = False) -> Generator[Any, None, None]:
+    """Lazily obtain the elements, which are present in only one of the sorted collections.
+
+    The collections are merged in a single pass, so any iterables (generators, file readers,
+    database cursors, etc.) are supported and only one element of each collection
+    is held in memory.
+
+    All collections must be sorted in ascending order (duplicates are allowed),
+    otherwise the result is undefined.
+
+    Args:
+        *collections: Sorted iterables to compare.
+        with_side: If enable, each element is yielded as two-element tuple (element, side),
+                   where side is the index of the collection containing the element.
+
+    Returns:
+        Generator of the elements in ascending order.
+
+    Usage:
+
+    >>> from pure_utils import isymmdiff
+
+    >>> left = (_ for _ in range(0, 10, 2))
+    >>> right = (_ for _ in range(0, 10, 3))
+    >>> print(list(isymmdiff(left, right, with_side=True)))
+    [(2, 0), (3, 1), (4, 0), (8, 0), (9, 1)]
+    """
+    if len(collections) == 2:
+        yield from _isymmdiff_pair(*collections, with_side=with_side)
+        return
+
+    tagged = (zip(collection, repeat(side)) for side, collection in enumerate(collections))
+
+    for value, group in groupby(merge(*tagged, key=_value_of), key=_value_of):
+        _, side = next(group)
+
+        if all(_ == side for _ in map(_side_of, group)):
+            yield (value, side) if with_side else value
+
+
+_value_of = itemgetter(0)
+_side_of = itemgetter(1)
+
+
+def _isymmdiff_pair(
+    collection1: Iterable[Any], collection2: Iterable[Any], *, with_side: bool
+) -> Generator[Any, None, None]:
+    # Two-pointer merge, which is much faster than generic heap-based merge
+    left, right = iter(collection1), iter(collection2)
+    a, b = next(left, _MISSING), next(right, _MISSING)
+
+    while a is not _MISSING and b is not _MISSING:
+        if a < b:
+            yield (a, 0) if with_side else a
+            a = _next_distinct(left, a)
+        elif b < a:
+            yield (b, 1) if with_side else b
+            b = _next_distinct(right, b)
+        else:
+            a, b = _next_distinct(left, a), _next_distinct(right, b)
+
+    for side, value, rest in ((0, a, left), (1, b, right)):
+        while value is not _MISSING:
+            yield (value, side) if with_side else value
+            value = _next_distinct(rest, value)
+
+
+def _next_distinct(iterator: Iterator[Any], value: Any) -> Any:
+    for item in iterator:
+        if item != value:
+            return item
+
+    return _MISSING
+
+
+def _are_sorted_sequences(collections: Sequence[Iterable[Any]]) -> bool:
+    if not all(isinstance(_, Sequence) for _ in collections):
+        return False
+
+    if sum(map(len, collections)) < DEFAULT_SORTED_MERGE_THRESHOLD:  # type: ignore[arg-type]
+        return False
+
+    try:
+        return all(all(map(le, _, islice(_, 1, None))) for _ in collections)
+    except TypeError:
+        # Elements are not comparable
+        return False
+
+
+def _symmdiff_by_sets(collections: Sequence[Iterable[Any]], with_side: bool) -> Iterable[Any]:
+    if len(collections) == 2 and not with_side:
+        return set(collections[0]).symmetric_difference(collections[1])
+
+    sets = [set(_) for _ in collections]
+    counter = Counter(chain.from_iterable(sets))
+
+    return [
+        (value, side) if with_side else value
+        for side, values in enumerate(sets)
+        for value in values
+        if counter[value] == 1
+    ]
 
 
 def omit(container: Mapping[str, Any], keys: KeysT, /) -> Mapping[str, Any]:
     """Omit key-value pairs from the source dictionary, by keys sequence.
 
-    The function does not modify the original collection.
+    The function does not modify the original collection and preserves the order of keys.
+
+    When only a small share of the keys is omitted (up to 1/8 of the container),
+    the container is copied and omitted keys are deleted from the copy, otherwise
+    the container is filtered against a set of omitted keys (deletion doesn't shrink
+    the copy, so the result would keep the memory of the whole container).
 
     Args:
         container: Source data container.
@@ -180,10 +795,72 @@ def omit(container: Mapping[str, Any], keys: KeysT, /) -> Mapping[str, Any]:
     >>> container = {"key1": "val1", "key2": "val2", "key3": "val3", "key4": "val4"}
     >>> result = omit(container, ["key2", "key4"] )
     >>> print(result)
-    {"key1": "val1", "key3": "val3"}
+    {'key1': 'val1', 'key3': 'val3'}
     """
-    keys_diff: KeysT = symmdiff(container.keys(), keys)
-    return {_: container[_] for _ in keys_diff if _ in container}
+    if not isinstance(keys, Sized):
+        keys = tuple(keys)
+
+    if len(keys) <= len(container) // _OMIT_BY_DELETION_SHARE:
+        return _omit_by_deletion(container, keys)
+
+    return _omit_by_filter(container, keys if isinstance(keys, AbstractSet) else frozenset(keys))
+
+
+def _omit_by_deletion(container: Mapping[str, Any], keys: Iterable[str]) -> Mapping[str, Any]:
+    result = dict(container)
+
+    for key in keys:
+        result.pop(key, None)
+
+    return result
+
+
+def _omit_by_filter(container: Mapping[str, Any], keys: AbstractSet[str]) -> Mapping[str, Any]:
+    return {key: value for key, value in container.items() if key not in keys}
+
+
+def omit_many(
+    containers: Iterable[Mapping[str, Any]],
+    keys: KeysT,
+    /,
+) -> Iterator[Mapping[str, Any]]:
+    """Omit key-value pairs from each dictionary of the stream, by keys sequence.
+
+    Works like `omit`, but the omitted keys are prepared once for the whole stream,
+    so the cost per dictionary is a single dictionary construction.
+
+    The function does not modify the original collections.
+
+    Args:
+        containers: Iterable of source data containers.
+        keys: A sequence of strings or keys() for omitted pairs in the source data containers.
+
+    Returns:
+        An iterator of data containers without omitted key-value pairs (lazily evaluated).
+
+    Usage:
+
+    >>> from pure_utils import omit_many
+
+    >>> containers = [{"key1": "val1", "key2": "val2"}, {"key1": "val3", "key3": "val4"}]
+    >>> result = omit_many(containers, ["key1"])
+    >>> print(list(result))
+    [{'key2': 'val2'}, {'key3': 'val4'}]
+    """
+    return map(_omit_projector(keys), containers)
+
+
+def _omit_projector(keys: KeysT) -> Callable[[Mapping[str, Any]], Mapping[str, Any]]:
+    omitted = frozenset(keys)
+    omitted_keys = tuple(omitted)
+
+    def project(container: Mapping[str, Any]) -> Mapping[str, Any]:
+        if len(omitted_keys) <= len(container) // _OMIT_BY_DELETION_SHARE:
+            return _omit_by_deletion(container, omitted_keys)
+
+        return _omit_by_filter(container, omitted)
+
+    return project
 
 
 def paginate(collection: Sequence[T], /, *, size: int) -> Sequence[Sequence[T]]:
@@ -216,6 +893,73 @@ def paginate(collection: Sequence[T], /, *, size: int) -> Sequence[Sequence[T]]:
     return [collection[start : start + size] for start in range(0, len(collection), size)]
 
 
+def ipaginate(
+    collection: Iterable[T], /, *, size: int
+) -> Generator[Sequence[T] | memoryview, None, None]:
+    """Lazily split the collection into page(s), limited by size.
+
+    Unlike `paginate`, pages are yielded one by one, so only a single page is held in memory.
+
+    Objects supporting the buffer protocol (bytes, bytearray, array.array, mmap) are paged
+    without copying - each page is a memoryview over the original buffer. Other sequences
+    are paged by slicing, and any other iterable (generators, cursors, etc.) is consumed
+    incrementally with pages represented as lists.
+
+    The function does not modify the original collection.
+
+    Args:
+        collection: Any iterable collection of homogeneous elements.
+        size: Page size of elements in one page.
+
+    Returns:
+        Generator of pages.
+
+    Raises:
+        ValueError: If page size is less than zero.
+
+    Usage:
+
+    >>> from pure_utils import ipaginate
+
+    >>> pages = ipaginate((_ for _ in range(1, 11)), size=3)
+    >>> print(list(pages))
+    [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]]
+
+    >>> pages = ipaginate(b"abcdefg", size=3)
+    >>> print([bytes(_) for _ in pages])
+    [b'abc', b'def', b'g']
+    """
+    if size <= 0:
+        raise ValueError("Page size must be a positive integer")
+
+    return _ipaginate(collection, size)
+
+
+def _ipaginate(
+    collection: Iterable[T], size: int
+) -> Generator[Sequence[T] | memoryview, None, None]:
+    try:
+        view = memoryview(collection)  # type: ignore[arg-type]
+    except TypeError:
+        pass
+    else:
+        # Slices of a memoryview share the original buffer (zero-copy)
+        for start in range(0, len(view), size):
+            yield view[start : start + size]
+        return
+
+    # Length of the lazy sequence is unknown, so it's consumed as any other iterable
+    if isinstance(collection, Sequence) and not isinstance(collection, LazySeq):
+        for start in range(0, len(collection), size):
+            yield collection[start : start + size]
+        return
+
+    iterator = iter(collection)
+
+    while page := list(islice(iterator, size)):
+        yield page
+
+
 def pick(container: Mapping[str, Any], keys: KeysT, /) -> Mapping[str, Any]:
     """Pick key-value pairs from the source dictionary, by keys sequence.
 
@@ -242,6 +986,184 @@ def pick(container: Mapping[str, Any], keys: KeysT, /) -> Mapping[str, Any]:
     return {_: container[_] for _ in keys if _ in container}
 
 
+def pick_many(
+    containers: Iterable[Mapping[str, Any]],
+    keys: KeysT,
+    /,
+) -> Iterator[Mapping[str, Any]]:
+    """Pick key-value pairs from each dictionary of the stream, by keys sequence.
+
+    Works like `pick`, but the picked keys are compiled once for the whole stream
+    (into `operator.itemgetter`), so the cost per dictionary is a single dictionary
+    construction.
+
+    The function does not modify the original collections.
+
+    Args:
+        containers: Iterable of source data containers.
+        keys: A sequence of strings or keys() for pick pairs in the source data containers.
+
+    Returns:
+        An iterator of new data containers with picked key-value pairs (lazily evaluated).
+
+    Usage:
+
+    >>> from pure_utils import pick_many
+
+    >>> containers = [{"key1": "val1", "key2": "val2"}, {"key1": "val3", "key3": "val4"}]
+    >>> result = pick_many(containers, ["key1", "key2"])
+    >>> print(list(result))
+    [{'key1': 'val1', 'key2': 'val2'}, {'key1': 'val3'}]
+    """
+    return map(_pick_projector(keys), containers)
+
+
+def _pick_projector(keys: KeysT) -> Callable[[Mapping[str, Any]], Mapping[str, Any]]:
+    picked = tuple(dict.fromkeys(keys))
+
+    def project_slow(container: Mapping[str, Any]) -> Mapping[str, Any]:
+        return {_: container[_] for _ in picked if _ in container}
+
+    if len(picked) < 2:
+        return project_slow
+
+    getter = itemgetter(*picked)
+
+    def project(container: Mapping[str, Any]) -> Mapping[str, Any]:
+        # Lookup in subclasses (e.g. defaultdict) may call `__missing__` and modify them
+        if type(container) is not dict:
+            return project_slow(container)
+
+        try:
+            return dict(zip(picked, getter(container)))
+        except KeyError:
+            # Some of the keys are missing, so fallback to the safe lookup
+            return project_slow(container)
+
+    return project
+
+
+def pmap(
+    func: Callable[[Any], T],
+    iterable: Iterable[Any],
+    /,
+    *,
+    chunk_size: int = DEFAULT_PMAP_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    executor: Literal["thread", "process"] = "thread",
+    ordered: bool = True,
+) -> Generator[T, None, None]:
+    """Lazily apply the function to each element of the iterable in parallel.
+
+    The iterable is split into chunks (pages) of `chunk_size` elements, which are processed
+    by the pool of threads or processes. The number of chunks being processed at the same time
+    is limited (two per worker), so the iterable is consumed only as fast as results are
+    consumed.
+
+    An exception raised by the function in any chunk is propagated as soon as possible,
+    and all pending chunks are cancelled.
+
+    For the "process" executor, the function and elements must be picklable.
+
+    Args:
+        func: A function to apply to each element.
+        iterable: Any iterable collection of elements.
+        chunk_size: Number of elements in one chunk (256 by default).
+        workers: Number of workers (number of CPUs by default).
+        executor: Type of the workers pool: "thread" (default) or "process".
+        ordered: If enable (by default), results are yielded in the order of the elements,
+                 otherwise in the order of completion of the chunks (faster).
+
+    Returns:
+        Generator of the function results.
+
+    Raises:
+        ValueError: If chunk size or number of workers is less than one,
+                    or executor type is unknown.
+
+    Usage:
+
+    >>> from pure_utils import pmap
+
+    >>> def square(x):
+    ...     return x * x
+
+    >>> print(list(pmap(square, range(10), chunk_size=3, workers=2)))
+    [0, 1, 4, 9, 16, 25, 36, 49, 64, 81]
+
+    >>> results = pmap(square, range(10_000_000), executor="process")
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be a positive integer")
+
+    if workers is not None and workers <= 0:
+        raise ValueError("Number of workers must be a positive integer")
+
+    if executor not in _EXECUTORS:
+        raise ValueError(f"Unknown executor type: {executor!r} (use 'thread' or 'process')")
+
+    return _pmap(func, iterable, chunk_size, workers, _EXECUTORS[executor], ordered)
+
+
+_EXECUTORS: dict[str, Callable[..., Executor]] = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+
+
+def _pmap(
+    func: Callable[[Any], T],
+    iterable: Iterable[Any],
+    chunk_size: int,
+    workers: Optional[int],
+    executor_class: Callable[..., Executor],
+    ordered: bool,
+) -> Generator[T, None, None]:
+    iterator = iter(iterable)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    executor = executor_class(max_workers=workers)
+    max_in_flight = (workers or cpu_count() or 1) * DEFAULT_PMAP_CHUNKS_PER_WORKER
+    in_flight: deque[Future] = deque()
+
+    def submit() -> None:
+        for chunk in islice(chunks, max_in_flight - len(in_flight)):
+            in_flight.append(executor.submit(_map_chunk, func, chunk))
+
+    try:
+        submit()
+
+        while in_flight:
+            if ordered:
+                while in_flight and in_flight[0].done():
+                    yield from in_flight.popleft().result()
+                    submit()
+            else:
+                for future in [_ for _ in in_flight if _.done()]:
+                    in_flight.remove(future)
+                    yield from future.result()
+                submit()
+
+            _wait_any(in_flight)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _map_chunk(func: Callable[[Any], T], chunk: list[Any]) -> list[T]:
+    return list(map(func, chunk))
+
+
+def _wait_any(futures: Iterable[Future]) -> None:
+    pending = [_ for _ in futures if not _.done()]
+
+    if pending:
+        wait(pending, return_when=FIRST_COMPLETED)
+
+    # Raise an exception of any completed chunk, without waiting for the preceding chunks
+    for future in futures:
+        if future.done() and future.exception() is not None:
+            future.result()
+
+
 def unpack(container: Mapping[str, Any], attributes: KeysT, /) -> tuple[Any, ...]:
     """Unpack the values of container object into separate variables.
 
@@ -290,3 +1212,695 @@ def unpack(container: Mapping[str, Any], attributes: KeysT, /) -> tuple[Any, ...
             unpacked_values.append(None)
 
     return tuple(unpacked_values)
+
+
+def unpack_many(
+    containers: Iterable[Any],
+    attributes: KeysT,
+    /,
+) -> Iterator[tuple[Any, ...]]:
+    """Unpack the values of each container object of the stream into tuples.
+
+    Works like `unpack`, but the attributes are compiled once (see `Unpacker`)
+    for the whole stream, and also supports nested dotted paths.
+
+    Args:
+        containers: Iterable of source data containers (dicts or objects).
+        attributes: A sequence of strings (attribute names or dotted paths) to unpack.
+
+    Returns:
+        An iterator of tuples with unpacked values (lazily evaluated).
+
+    Usage:
+
+    >>> from pure_utils import unpack_many
+
+    >>> rows = [{"id": 1, "user": {"name": "Bob"}}, {"id": 2, "user": {"name": "Alice"}}]
+    >>> print(list(unpack_many(rows, ("id", "user.name"))))
+    [(1, 'Bob'), (2, 'Alice')]
+    """
+    return Unpacker(attributes).unpack_many(containers)
+
+
+class Unpacker:
+    """Compiled accessor, which unpacks the values of container objects into tuples.
+
+    The attributes are compiled once (into `operator.itemgetter` and `operator.attrgetter`),
+    so the cost of unpacking a container is close to a single getter call.
+
+    Attributes may be nested dotted paths (e.g. "user.address.city"), each level of the path
+    is resolved as a key for mappings and as an attribute for other objects.
+    The value of a missing key/attribute is None.
+
+    Usage:
+
+    >>> from pure_utils import Unpacker
+
+    >>> unpacker = Unpacker(("id", "user.address.city"))
+
+    >>> row = {"id": 1, "user": {"address": {"city": "Paris"}}}
+    >>> print(unpacker(row))
+    (1, 'Paris')
+
+    >>> print(list(unpacker.unpack_many([row, {"id": 2}])))
+    [(1, 'Paris'), (2, None)]
+    """
+
+    __slots__ = ("attributes", "_paths", "_get_items", "_get_attrs", "__weakref__")
+
+    def __init__(self, attributes: KeysT, /) -> None:
+        """Initialize unpacker object.
+
+        Args:
+            attributes: A sequence of strings (attribute names or dotted paths) to unpack.
+        """
+        self.attributes = tuple(attributes)
+        self._paths = tuple(tuple(_.split(".")) for _ in self.attributes)
+        self._get_attrs = self._compile_getter(attrgetter)
+        # Nested paths in mappings can't be resolved by a single itemgetter
+        self._get_items = (
+            self._compile_getter(itemgetter)
+            if all(len(_) == 1 for _ in self._paths)
+            else self._unpack_slow
+        )
+
+    def __call__(self, container: Any, /) -> tuple[Any, ...]:
+        """Unpack the values of container object into tuple.
+
+        Args:
+            container: Source data container (dict or object).
+
+        Returns:
+            A tuple of unpacked values of the specified attributes.
+        """
+        # Lookup in subclasses of dict (e.g. defaultdict) may call `__missing__` and modify them
+        if type(container) is not dict and isinstance(container, Mapping):
+            return self._unpack_slow(container)
+
+        try:
+            if type(container) is dict:
+                return self._get_items(container)
+            return self._get_attrs(container)
+        except (KeyError, AttributeError):
+            # Some of the attributes are missing, so fallback to the safe lookup
+            return self._unpack_slow(container)
+
+    def unpack_many(self, containers: Iterable[Any], /) -> Iterator[tuple[Any, ...]]:
+        """Unpack the values of each container object of the stream into tuples.
+
+        Args:
+            containers: Iterable of source data containers (dicts or objects).
+
+        Returns:
+            An iterator of tuples with unpacked values (lazily evaluated).
+        """
+        return map(self, containers)
+
+    def _compile_getter(self, getter: Callable) -> Callable[[Any], tuple[Any, ...]]:
+        if not self.attributes:
+            return lambda _: ()
+
+        if len(self.attributes) == 1:
+            single_getter = getter(self.attributes[0])
+            return lambda _: (single_getter(_),)
+
+        return getter(*self.attributes)
+
+    def _unpack_slow(self, container: Any) -> tuple[Any, ...]:
+        return tuple(self._resolve(container, _) for _ in self._paths)
+
+    @staticmethod
+    def _resolve(obj: Any, path: tuple[str, ...]) -> Any:
+        for name in path:
+            if obj is None:
+                break
+
+            obj = obj.get(name) if isinstance(obj, Mapping) else getattr(obj, name, None)
+
+        return obj
+
+
+class Path:
+    """Compiled path to the nested element of mappings and sequences.
+
+    Each level of the path is resolved as a key for mappings and as an index for sequences.
+    Lookups by path don't raise exceptions on missing elements, the default value
+    is returned instead.
+
+    Usage:
+
+    >>> from pure_utils import Path
+
+    >>> path = Path("users.0.name")
+    >>> print(path.get({"users": [{"name": "Bob"}]}))
+    Bob
+    >>> print(path.get({"users": []}, "does not exists"))
+    does not exists
+    """
+
+    __slots__ = ("keys", "_segments", "__weakref__")
+
+    def __init__(
+        self, path: str | Sequence[Any], /, *, separator: str = DEFAULT_PATH_SEPARATOR
+    ) -> None:
+        """Initialize path object.
+
+        Args:
+            path: Path string (e.g. "users.0.name") or sequence of keys/indexes.
+            separator: Separator of the path string levels (default ".").
+        """
+        self.keys = tuple(path.split(separator) if isinstance(path, str) else path)
+        self._segments = tuple((_, self._as_index(_)) for _ in self.keys)
+
+    def __repr__(self) -> str:
+        """Get string representation of path object."""
+        return f"{self.__class__.__name__}({self.keys!r})"
+
+    def get(self, container: Any, default: Any = None, /) -> Any:
+        """Get value of the nested element, and if it is missing, return the default value.
+
+        Args:
+            container: Nested data container (mappings and sequences).
+            default: Optional default value, returned when no element by the path.
+
+        Returns:
+            The value of the nested element, or default value, when no element by the path.
+        """
+        obj = container
+
+        for key, index in self._segments:
+            # Exact type checks go first, because ABC instance checks are slow
+            obj_type = type(obj)
+
+            if obj_type is dict or (obj_type not in _SEQUENCE_TYPES and isinstance(obj, Mapping)):
+                try:
+                    obj = obj.get(key, _MISSING)
+                except TypeError:
+                    # The key is unhashable (so it can't be in the mapping)
+                    return default
+                if obj is _MISSING:
+                    return default
+            elif obj_type is LazySeq and index is not None:
+                # Bounds of the lazy sequence are checked without consuming it to the end
+                obj = obj.get(index, _MISSING)
+                if obj is _MISSING:
+                    return default
+            elif (
+                index is not None
+                and (obj_type in _SEQUENCE_TYPES or isinstance(obj, Sequence))
+                and -len(obj) <= index < len(obj)
+            ):
+                obj = obj[index]
+            else:
+                return default
+
+        return obj
+
+    @staticmethod
+    def _as_index(key: Any) -> Optional[int]:
+        if isinstance(key, int):
+            return key
+
+        if isinstance(key, str) and _INDEX_PATTERN.fullmatch(key):
+            return int(key)
+
+        return None
+
+
+class SequenceView(Sequence[T]):
+    """Lightweight read-only view over the range of sequence elements (without copying).
+
+    Slicing of the view produces a new view over the same sequence.
+    When the view is pickled (e.g. to pass it to a process pool), only the elements
+    of the view are serialized (as a list).
+
+    Usage:
+
+    >>> from pure_utils import SequenceView
+
+    >>> view = SequenceView([1, 2, 3, 4, 5])[1:4]
+    >>> print(len(view), view[0], list(view))
+    3 2 [2, 3, 4]
+    """
+
+    __slots__ = ("_sequence", "_range", "__weakref__")
+
+    def __init__(self, sequence: Sequence[T], /, elements: Optional[range] = None) -> None:
+        """Initialize sequence view object.
+
+        Args:
+            sequence: Source sequence.
+            elements: Optional range of indexes of the viewed elements (all by default).
+        """
+        self._sequence = sequence
+        self._range = range(len(sequence)) if elements is None else elements
+
+    def __len__(self) -> int:
+        """Get number of the viewed elements."""
+        return len(self._range)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        """Get the viewed element by index, or a new view by slice."""
+        if isinstance(index, slice):
+            return SequenceView(self._sequence, self._range[index])
+
+        return self._sequence[self._range[index]]
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over the viewed elements."""
+        return map(self._sequence.__getitem__, self._range)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle only the viewed elements."""
+        return (list, (list(self),))
+
+    def __repr__(self) -> str:
+        """Get string representation of sequence view object."""
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+
+class RecordBatch:
+    """Columnar container of homogeneous records (dictionaries with the same keys).
+
+    Values of each key are stored in a separate column: numeric columns are stored
+    into compact `array.array`, other columns into lists. In comparison with a list of
+    dictionaries, no hash table is allocated per record, and projections (`pick`/`omit`)
+    are performed per column, without any work per record.
+
+    Records are iterated as lightweight named tuples.
+
+    Usage:
+
+    >>> from pure_utils import RecordBatch
+
+    >>> batch = RecordBatch.from_records(
+    ...     [{"id": 1, "name": "Bob", "score": 0.5}, {"id": 2, "name": "Alice", "score": 0.7}]
+    ... )
+    >>> print(len(batch), batch.columns)
+    2 ('id', 'name', 'score')
+
+    >>> for row in batch.pick(["id", "name"]):
+    ...     print(row.id, row.name)
+    1 Bob
+    2 Alice
+
+    >>> print(batch.omit(["score"]).to_records())
+    [{'id': 1, 'name': 'Bob'}, {'id': 2, 'name': 'Alice'}]
+    """
+
+    __slots__ = ("_columns", "_length", "_row_type", "__weakref__")
+
+    def __init__(self, columns: Mapping[str, Sequence[Any]], /) -> None:
+        """Initialize record batch object.
+
+        Args:
+            columns: A mapping of column names to columns (sequences of the same length).
+
+        Raises:
+            ValueError: If columns have different lengths.
+        """
+        lengths = {len(_) for _ in columns.values()}
+
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+
+        self._columns = dict(columns)
+        self._length = lengths.pop() if lengths else 0
+        self._row_type = _row_type_of(tuple(self._columns))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]], /) -> "RecordBatch":
+        """Create record batch from the homogeneous records.
+
+        Keys of the first record define the columns of the batch.
+
+        Args:
+            records: Iterable of dictionaries with the same keys.
+
+        Returns:
+            A new record batch object.
+
+        Raises:
+            ValueError: If records have different keys.
+        """
+        iterator = iter(records)
+        first_record = next(iterator, None)
+
+        if first_record is None:
+            return cls({})
+
+        names = tuple(first_record)
+
+        rows = [tuple(first_record.values())]
+
+        for record in iterator:
+            if len(record) != len(names):
+                raise ValueError("All records must have the same keys")
+
+            try:
+                rows.append(tuple(record[_] for _ in names))
+            except KeyError:
+                raise ValueError("All records must have the same keys")
+
+        return cls._from_columns(
+            {name: _compact_column(_) for name, _ in zip(names, zip(*rows))}, len(rows)
+        )
+
+    def __len__(self) -> int:
+        """Get number of records."""
+        return self._length
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        """Iterate over records (as named tuples)."""
+        if not self._columns:
+            return map(self._row_type._make, repeat((), self._length))
+
+        return map(self._row_type._make, zip(*self._columns.values()))
+
+    def __getitem__(self, index: int | slice) -> "tuple[Any, ...] | RecordBatch":
+        """Get record (as named tuple) by index, or record batch by slice."""
+        if isinstance(index, slice):
+            return self._from_columns(
+                {name: _[index] for name, _ in self._columns.items()},
+                len(range(self._length)[index]),
+            )
+
+        # The index is checked against the number of records (the batch can have no columns)
+        index = range(self._length)[index]
+        return self._row_type._make(_[index] for _ in self._columns.values())
+
+    def __repr__(self) -> str:
+        """Get string representation of record batch object."""
+        return f"{self.__class__.__name__}(columns={self.columns!r}, length={self._length})"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Get names of columns."""
+        return tuple(self._columns)
+
+    def column(self, name: str, /) -> Sequence[Any]:
+        """Get column by name.
+
+        Args:
+            name: Name of the column.
+
+        Returns:
+            Column values (list or array.array).
+        """
+        return self._columns[name]
+
+    def pick(self, keys: KeysT, /) -> "RecordBatch":
+        """Pick columns by keys sequence (non-existent keys are ignored).
+
+        The columns are shared with the new batch, not copied.
+
+        Args:
+            keys: A sequence of strings or keys() for picked columns.
+
+        Returns:
+            A new record batch with picked columns (and the same number of records).
+        """
+        return self._from_columns(
+            {_: self._columns[_] for _ in keys if _ in self._columns}, self._length
+        )
+
+    def omit(self, keys: KeysT, /) -> "RecordBatch":
+        """Omit columns by keys sequence.
+
+        The columns are shared with the new batch, not copied.
+
+        Args:
+            keys: A sequence of strings or keys() for omitted columns.
+
+        Returns:
+            A new record batch without omitted columns (and the same number of records).
+        """
+        omitted = frozenset(keys)
+        return self._from_columns(
+            {k: v for k, v in self._columns.items() if k not in omitted}, self._length
+        )
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """Convert record batch to the list of dictionaries.
+
+        Returns:
+            A list of dictionaries (one per record).
+        """
+        if not self._columns:
+            return [{} for _ in range(self._length)]
+
+        names = tuple(self._columns)
+        return [dict(zip(names, _)) for _ in zip(*self._columns.values())]
+
+    @classmethod
+    def _from_columns(cls, columns: dict[str, Sequence[Any]], length: int) -> "RecordBatch":
+        # Create batch from the columns of the known length (without checks)
+        batch = cls.__new__(cls)
+        batch._columns = columns
+        batch._length = length
+        batch._row_type = _row_type_of(tuple(columns))
+        return batch
+
+
+@lru_cache(maxsize=DEFAULT_ROW_TYPES_CACHE_SIZE)
+def _row_type_of(names: tuple[str, ...]) -> Any:
+    # Creation of named tuple type is slow, so types are shared between batches
+    return namedtuple("Row", names, rename=True)  # type: ignore[misc]
+
+
+def _compact_column(values: Sequence[Any]) -> Sequence[Any]:
+    # Numeric columns are packed into arrays (8 bytes per value instead of object reference)
+    value_types = set(map(type, values))
+
+    if value_types == {float}:
+        return array("d", values)
+
+    if value_types == {int} and _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+        return array("q", values)
+
+    return list(values)
+
+
+_INT64_MIN: int = -(2**63)
+_INT64_MAX: int = 2**63 - 1
+
+
+class LazySeq(Sequence[T]):
+    """Sequence with cached random access over any iterable (e.g. generator).
+
+    Elements are pulled from the underlying iterator only as far as the highest requested
+    index, and cached for repeated access. Negative indexes, `len()` and open-ended slices
+    consume the iterator to the end.
+
+    Lazy sequences are accepted by container utilities (`first`, `get_or_else`, `get_in`,
+    `ipaginate`, etc.), without consuming more elements than necessary.
+
+    Usage:
+
+    >>> from pure_utils import LazySeq, get_or_else
+
+    >>> seq = LazySeq(_ * _ for _ in range(1_000_000))
+    >>> print(seq[3], get_or_else(seq, 5))
+    9 25
+    >>> print(seq[:3])
+    [0, 1, 4]
+    """
+
+    __slots__ = ("_iterator", "_cache", "__weakref__")
+
+    def __init__(self, iterable: Iterable[T], /) -> None:
+        """Initialize lazy sequence object.
+
+        Args:
+            iterable: Any iterable collection.
+        """
+        self._iterator: Optional[Iterator[T]] = iter(iterable)
+        self._cache: list[T] = []
+
+    def __getitem__(self, index):  # type: ignore[override]
+        """Get element by index, or a list of elements by slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.start or 0, index.stop, index.step or 1
+
+            if stop is None or start < 0 or stop < 0 or step < 0:
+                self._drain()
+            else:
+                self._fill(stop - 1)
+        elif index < 0:
+            self._drain()
+        else:
+            self._fill(index)
+
+        return self._cache[index]
+
+    def __len__(self) -> int:
+        """Get number of elements (consumes the iterator to the end)."""
+        self._drain()
+        return len(self._cache)
+
+    def __bool__(self) -> bool:
+        """Check that sequence is not empty (consumes at most one element)."""
+        return self._fill(0)
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over elements (cached elements first)."""
+        index = 0
+
+        while self._fill(index):
+            yield self._cache[index]
+            index += 1
+
+    def __repr__(self) -> str:
+        """Get string representation of lazy sequence object."""
+        state = "exhausted" if self._iterator is None else "pending"
+        return f"{self.__class__.__name__}({self._cache!r}, {state})"
+
+    def get(self, index: int, default: Any = None, /) -> Any:
+        """Get element by index, and if it is missing, return the default value.
+
+        Args:
+            index: Index of the element.
+            default: Optional default value, returned when no element at the specified index.
+
+        Returns:
+            The value of the element at the specified index, or default value.
+        """
+        if index < 0:
+            self._drain()
+            return self._cache[index] if -len(self._cache) <= index else default
+
+        return self._cache[index] if self._fill(index) else default
+
+    def _fill(self, index: int) -> bool:
+        missing = index + 1 - len(self._cache)
+
+        if missing > 0 and self._iterator is not None:
+            self._cache.extend(islice(self._iterator, missing))
+            if len(self._cache) <= index:
+                self._iterator = None
+
+        return index < len(self._cache)
+
+    def _drain(self) -> None:
+        if self._iterator is not None:
+            self._cache.extend(self._iterator)
+            self._iterator = None
+
+
+class BloomFilter:
+    """Probabilistic set with fixed memory usage (Bloom filter).
+
+    Membership test may return false positives (with probability about `error_rate`,
+    while the number of added elements does not exceed `capacity`), but never false negatives.
+
+    Bits are stored into bytearray, positions of bits are calculated by double hashing
+    of the built-in `hash()`, so the filter is valid only within the current process
+    (hashes of strings are randomized between processes).
+
+    Usage:
+
+    >>> from pure_utils import BloomFilter
+
+    >>> print(BloomFilter.estimate_size(1_000_000, 0.01))
+    1198133
+
+    >>> bloom = BloomFilter(1000, 0.01)
+    >>> bloom.add("some")
+    False
+    >>> print("some" in bloom, "other" in bloom)
+    True False
+    """
+
+    __slots__ = ("capacity", "error_rate", "bits_count", "hashes_count", "_bits", "__weakref__")
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_BLOOM_ERROR_RATE, /) -> None:
+        """Initialize Bloom filter object.
+
+        Args:
+            capacity: Expected number of elements.
+            error_rate: Acceptable false positive rate (0.01 by default).
+
+        Raises:
+            ValueError: If capacity is less than one, or error rate is not in (0, 1) range.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits_count, self.hashes_count = self._estimate(capacity, error_rate)
+        self._bits = bytearray((self.bits_count + 7) // 8)
+
+    def __contains__(self, item: Any) -> bool:
+        """Check that element (probably) was added into the filter."""
+        bits, bits_count = self._bits, self.bits_count
+        position, step = self._hashes(item)
+
+        for _ in range(self.hashes_count):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position = (position + step) % bits_count
+
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        """Get size of the filter in bytes."""
+        return len(self._bits)
+
+    @classmethod
+    def estimate_size(cls, capacity: int, error_rate: float = DEFAULT_BLOOM_ERROR_RATE, /) -> int:
+        """Estimate size of the filter in bytes (before creation).
+
+        Args:
+            capacity: Expected number of elements.
+            error_rate: Acceptable false positive rate (0.01 by default).
+
+        Returns:
+            Size of the filter in bytes.
+        """
+        bits_count, _ = cls._estimate(capacity, error_rate)
+        return (bits_count + 7) // 8
+
+    def add(self, item: Any) -> bool:
+        """Add element into the filter.
+
+        Args:
+            item: Hashable element.
+
+        Returns:
+            True, if element (probably) was already added into the filter earlier,
+            otherwise False.
+        """
+        bits, bits_count = self._bits, self.bits_count
+        position, step = self._hashes(item)
+        present = True
+
+        for _ in range(self.hashes_count):
+            index, mask = position >> 3, 1 << (position & 7)
+            if not bits[index] & mask:
+                bits[index] |= mask
+                present = False
+            position = (position + step) % bits_count
+
+        return present
+
+    def _hashes(self, item: Any) -> tuple[int, int]:
+        # Double hashing: two independent hashes from the halves of single 64-bit hash
+        item_hash = hash((item, _BLOOM_SALT))
+        h1, h2 = item_hash & 0xFFFFFFFF, ((item_hash >> 32) & 0xFFFFFFFF) | 1
+
+        return h1 % self.bits_count, h2 % self.bits_count or 1
+
+    @staticmethod
+    def _estimate(capacity: int, error_rate: float) -> tuple[int, int]:
+        if capacity <= 0:
+            raise ValueError("Capacity must be a positive integer")
+
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate must be in range (0, 1)")
+
+        bits_count = ceil(-capacity * log(error_rate) / (log(2) ** 2))
+        hashes_count = max(1, round(bits_count / capacity * log(2)))
+
+        return bits_count, hashes_count
+
+
+_BLOOM_SALT: int = 0x9E3779B9
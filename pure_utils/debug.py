@@ -1,28 +1,58 @@
 """Utilities for debugging and development."""
 
+from contextvars import ContextVar
+from copy import copy as shallow_copy
 from copy import deepcopy
-from functools import wraps
-from inspect import stack
+from functools import partial, wraps
+from inspect import isasyncgenfunction, isawaitable, iscoroutinefunction
+from itertools import repeat
 from logging import Logger
-from time import time
-from typing import Any, Callable, Optional
-
+from math import log
+from random import random
+from sys import _getframe
+from time import perf_counter_ns
+from types import FrameType
+from typing import Any, Callable, Literal, Optional, TypeAlias
+
+from pure_utils._internal._latency_stats import LatencyStats
+from pure_utils._internal._lazy_copy import lazy_copy
+from pure_utils._internal._memory_stats_serializers import (
+    MemoryStatsStringSerializer,
+    SerializedMemoryStatsT,
+)
+from pure_utils._internal._profile_aggregator import ProfileAggregator
 from pure_utils._internal._profile_stats_serializers import (
     ProfileStatsStringSerializer,
     SerializedProfileStatsT,
 )
-from pure_utils.profiler import Profiler
+from pure_utils.metrics import Timer
+from pure_utils.profiler import (
+    DEFAULT_MEMORY_TRACEBACK_FRAMES,
+    DEFAULT_SAMPLING_INTERVAL,
+    MemoryProfiler,
+    Profiler,
+    SamplingProfiler,
+)
 
 from .types import CallableAnyT
 
-__all__ = ["around", "caller", "deltatime", "profileit"]
+__all__ = ["around", "caller", "callers", "deltatime", "memprofile", "profileit"]
 
 
 DEFAULT_STACK_SIZE: int = 20
 DEFAULT_STACK_FRAME: int = 2
+DEFAULT_MEMPROFILE_TOP_N: int = 10
 
+CopyStrategyT: TypeAlias = Literal["none", "shallow", "deep", "lazy"]
+DEFAULT_COPY_STRATEGY: CopyStrategyT = "shallow"
 
-def around(*, before: Optional[Callable] = None, after: Optional[Callable] = None) -> Callable:
+
+def around(
+    *,
+    before: Optional[Callable] = None,
+    after: Optional[Callable] = None,
+    copy: CopyStrategyT = DEFAULT_COPY_STRATEGY,
+) -> Callable:
     """Add additional behavior before and after execution of decorated function.
 
     Args:
@@ -30,6 +60,14 @@ def around(*, before: Optional[Callable] = None, after: Optional[Callable] = Non
                 BEFORE calling the decorated function.
         after: A reference to afunction/method that must be executed
                AFTER calling the decorated function.
+        copy: Strategy of copying the arguments, passed to the handlers:
+              "none" - the original arguments are passed (no overhead);
+              "shallow" (default) - shallow copy of each argument;
+              "deep" - deep copy of the arguments (expensive for large arguments);
+              "lazy" - each argument is wrapped to the proxy, which makes its deep copy
+              only on the first access from the handler (so the AFTER handler sees
+              the arguments as they were changed by the decorated function; immutable
+              arguments, e.g. numbers and strings, are passed as is).
 
     The decorator highlights additional memory for data exchange
     capabilities between before and after handlers.
@@ -39,6 +77,7 @@ def around(*, before: Optional[Callable] = None, after: Optional[Callable] = Non
 
     Raises:
         ValueError: If one of the handlers (`before`, `after`) is not specified.
+        ValueError: If copy strategy is unknown.
 
     Usage:
 
@@ -76,19 +115,44 @@ def around(*, before: Optional[Callable] = None, after: Optional[Callable] = Non
     >>> func3()
     after!
     in da func3
+
+    Coroutine functions and async generators are supported too (handlers may be
+    coroutine functions as well); for async generator the AFTER handler is called
+    when it is exhausted:
+
+    >>> @around(before=before_handler, after=after_handler)
+    ... async def func4():
+    ...     print("in da func4")
+    >>> await func4()
+    before!
+    in da func4
+    after: some data (from before to after handlers) !
+
+    Handlers, that don't change the arguments, may receive them without copying:
+
+    >>> @around(before=lambda request, **_: print(request["id"]), copy="none")
+    ... def handle(request):
+    ...     pass
+    >>> handle({"id": 1, "payload": b"..."})
+    1
     """
+    if copy not in _ARGUMENTS_COPIERS:
+        raise ValueError(
+            f"Unknown copy strategy {copy!r} (expected one of: none, shallow, deep, lazy)"
+        )
+
+    copy_arguments = _ARGUMENTS_COPIERS[copy]
 
     def decorate(func) -> CallableAnyT:
+        if isasyncgenfunction(func) or iscoroutinefunction(func):
+            return _around_async(func, before, after, copy_arguments)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            if not before and not after:
-                raise ValueError(
-                    "One of the handlers (`before`, `after`) is not specified. Read the doc - "
-                    "https://p3t3rbr0.github.io/py3-pure-utils/refs/debug.html#debug.around"
-                )
+            _check_around_handlers(before, after)
 
             _buffer = {}
-            _args, _kwargs = (deepcopy(args), kwargs.copy())
+            _args, _kwargs = copy_arguments(args, kwargs)
 
             if before:
                 before(*_args, _pipe=_buffer, **_kwargs)
@@ -105,16 +169,113 @@ def around(*, before: Optional[Callable] = None, after: Optional[Callable] = Non
     return decorate
 
 
-def caller(*, at_frame: int = DEFAULT_STACK_FRAME) -> str:
+def _around_async(
+    func: Callable,
+    before: Optional[Callable],
+    after: Optional[Callable],
+    copy_arguments: Callable[[tuple, dict], tuple[tuple, dict]],
+) -> CallableAnyT:
+    if isasyncgenfunction(func):
+
+        @wraps(func)
+        async def asyncgen_wrapper(*args, **kwargs):
+            _check_around_handlers(before, after)
+            _buffer = {}
+            _args, _kwargs = copy_arguments(args, kwargs)
+
+            await _call_around_handler(before, _args, _buffer, _kwargs)
+
+            async for item in func(*args, **kwargs):
+                yield item
+
+            await _call_around_handler(after, _args, _buffer, _kwargs)
+
+        return asyncgen_wrapper
+
+    @wraps(func)
+    async def async_wrapper(*args, **kwargs):
+        _check_around_handlers(before, after)
+        _buffer = {}
+        _args, _kwargs = copy_arguments(args, kwargs)
+
+        await _call_around_handler(before, _args, _buffer, _kwargs)
+
+        result = await func(*args, **kwargs)
+
+        await _call_around_handler(after, _args, _buffer, _kwargs)
+        return result
+
+    return async_wrapper
+
+
+def _copy_none(args: tuple, kwargs: dict) -> tuple[tuple, dict]:
+    return args, kwargs.copy()
+
+
+def _copy_shallow(args: tuple, kwargs: dict) -> tuple[tuple, dict]:
+    return tuple(map(shallow_copy, args)), {
+        key: shallow_copy(value) for key, value in kwargs.items()
+    }
+
+
+def _copy_deep(args: tuple, kwargs: dict) -> tuple[tuple, dict]:
+    return deepcopy((args, kwargs))
+
+
+def _copy_lazy(args: tuple, kwargs: dict) -> tuple[tuple, dict]:
+    return tuple(map(lazy_copy, args)), {key: lazy_copy(value) for key, value in kwargs.items()}
+
+
+_ARGUMENTS_COPIERS: dict[str, Callable[[tuple, dict], tuple[tuple, dict]]] = {
+    "none": _copy_none,
+    "shallow": _copy_shallow,
+    "deep": _copy_deep,
+    "lazy": _copy_lazy,
+}
+
+
+def _check_around_handlers(before: Optional[Callable], after: Optional[Callable]) -> None:
+    if not before and not after:
+        raise ValueError(
+            "One of the handlers (`before`, `after`) is not specified. Read the doc - "
+            "https://p3t3rbr0.github.io/py3-pure-utils/refs/debug.html#debug.around"
+        )
+
+
+async def _call_around_handler(
+    handler: Optional[Callable], args: tuple, buffer: dict, kwargs: dict
+) -> None:
+    if handler:
+        result = handler(*args, _pipe=buffer, **kwargs)
+        if isawaitable(result):
+            await result
+
+
+def caller(
+    *,
+    at_frame: int = DEFAULT_STACK_FRAME,
+    qualname: bool = False,
+    module: bool = False,
+    lineno: bool = False,
+) -> str:
     """Get the name of calling function/method (from current function/method context).
 
+    The call stack is walked through frames directly (without loading source code),
+    so the function is cheap enough for hot paths.
+
     Args:
         at_frame: The frame index number on the call stack (default 2).
                   Need increased with each wrap to decorator.
+        qualname: If enable, the qualified name is returned (e.g. "Class.method").
+        module: If enable, the name is prefixed with the module name.
+        lineno: If enable, the name is suffixed with the current line number.
 
     Returns:
         The name of calling function/method.
 
+    Raises:
+        IndexError: If the call stack is not deep enough.
+
     Usage:
 
     >>> from pure_utils import caller
@@ -127,15 +288,116 @@ def caller(*, at_frame: int = DEFAULT_STACK_FRAME) -> str:
 
     >>> func2()
     I'am 'func1', 'func2' called me.
+
+    >>> def func3(*args, **kwargs):
+    ...     print(caller(qualname=True, module=True, lineno=True))
+
+    >>> class Foo:
+    ...     def bar(self):
+    ...         func3()
+
+    >>> Foo().bar()
+    __main__.Foo.bar:3
+    """
+    try:
+        frame = _getframe(at_frame)
+    except ValueError:
+        raise IndexError("The call stack is not deep enough") from None
+
+    return _frame_name(frame, qualname, module, lineno)
+
+
+def callers(
+    depth: int,
+    /,
+    *,
+    at_frame: int = DEFAULT_STACK_FRAME,
+    qualname: bool = False,
+    module: bool = False,
+    lineno: bool = False,
+) -> tuple[str, ...]:
+    """Get the names of the chain of calling functions/methods (from the nearest one).
+
+    Args:
+        depth: Maximum length of the chain (it is shorter, if the call stack ends).
+        at_frame: The frame index number of the nearest caller (default 2).
+        qualname: If enable, the qualified names are returned (e.g. "Class.method").
+        module: If enable, the names are prefixed with the module name.
+        lineno: If enable, the names are suffixed with the current line number.
+
+    Returns:
+        Tuple with the names of calling functions/methods.
+
+    Usage:
+
+    >>> from pure_utils import callers
+
+    >>> def func1():
+    ...     print(callers(2))
+
+    >>> def func2():
+    ...     func1()
+
+    >>> def func3():
+    ...     func2()
+
+    >>> func3()
+    ('func2', 'func3')
     """
-    return str(stack()[at_frame].function)
+    try:
+        frame: Optional[FrameType] = _getframe(at_frame)
+    except ValueError:
+        return ()
+
+    chain: list[str] = []
+
+    while frame is not None and len(chain) < depth:
+        chain.append(_frame_name(frame, qualname, module, lineno))
+        frame = frame.f_back
+
+    return tuple(chain)
+
+
+def _frame_name(frame: FrameType, qualname: bool, module: bool, lineno: bool) -> str:
+    code = frame.f_code
+    # `co_qualname` is available since Python 3.11
+    name = getattr(code, "co_qualname", code.co_name) if qualname else code.co_name
+
+    if module:
+        name = f"{frame.f_globals.get('__name__')}.{name}"
+
+    if lineno:
+        name = f"{name}:{frame.f_lineno}"
+
+    return name
 
 
-def deltatime(*, logger: Optional[Logger] = None) -> Callable:
+def deltatime(
+    *,
+    logger: Optional[Logger] = None,
+    aggregate: bool = False,
+    sample_rate: Optional[float] = None,
+    every_n: Optional[int] = None,
+    timer: Optional[Timer] = None,
+) -> Callable:
     """Measure execution time of decorated function and print it to log.
 
     Args:
         logger: Optional logger object for printing execution time to file.
+        aggregate: If enable, the decorated function returns its original value,
+                   and execution times (in nanoseconds) are accumulated into
+                   the `stats` attribute of the function (count, min, max, mean
+                   and quantiles - p50, p99, p999, etc.). With `timer`, these are
+                   the stats of the timer.
+        sample_rate: Probability of measuring the call (e.g., 0.01 - about 1 of 100 calls).
+                     The other calls are executed directly (without measurement),
+                     returning None instead of execution time (if not aggregate mode).
+        every_n: Measure every N-th call only (alternative to `sample_rate`).
+        timer: Optional timer metric (see `pure_utils.metrics`), to which execution times
+               of the measured calls are recorded (e.g., for export to Prometheus).
+
+    Raises:
+        ValueError: If both `sample_rate` and `every_n` are specified, or they are invalid.
 
     Usage:
 
@@ -163,32 +425,360 @@ def deltatime(*, logger: Optional[Logger] = None) -> Callable:
 
     >>> result, _ = aim_func2()
     DEBUG:root:[DELTATIME]: 'aim_func2' (0.025 sec.)
+
+    Or use decorator in aggregate mode (the return value is not changed):
+
+    >>> @deltatime(aggregate=True)
+    ... def aim_func3():
+    ...     return True
+
+    >>> for _ in range(1000):
+    ...     result = aim_func3()
+    >>> print(aim_func3.stats.snapshot())
+    {'count': 1000, 'min': 238, 'max': 5341, 'mean': 291.7, 'p50': 264, 'p90': 328, ...}
+
+    Coroutine functions are measured with the awaited duration (the return value of
+    the coroutine is wrapped the same way). For async generators the items are yielded
+    as is, and the total duration of their steps is only logged (or aggregated):
+
+    >>> @deltatime(logger=root_logger)
+    ... async def aim_func4():
+    ...     await asyncio.sleep(0.1)
+
+    >>> result, _ = await aim_func4()
+    DEBUG:root:[DELTATIME]: 'aim_func4' (0.1 sec.)
+
+    Measure only 1% of calls (e.g., in production):
+
+    >>> @deltatime(aggregate=True, sample_rate=0.01)
+    ... def aim_func5():
+    ...     return True
+
+    Feed the timer metric (exported with the other metrics of the registry):
+
+    >>> from pure_utils import get_registry
+
+    >>> @deltatime(aggregate=True, timer=get_registry().timer("aim_func6_seconds"))
+    ... def aim_func6():
+    ...     return True
     """
 
-    def decorate(func) -> CallableAnyT:
+    def measure(func) -> CallableAnyT:
+        if aggregate:
+            return _deltatime_aggregate(func, logger, timer)
+
+        if isasyncgenfunction(func):
+            return _timed(func, partial(_report_deltatime, func, logger, timer))
+
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> tuple[Any, float]:
+                t0 = perf_counter_ns()
+                retval = await func(*args, **kwargs)
+                return retval, _report_deltatime(func, logger, timer, perf_counter_ns() - t0)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> tuple[Any, float]:
-            t0 = time()
+            t0 = perf_counter_ns()
             retval = func(*args, **kwargs)
-            delta = float(f"{time() - t0:.3f}")
-            if logger:
-                logger.log(
-                    msg=f"[DELTATIME]: '{func.__name__}' ({delta} sec.)",
-                    level=logger.level,
-                )
-            return retval, delta
+            return retval, _report_deltatime(func, logger, timer, perf_counter_ns() - t0)
 
         return wrapper
 
-    return decorate
+    return _sample_calls_decorator(measure, sample_rate, every_n, paired=not aggregate)
+
+
+def _report_deltatime(
+    func: Callable, logger: Optional[Logger], timer: Optional[Timer], delta_ns: int
+) -> float:
+    if timer:
+        timer.record(delta_ns)
+
+    delta = round(delta_ns / 1e9, 3)
+    if logger:
+        logger.log(msg=f"[DELTATIME]: '{func.__name__}' ({delta} sec.)", level=logger.level)
+    return delta
+
+
+def _deltatime_aggregate(
+    func: Callable, logger: Optional[Logger], timer: Optional[Timer]
+) -> CallableAnyT:
+    # The stats of the timer are used as is (so the call is recorded only once)
+    stats = timer.stats if timer else LatencyStats()
+
+    def record_and_log(delta_ns: int) -> None:
+        stats.record(delta_ns)
+        _report_deltatime(func, logger, None, delta_ns)
+
+    wrapper = _timed(func, record_and_log if logger else stats.record)
+    wrapper.stats = stats  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _timed(func: Callable, on_delta: Callable[[int], Any]) -> CallableAnyT:
+    # Wrap function (sync, coroutine or async generator one), passing its execution time
+    # (in nanoseconds) to the callback.
+    if isasyncgenfunction(func):
+        return _timed_asyncgen(func, on_delta)
+
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            t0 = perf_counter_ns()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                on_delta(perf_counter_ns() - t0)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        t0 = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            on_delta(perf_counter_ns() - t0)
+
+    return wrapper
+
+
+def _timed_asyncgen(func: Callable, on_delta: Callable[[int], Any]) -> CallableAnyT:
+    # The execution time is the total time of the steps (without time of the consumer)
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        agen, elapsed = func(*args, **kwargs), 0
+        try:
+            while True:
+                t0 = perf_counter_ns()
+                try:
+                    item = await agen.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    elapsed += perf_counter_ns() - t0
+                yield item
+        finally:
+            await agen.aclose()
+            on_delta(elapsed)
+
+    return wrapper
+
+
+def memprofile(
+    *,
+    logger: Optional[Logger] = None,
+    top_n: int = DEFAULT_MEMPROFILE_TOP_N,
+    frames: int = DEFAULT_MEMORY_TRACEBACK_FRAMES,
+    sample_rate: Optional[float] = None,
+    every_n: Optional[int] = None,
+) -> "MemProfile":
+    """Profile memory allocations of decorated function (or code block) with 'tracemalloc'.
+
+    Reports peak and net allocated memory, net number of allocated memory blocks (objects)
+    and the top allocating source lines.
+
+    Args:
+        logger: Optional logger object for printing profiler result to file.
+        top_n: Number of the top allocating source lines in the result.
+        frames: Number of frames of the traceback of each allocation (1 by default).
+        sample_rate: Probability of profiling the call (e.g., 0.01 - about 1 of 100 calls).
+                     The other calls are executed directly (without profiler),
+                     returning None instead of profiler result.
+        every_n: Profile every N-th call only (alternative to `sample_rate`).
+
+    Returns:
+        Decorator, which can be used as context manager as well.
+
+    Raises:
+        ValueError: If both `sample_rate` and `every_n` are specified, or they are invalid.
+
+    Usage:
+
+    >>> from pure_utils import memprofile
+
+    >>> @memprofile()
+    ... def func():
+    ...     return [bytes(1024) for _ in range(1000)]
+
+    >>> _, profile_info = func()
+    >>> print(profile_info)
+    peak 1.0 MiB, net 1.0 MiB (+1001 blocks)
+    <BLANKLINE>
+    Top 10 lines by allocated memory:
+    <BLANKLINE>
+            size    blocks filename:lineno
+         1.0 MiB     +1001 scriptname.py:3
+
+    Or use it as context manager (with logger), the memory profiler is returned
+    (or None, if the block is not sampled):
+
+    >>> with memprofile(logger=root_logger) as profiler:
+    ...     data = [bytes(1024) for _ in range(1000)]
+    DEBUG:root:[MEMPROFILE]: peak 1.0 MiB, net 1.0 MiB (+1001 blocks) ...
+    >>> print(profiler.stats.peak)
+    1065832
+
+    Profile about 1 of 100 calls (e.g., to leave it on in production), the code blocks
+    are sampled by their source lines (so the context manager can be created inline):
+
+    >>> with memprofile(logger=root_logger, every_n=100):
+    ...     data = [bytes(1024) for _ in range(1000)]
+
+    >>> @memprofile(logger=root_logger, sample_rate=0.01)
+    ... def func2():
+    ...     return [bytes(1024) for _ in range(1000)]
+    """
+    return MemProfile(
+        logger=logger, top_n=top_n, frames=frames, sample_rate=sample_rate, every_n=every_n
+    )
 
 
-def profileit(*, logger: Optional[Logger] = None, stack_size: int = DEFAULT_STACK_SIZE) -> Callable:
+# Stack of the profilers of the active blocks (separate for threads and tasks)
+_memprofile_active: ContextVar[tuple[Optional[MemoryProfiler], ...]] = ContextVar(
+    "memprofile_active", default=()
+)
+# Countdowns of the sampled blocks (until the next sampled execution) by source lines
+_memprofile_countdowns: dict[tuple[str, int], int] = {}
+
+
+class MemProfile:
+    """Memory profiling decorator and context manager (see `memprofile`)."""
+
+    __slots__ = ("_logger", "_top_n", "_frames", "_decorate", "_next_skip")
+
+    def __init__(
+        self,
+        *,
+        logger: Optional[Logger],
+        top_n: int,
+        frames: int,
+        sample_rate: Optional[float],
+        every_n: Optional[int],
+    ) -> None:
+        """Initialize memory profiling decorator."""
+        self._logger = logger
+        self._top_n = top_n
+        self._frames = frames
+        self._decorate = _sample_calls_decorator(self._measure, sample_rate, every_n, paired=True)
+        sampling = sample_rate is not None or every_n is not None
+        self._next_skip = _make_next_skip(sample_rate, every_n) if sampling else None
+
+    def __call__(self, func: Callable) -> CallableAnyT:
+        """Decorate function."""
+        return self._decorate(func)
+
+    def __enter__(self) -> Optional[MemoryProfiler]:
+        """Start profiling of the block (if it is sampled)."""
+        profiler = None
+
+        if self._next_skip is None or _is_sampled_block(_getframe(1), self._next_skip):
+            profiler = MemoryProfiler(frames=self._frames)
+            profiler.__enter__()
+
+        _memprofile_active.set(_memprofile_active.get() + (profiler,))
+        return profiler
+
+    def __exit__(self, *args) -> None:
+        """Stop profiling of the block."""
+        *active, profiler = _memprofile_active.get()
+        _memprofile_active.set(tuple(active))
+
+        if profiler:
+            profiler.__exit__(*args)
+            self._report(profiler)
+
+    def _measure(self, func: Callable) -> CallableAnyT:
+        if isasyncgenfunction(func):
+            raise ValueError("Memory profiling doesn't support async generators")
+
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> tuple[Any, SerializedMemoryStatsT]:
+                profiler = MemoryProfiler(frames=self._frames)
+                retval = await profiler.aprofile(func, *args, **kwargs)
+                return retval, self._report(profiler)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> tuple[Any, SerializedMemoryStatsT]:
+            profiler = MemoryProfiler(frames=self._frames)
+            retval = profiler.profile(func, *args, **kwargs)
+            return retval, self._report(profiler)
+
+        return wrapper
+
+    def _report(self, profiler: MemoryProfiler) -> SerializedMemoryStatsT:
+        profiler_stats = profiler.serialize_result(
+            serializer=MemoryStatsStringSerializer, top_n=self._top_n
+        )
+
+        if self._logger:
+            self._logger.log(msg=f"[MEMPROFILE]: {str(profiler_stats)}", level=self._logger.level)
+
+        return profiler_stats
+
+
+def _is_sampled_block(frame: FrameType, next_skip: Callable[[], int]) -> bool:
+    # The countdown is kept per code block (by its source line), so the block is sampled
+    # even if the context manager is created inline (i.e. on each execution of the block)
+    site = (frame.f_code.co_filename, frame.f_lineno)
+    countdown = _memprofile_countdowns.get(site)
+    countdown = (next_skip() if countdown is None else countdown) - 1
+    _memprofile_countdowns[site] = next_skip() if countdown <= 0 else countdown
+    return countdown <= 0
+
+
+def profileit(
+    *,
+    logger: Optional[Logger] = None,
+    stack_size: int = DEFAULT_STACK_SIZE,
+    sampling: bool = False,
+    sampling_interval: float = DEFAULT_SAMPLING_INTERVAL,
+    aggregate: bool = False,
+    flush_every: Optional[int] = None,
+    flush_interval: Optional[float] = None,
+    sample_rate: Optional[float] = None,
+    every_n: Optional[int] = None,
+    timer: Optional[Timer] = None,
+) -> Callable:
     """Profile decorated function being with 'cProfile'.
 
     Args:
         logger: Optional logger object for printing execution time to file.
         stack_size: Stack size limit for profiler results.
+        sampling: If enable, the statistical profiler (`SamplingProfiler`) is used
+                  instead of 'cProfile': the call stack is sampled at a fixed interval
+                  by the background thread, so the overhead is low, but only functions
+                  running long enough get into the result.
+        sampling_interval: Sampling interval in seconds (0.01 by default, i.e. 100Hz).
+        aggregate: If enable, the decorated function returns its original value, and
+                   the stats are accumulated across calls by one long-lived profiler
+                   (only one call at a time is profiled, concurrent calls are not).
+                   The merged report is produced on demand - by the `flush()` attribute
+                   of the function (deferred to the background, if some call is being
+                   profiled right now), and periodically (see `flush_every`, `flush_interval`).
+        flush_every: Number of profiled calls, after which the merged report is logged
+                     (for aggregate mode, in the background thread).
+        flush_interval: Interval in seconds, after which the merged report is logged
+                        (for aggregate mode, in the background thread).
+        sample_rate: Probability of profiling the call (e.g., 0.01 - about 1 of 100 calls).
+                     The other calls are executed directly (without profiler),
+                     returning None instead of profiler result (if not aggregate mode).
+        every_n: Profile every N-th call only (alternative to `sample_rate`).
+        timer: Optional timer metric (see `pure_utils.metrics`), to which execution times
+               of the profiled calls are recorded (including the profiler overhead).
+
+    Raises:
+        ValueError: If the periodic reports are requested without aggregate mode or logger.
+        ValueError: If `flush_every` or `flush_interval` is not positive.
+        ValueError: If both `sample_rate` and `every_n` are specified, or they are invalid.
 
     Usage:
 
@@ -237,26 +827,263 @@ def profileit(*, logger: Optional[Logger] = None, stack_size: int = DEFAULT_STAC
           1    0.000    0.000    0.000    0.000 scriptname.py:7(func2)
           1    0.000    0.000    0.000    0.000 scriptname.py:4(func1)
     <pstats.Stats object at 0x10cf1a390>
+
+    Coroutine functions are profiled only while they are running (between suspensions),
+    so the other tasks of the event loop don't get into the result. For async generators
+    the items are yielded as is, and the result (of all steps) is only logged:
+
+    >>> @profileit(logger=root_logger)
+    ... async def func5():
+    ...     await asyncio.sleep(0.1)
+    ...     func3()
+
+    >>> _, profile_info = await func5()
+
+    Use the sampling profiler (e.g., to leave it on in production):
+
+    >>> @profileit(logger=root_logger, sampling=True)
+    ... def func6():
+    ...     for _ in range(10_000_000):
+    ...         func1()
+
+    >>> _, profile_info = func6()
+
+    Use aggregate mode to profile frequently called function:
+
+    >>> @profileit(logger=root_logger, aggregate=True, flush_every=10_000, flush_interval=60)
+    ... def func7():
+    ...     func3()
+
+    >>> for _ in range(100_000):
+    ...     func7()
+    >>> profile_info = func7.flush()
+
+    Profile about 1 of 1000 calls (and aggregate them):
+
+    >>> @profileit(logger=root_logger, aggregate=True, flush_every=100, sample_rate=0.001)
+    ... def func8():
+    ...     func3()
     """
+    if flush_every is not None or flush_interval is not None:
+        _check_profileit_flush(aggregate, logger, flush_every, flush_interval)
+
+    if sampling:
+        make_profiler: Callable[[], Profiler] = partial(
+            SamplingProfiler, interval=sampling_interval
+        )
+    else:
+        make_profiler = Profiler
+
+    def measure(func) -> CallableAnyT:
+        if aggregate:
+            aggregator = ProfileAggregator(
+                make_profiler,
+                partial(_report_profileit, logger=logger, stack_size=stack_size),
+                flush_every=flush_every,
+                flush_interval=flush_interval,
+            )
+            return _profileit_aggregate(func, aggregator, timer)
+
+        if isasyncgenfunction(func):
+            return _profileit_asyncgen(func, make_profiler, logger, stack_size, timer)
+
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> tuple[Any, SerializedProfileStatsT]:
+                profiler = make_profiler()
+                retval = await _with_timer(profiler.aprofile, timer)(func, *args, **kwargs)
+                return retval, _report_profileit(profiler, logger, stack_size)
+
+            return async_wrapper
 
-    def decorate(func) -> CallableAnyT:
         @wraps(func)
         def wrapper(*args, **kwargs) -> tuple[Any, SerializedProfileStatsT]:
-            retval = None
-            profiler = Profiler()
+            profiler = make_profiler()
+            retval = _with_timer(profiler.profile, timer)(func, *args, **kwargs)
+            return retval, _report_profileit(profiler, logger, stack_size)
 
-            try:
-                retval = profiler.profile(func, *args, **kwargs)
-            finally:
-                profiler_stats = profiler.serialize_result(
-                    serializer=ProfileStatsStringSerializer, stack_size=stack_size
-                )
+        return wrapper
 
-            if logger:
-                logger.log(msg=f"[PROFILEIT]: {str(profiler_stats)}", level=logger.level)
+    return _sample_calls_decorator(measure, sample_rate, every_n, paired=not aggregate)
 
-            return retval, profiler_stats
 
-        return wrapper
+def _check_profileit_flush(
+    aggregate: bool,
+    logger: Optional[Logger],
+    flush_every: Optional[int],
+    flush_interval: Optional[float],
+) -> None:
+    if not aggregate or not logger:
+        raise ValueError(
+            "Periodic reports (`flush_every`, `flush_interval`) require aggregate mode and logger"
+        )
 
-    return decorate
+    if (flush_every is not None and flush_every <= 0) or (
+        flush_interval is not None and flush_interval <= 0
+    ):
+        raise ValueError("Periodic reports (`flush_every`, `flush_interval`) must be positive")
+
+
+def _profileit_aggregate(
+    func: Callable, aggregator: ProfileAggregator, timer: Optional[Timer]
+) -> CallableAnyT:
+    if isasyncgenfunction(func):
+        raise ValueError("Aggregate mode doesn't support async generators")
+
+    if iscoroutinefunction(func):
+        aprofile = _with_timer(aggregator.aprofile, timer)
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            return await aprofile(func, *args, **kwargs)
+
+        async_wrapper.flush = aggregator.flush  # type: ignore[attr-defined]
+        return async_wrapper
+
+    profile = _with_timer(aggregator.profile, timer)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return profile(func, *args, **kwargs)
+
+    wrapper.flush = aggregator.flush  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _profileit_asyncgen(
+    func: Callable,
+    make_profiler: Callable[[], Profiler],
+    logger: Optional[Logger],
+    stack_size: int,
+    timer: Optional[Timer],
+) -> CallableAnyT:
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        profiler, elapsed = make_profiler(), 0
+        agen = func(*args, **kwargs)
+
+        try:
+            while True:
+                t0 = perf_counter_ns()
+                try:
+                    item = await profiler.aprofile(agen.__anext__)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    elapsed += perf_counter_ns() - t0
+                yield item
+        finally:
+            await agen.aclose()
+            if timer:
+                timer.record(elapsed)
+
+        _report_profileit(profiler, logger, stack_size)
+
+    return wrapper
+
+
+def _with_timer(profile: Callable, timer: Optional[Timer]) -> Callable:
+    # Time the profiling call from the outside (so the timer doesn't get into the result)
+    return _timed(profile, timer.record) if timer else profile
+
+
+def _sample_calls_decorator(
+    measure: Callable[[Callable], Callable],
+    sample_rate: Optional[float],
+    every_n: Optional[int],
+    *,
+    paired: bool,
+) -> Callable:
+    # Decorator, which measures (with the `measure` decorator) only sampled calls:
+    # for the other calls the countdown is decremented and the function is called directly
+    # (the result is paired with None, as in the measured calls - if `paired`).
+    if sample_rate is None and every_n is None:
+        return measure
+
+    next_skip = _make_next_skip(sample_rate, every_n)
+    return lambda func: _sample_calls(func, measure(func), next_skip, paired)
+
+
+def _sample_calls(
+    func: Callable, measured: Callable, next_skip: Callable[[], int], paired: bool
+) -> CallableAnyT:
+    countdown = next_skip()
+
+    if isasyncgenfunction(func):
+
+        @wraps(measured)
+        async def asyncgen_wrapper(*args, **kwargs):
+            nonlocal countdown
+            countdown -= 1
+            if countdown > 0:
+                agen = func(*args, **kwargs)
+            else:
+                countdown = next_skip()
+                agen = measured(*args, **kwargs)
+
+            async for item in agen:
+                yield item
+
+        return asyncgen_wrapper
+
+    if iscoroutinefunction(func):
+
+        @wraps(measured)
+        async def async_wrapper(*args, **kwargs):
+            nonlocal countdown
+            countdown -= 1
+            if countdown > 0:
+                retval = await func(*args, **kwargs)
+                return (retval, None) if paired else retval
+
+            countdown = next_skip()
+            return await measured(*args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(measured)
+    def wrapper(*args, **kwargs):
+        nonlocal countdown
+        countdown -= 1
+        if countdown > 0:
+            return (func(*args, **kwargs), None) if paired else func(*args, **kwargs)
+
+        countdown = next_skip()
+        return measured(*args, **kwargs)
+
+    return wrapper
+
+
+def _make_next_skip(sample_rate: Optional[float], every_n: Optional[int]) -> Callable[[], int]:
+    # Get function, returning number of calls until the next sampled one (inclusive)
+    if sample_rate is not None and every_n is not None:
+        raise ValueError("Only one of `sample_rate` and `every_n` can be specified")
+
+    if every_n is not None:
+        if every_n < 1:
+            raise ValueError("`every_n` must be positive")
+        return repeat(every_n).__next__
+
+    if sample_rate is None or not 0 < sample_rate <= 1:
+        raise ValueError("`sample_rate` must be in range (0, 1]")
+
+    if sample_rate == 1:
+        return repeat(1).__next__
+
+    # Gaps between sampled calls have geometric distribution
+    log_q = log(1.0 - sample_rate)
+    return lambda: int(log(1.0 - random()) / log_q) + 1
+
+
+def _report_profileit(
+    profiler: Profiler, logger: Optional[Logger], stack_size: int
+) -> SerializedProfileStatsT:
+    profiler_stats = profiler.serialize_result(
+        serializer=ProfileStatsStringSerializer, stack_size=stack_size
+    )
+
+    if logger:
+        logger.log(msg=f"[PROFILEIT]: {str(profiler_stats)}", level=logger.level)
+
+    return profiler_stats
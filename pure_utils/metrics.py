@@ -0,0 +1,769 @@
+"""Utilities for collecting metrics (counters, gauges, timers, histograms) and exporting them."""
+
+import os
+import re
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from logging import Logger
+from threading import Event, Lock, Thread, get_ident
+from time import perf_counter_ns
+from typing import Any, ClassVar, Iterator, Mapping, Optional, Type, TypeVar
+
+from ._internal._latency_stats import (
+    DEFAULT_QUANTILES,
+    FOLD_THRESHOLD,
+    LatencyStats,
+)
+from ._internal._metrics_serializers import (
+    MetricsPrometheusSerializer,
+    MetricsSerializer,
+)
+from ._internal._metrics_snapshot import (
+    MetricSnapshot,
+    MetricsSnapshotT,
+    format_float,
+)
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Metric",
+    "MetricsExporter",
+    "MetricsRegistry",
+    "Timer",
+    "export_metrics",
+    "get_registry",
+]
+
+
+# Default buckets of the Prometheus client libraries (in seconds)
+DEFAULT_HISTOGRAM_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+DEFAULT_EXPORT_INTERVAL: float = 15.0
+
+METRIC_NAME_RE = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+LABEL_NAME_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+MetricT = TypeVar("MetricT", bound="Metric")
+
+
+class Metric(ABC):
+    """Base class of the named metric (with optional constant labels)."""
+
+    kind: ClassVar[str]
+
+    __slots__ = ("name", "description", "labels", "__weakref__")
+
+    def __init__(
+        self, name: str, description: str = "", *, labels: Optional[Mapping[str, str]] = None
+    ) -> None:
+        """Initialize metric object.
+
+        Args:
+            name: Metric name (e.g. "http_requests_total").
+            description: Optional description of the metric.
+            labels: Optional constant labels of the metric (e.g. {"method": "GET"}).
+
+        Raises:
+            ValueError: If metric name or label names are invalid (for Prometheus).
+        """
+        if not METRIC_NAME_RE.match(name):
+            raise ValueError(f"Invalid metric name: {name!r}")
+
+        for label in labels or ():
+            if not LABEL_NAME_RE.match(label) or label.startswith("__"):
+                raise ValueError(f"Invalid label name: {label!r}")
+
+        self.name = name
+        self.description = description
+        self.labels: Mapping[str, str] = dict(sorted((labels or {}).items()))
+
+    def __repr__(self) -> str:
+        """Get string representation of metric object."""
+        return f"{self.__class__.__name__}({self.name!r}, labels={self.labels!r})"
+
+    @abstractmethod
+    def snapshot(self) -> MetricSnapshot:
+        """Get the current state of the metric."""
+        pass
+
+
+class _BatchedMetric(Metric):
+    # Updates don't take locks: they are appended to the pending queue (atomic operation),
+    # which is aggregated in batches (under the lock) - when it grows large enough,
+    # or when the metric is read (as in `LatencyStats`).
+
+    __slots__ = ("_pending", "_lock")
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._pending: deque = deque()
+        self._lock = Lock()
+
+    def snapshot(self) -> MetricSnapshot:
+        """Get the current state of the metric."""
+        with self._lock:
+            self._fold_locked()
+            value = self._value()
+
+        return MetricSnapshot(self.name, self.kind, self.description, self.labels, value)
+
+    def _fold(self) -> None:
+        with self._lock:
+            self._fold_locked()
+
+    def _fold_locked(self) -> None:
+        pending = self._pending
+        if pending:
+            popleft = pending.popleft
+            self._apply([popleft() for _ in range(len(pending))])
+
+    @abstractmethod
+    def _apply(self, batch: list) -> None:
+        pass
+
+    @abstractmethod
+    def _value(self) -> Any:
+        pass
+
+
+class Counter(_BatchedMetric):
+    """Monotonically increasing counter (e.g. number of requests, errors, processed bytes).
+
+    Usage:
+
+    >>> from pure_utils import get_registry
+
+    >>> requests = get_registry().counter("requests_total", "Number of requests")
+    >>> requests.inc()
+    >>> requests.inc(10)
+    >>> print(requests.value)
+    11
+    """
+
+    kind = "counter"
+
+    __slots__ = ("_total",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize counter object (with the `Metric` arguments)."""
+        super().__init__(*args, **kwargs)
+        self._total: float = 0
+
+    @property
+    def value(self) -> float:
+        """Get current value of the counter."""
+        self._fold()
+        return self._total
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the counter.
+
+        Args:
+            amount: Non-negative amount (1 by default).
+
+        Raises:
+            ValueError: If amount is negative.
+        """
+        if amount < 0:
+            raise ValueError("Counter can't be decreased")
+
+        pending = self._pending
+        pending.append(amount)
+
+        if len(pending) >= FOLD_THRESHOLD:
+            self._fold()
+
+    def _apply(self, batch: list) -> None:
+        self._total += sum(batch)
+
+    def _value(self) -> float:
+        return self._total
+
+
+class Gauge(_BatchedMetric):
+    """Value, which can go up and down (e.g. number of requests in progress, queue size).
+
+    Usage:
+
+    >>> from pure_utils import get_registry
+
+    >>> in_progress = get_registry().gauge("requests_in_progress")
+    >>> in_progress.inc()
+    >>> in_progress.dec()
+    >>> in_progress.set(5)
+    >>> print(in_progress.value)
+    5
+    """
+
+    kind = "gauge"
+
+    __slots__ = ("_current",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize gauge object (with the `Metric` arguments)."""
+        super().__init__(*args, **kwargs)
+        self._current: float = 0
+
+    @property
+    def value(self) -> float:
+        """Get current value of the gauge."""
+        self._fold()
+        return self._current
+
+    def set(self, value: float) -> None:
+        """Set the gauge to the value."""
+        pending = self._pending
+        pending.append((True, value))
+
+        if len(pending) >= FOLD_THRESHOLD:
+            self._fold()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the gauge by amount (1 by default)."""
+        pending = self._pending
+        pending.append((False, amount))
+
+        if len(pending) >= FOLD_THRESHOLD:
+            self._fold()
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the gauge by amount (1 by default)."""
+        pending = self._pending
+        pending.append((False, -amount))
+
+        if len(pending) >= FOLD_THRESHOLD:
+            self._fold()
+
+    def _apply(self, batch: list) -> None:
+        # Updates are applied in order (so `set` drops all preceding increments)
+        current = self._current
+
+        for absolute, value in batch:
+            current = value if absolute else current + value
+
+        self._current = current
+
+    def _value(self) -> float:
+        return self._current
+
+
+class Timer(Metric):
+    """Aggregated execution times (count, sum, min, max, mean and quantiles).
+
+    Times are recorded in nanoseconds (into `LatencyStats`) and exported in seconds
+    (as Prometheus summary).
+
+    Usage:
+
+    >>> from pure_utils import deltatime, get_registry
+
+    >>> timer = get_registry().timer("handle_seconds", "Execution time of handle()")
+
+    >>> with timer.time():
+    ...     handle()
+
+    >>> @deltatime(aggregate=True, timer=timer)
+    ... def handle():
+    ...     pass
+    """
+
+    kind = "timer"
+
+    __slots__ = ("quantiles", "_stats")
+
+    def __init__(self, *args, quantiles: tuple[float, ...] = DEFAULT_QUANTILES, **kwargs) -> None:
+        """Initialize timer object.
+
+        Args:
+            *args: Positional arguments of the `Metric`.
+            quantiles: Exported quantiles (p50, p90, p99 and p999 by default).
+            **kwargs: Named arguments of the `Metric`.
+
+        Raises:
+            ValueError: If quantile is not in range [0, 1].
+        """
+        super().__init__(*args, **kwargs)
+
+        if not all(0 <= q <= 1 for q in quantiles):
+            raise ValueError("Quantile must be in range [0, 1]")
+
+        self.quantiles = quantiles
+        self._stats = LatencyStats()
+
+    @property
+    def stats(self) -> LatencyStats:
+        """Get aggregated execution times (in nanoseconds)."""
+        return self._stats
+
+    def record(self, delta_ns: int) -> None:
+        """Record the execution time.
+
+        Args:
+            delta_ns: Execution time in nanoseconds.
+
+        Raises:
+            ValueError: If the execution time is negative.
+        """
+        self._stats.record(delta_ns)
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Measure execution time of the code block (as the context manager)."""
+        t0 = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._stats.record(perf_counter_ns() - t0)
+
+    def snapshot(self) -> MetricSnapshot:
+        """Get the current state of the timer."""
+        stats = self._stats
+        value = {
+            "count": stats.count,
+            "sum": stats.total / 1e9,
+            "min": stats.min / 1e9,
+            "max": stats.max / 1e9,
+            "mean": stats.mean / 1e9,
+            "quantiles": {format_float(q): stats.quantile(q) / 1e9 for q in self.quantiles},
+        }
+        return MetricSnapshot(self.name, self.kind, self.description, self.labels, value)
+
+
+class Histogram(_BatchedMetric):
+    """Distribution of observed values by the buckets (e.g. response sizes or durations).
+
+    Usage:
+
+    >>> from pure_utils import get_registry
+
+    >>> sizes = get_registry().histogram("response_bytes", buckets=(100, 1000, 10_000))
+    >>> sizes.observe(512)
+    >>> print(sizes.snapshot().value["buckets"])
+    {'100.0': 0, '1000.0': 1, '10000.0': 1, '+Inf': 1}
+    """
+
+    kind = "histogram"
+
+    __slots__ = ("buckets", "_counts", "_sum")
+
+    def __init__(
+        self, *args, buckets: tuple[float, ...] = DEFAULT_HISTOGRAM_BUCKETS, **kwargs
+    ) -> None:
+        """Initialize histogram object.
+
+        Args:
+            *args: Positional arguments of the `Metric`.
+            buckets: Upper bounds of the buckets (Prometheus default ones for durations
+                     in seconds, by default). The "+Inf" bucket is added implicitly.
+            **kwargs: Named arguments of the `Metric`.
+
+        Raises:
+            ValueError: If buckets are empty or not sorted.
+        """
+        super().__init__(*args, **kwargs)
+
+        if not buckets or any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError("Buckets must be non-empty and sorted in increasing order")
+
+        self.buckets = tuple(float(bound) for bound in buckets)
+        # Count of values in each bucket (not cumulative), the last one is "+Inf"
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum: float = 0
+
+    def observe(self, value: float) -> None:
+        """Observe the value."""
+        pending = self._pending
+        pending.append(value)
+
+        if len(pending) >= FOLD_THRESHOLD:
+            self._fold()
+
+    def _apply(self, batch: list) -> None:
+        buckets, counts = self.buckets, self._counts
+
+        for value in batch:
+            counts[bisect_left(buckets, value)] += 1
+
+        self._sum += sum(batch)
+
+    def _value(self) -> Mapping[str, Any]:
+        cumulative, total = {}, 0
+
+        for bound, count in zip(self.buckets + (float("inf"),), self._counts):
+            total += count
+            cumulative[format_float(bound)] = total
+
+        return {"count": total, "sum": self._sum, "buckets": cumulative}
+
+
+class MetricsRegistry:
+    """Thread-safe registry of the named metrics.
+
+    Metrics are identified by the name and labels: the same metric object is returned
+    for them (it is created on the first request). Metrics with the same name and different
+    labels must have the same type (and share the description of the first of them).
+
+    Usage:
+
+    >>> from pure_utils import MetricsRegistry
+    >>> from pure_utils._internal._metrics_serializers import MetricsPrometheusSerializer
+
+    >>> registry = MetricsRegistry()
+    >>> registry.counter("requests_total", "Number of requests", labels={"method": "GET"}).inc()
+    >>> print(MetricsPrometheusSerializer(registry.snapshot()).serialize())
+    # HELP requests_total Number of requests
+    # TYPE requests_total counter
+    requests_total{method="GET"} 1
+    """
+
+    __slots__ = ("_metrics", "_families", "_lock", "__weakref__")
+
+    def __init__(self) -> None:
+        """Initialize registry object."""
+        self._metrics: dict[tuple[str, tuple], Metric] = {}
+        # Type and description of the metrics by names
+        self._families: dict[str, tuple[str, str]] = {}
+        self._lock = Lock()
+
+    def counter(
+        self, name: str, description: str = "", *, labels: Optional[Mapping[str, str]] = None
+    ) -> Counter:
+        """Get (or create) counter.
+
+        Args:
+            name: Metric name.
+            description: Optional description of the metric.
+            labels: Optional constant labels of the metric.
+
+        Returns:
+            Counter object.
+
+        Raises:
+            ValueError: If the metric with the same name has another type.
+        """
+        return self._get_or_create(Counter, name, description, labels)
+
+    def gauge(
+        self, name: str, description: str = "", *, labels: Optional[Mapping[str, str]] = None
+    ) -> Gauge:
+        """Get (or create) gauge.
+
+        Args:
+            name: Metric name.
+            description: Optional description of the metric.
+            labels: Optional constant labels of the metric.
+
+        Returns:
+            Gauge object.
+
+        Raises:
+            ValueError: If the metric with the same name has another type.
+        """
+        return self._get_or_create(Gauge, name, description, labels)
+
+    def timer(
+        self,
+        name: str,
+        description: str = "",
+        *,
+        labels: Optional[Mapping[str, str]] = None,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+    ) -> Timer:
+        """Get (or create) timer.
+
+        Args:
+            name: Metric name.
+            description: Optional description of the metric.
+            labels: Optional constant labels of the metric.
+            quantiles: Exported quantiles (used only when the timer is created).
+
+        Returns:
+            Timer object.
+
+        Raises:
+            ValueError: If the metric with the same name has another type.
+        """
+        return self._get_or_create(Timer, name, description, labels, quantiles=quantiles)
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        *,
+        labels: Optional[Mapping[str, str]] = None,
+        buckets: tuple[float, ...] = DEFAULT_HISTOGRAM_BUCKETS,
+    ) -> Histogram:
+        """Get (or create) histogram.
+
+        Args:
+            name: Metric name.
+            description: Optional description of the metric.
+            labels: Optional constant labels of the metric.
+            buckets: Upper bounds of the buckets (used only when the histogram is created).
+
+        Returns:
+            Histogram object.
+
+        Raises:
+            ValueError: If the metric with the same name has another type.
+        """
+        return self._get_or_create(Histogram, name, description, labels, buckets=buckets)
+
+    def register(self, metric: Metric) -> None:
+        """Register metric, created outside of the registry.
+
+        Args:
+            metric: Metric object.
+
+        Raises:
+            ValueError: If the metric with the same name and labels is already registered,
+                        or the metric with the same name has another type.
+        """
+        with self._lock:
+            key = (metric.name, tuple(metric.labels.items()))
+
+            if key in self._metrics:
+                raise ValueError(f"Metric {metric!r} is already registered")
+
+            self._check_family(metric.name, metric.kind, metric.description)
+            self._metrics[key] = metric
+
+    def snapshot(self) -> MetricsSnapshotT:
+        """Get the current state of all metrics (ordered by names and labels)."""
+        with self._lock:
+            metrics = [self._metrics[key] for key in sorted(self._metrics)]
+
+        return [metric.snapshot() for metric in metrics]
+
+    def _get_or_create(
+        self,
+        cls: Type[MetricT],
+        name: str,
+        description: str,
+        labels: Optional[Mapping[str, str]],
+        **options: Any,
+    ) -> MetricT:
+        key = (name, tuple(sorted((labels or {}).items())))
+
+        with self._lock:
+            metric = self._metrics.get(key)
+
+            if metric is None:
+                description = self._check_family(name, cls.kind, description)
+                metric = self._metrics[key] = cls(name, description, labels=labels, **options)
+
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name!r} is already registered with type {metric.kind!r}")
+
+        return metric
+
+    def _check_family(self, name: str, kind: str, description: str) -> str:
+        # Metrics with the same name (and different labels) must have the same type,
+        # the description of the family is used, if it is not given for the metric
+        registered_kind, registered_description = self._families.setdefault(
+            name, (kind, description)
+        )
+
+        if registered_kind != kind:
+            raise ValueError(f"Metric {name!r} is already registered with type {registered_kind!r}")
+
+        return description or registered_description
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide (default) metrics registry.
+
+    Returns:
+        Registry object.
+
+    Usage:
+
+    >>> from pure_utils import get_registry
+
+    >>> get_registry().counter("jobs_total").inc()
+    """
+    return _registry
+
+
+def export_metrics(
+    path: str,
+    /,
+    *,
+    registry: Optional[MetricsRegistry] = None,
+    serializer: Type[MetricsSerializer] = MetricsPrometheusSerializer,
+) -> None:
+    """Write snapshot of the metrics to the file atomically.
+
+    The snapshot is written to the temporary file (in the same directory), which then
+    replaces the target file, so readers (e.g. node exporter's textfile collector) never
+    see a partially written file.
+
+    Args:
+        path: Path to the file (e.g. "/var/lib/node_exporter/app.prom").
+        registry: Metrics registry (the process-wide one by default).
+        serializer: Serializer class, producing string or bytes (Prometheus text format
+                    by default).
+
+    Raises:
+        ValueError: If the serializer produces neither string, nor bytes.
+
+    Usage:
+
+    >>> from pure_utils import export_metrics
+    >>> from pure_utils._internal._metrics_serializers import MetricsJSONSerializer
+
+    >>> export_metrics("/var/lib/node_exporter/app.prom")
+    >>> export_metrics("/tmp/metrics.json", serializer=MetricsJSONSerializer)
+    """
+    data = serializer((registry or _registry).snapshot()).serialize()
+
+    if not isinstance(data, (str, bytes)):
+        raise ValueError("Serializer must produce string or bytes")
+
+    temp_path = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+
+    try:
+        if isinstance(data, str):
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(data)
+        else:
+            with open(temp_path, "wb") as file:
+                file.write(data)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+class MetricsExporter:
+    """Background thread, which periodically writes snapshot of the metrics to the file.
+
+    The file is written on start, then every interval, and on stop (see `export_metrics`).
+
+    Usage:
+
+    >>> from pure_utils import MetricsExporter
+
+    >>> exporter = MetricsExporter("/var/lib/node_exporter/app.prom", interval=15)
+    >>> exporter.start()
+    >>> ...
+    >>> exporter.stop()
+
+    Or use it as context manager:
+
+    >>> with MetricsExporter("/var/lib/node_exporter/app.prom"):
+    ...     main()
+    """
+
+    __slots__ = (
+        "path",
+        "registry",
+        "serializer",
+        "interval",
+        "logger",
+        "_stopped",
+        "_thread",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        /,
+        *,
+        registry: Optional[MetricsRegistry] = None,
+        serializer: Type[MetricsSerializer] = MetricsPrometheusSerializer,
+        interval: float = DEFAULT_EXPORT_INTERVAL,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        """Initialize exporter object.
+
+        Args:
+            path: Path to the file.
+            registry: Metrics registry (the process-wide one by default).
+            serializer: Serializer class (Prometheus text format by default).
+            interval: Interval of writes in seconds (15 by default).
+            logger: Optional logger object for printing errors of the background writes
+                    (the failed write is retried at the next interval).
+
+        Raises:
+            ValueError: If interval is not positive.
+        """
+        if interval <= 0:
+            raise ValueError("Export interval must be positive")
+
+        self.path = path
+        self.registry = registry or _registry
+        self.serializer = serializer
+        self.interval = interval
+        self.logger = logger
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+
+    def __enter__(self) -> "MetricsExporter":
+        """Start exporting."""
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop exporting."""
+        self.stop()
+
+    def start(self) -> None:
+        """Write the file and start the background thread (errors of the first write are raised).
+
+        Raises:
+            RuntimeError: If exporter is already started.
+        """
+        if self._thread is not None:
+            raise RuntimeError("Exporter is already started")
+
+        self.export()
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, name="pure-utils-metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread (after the final write)."""
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def export(self) -> None:
+        """Write the file right now."""
+        export_metrics(self.path, registry=self.registry, serializer=self.serializer)
+
+    def _run(self) -> None:
+        stopped = False
+
+        while not stopped:
+            stopped = self._stopped.wait(self.interval)
+
+            try:
+                self.export()
+            except Exception:
+                if self.logger:
+                    self.logger.exception(f"[METRICS]: failed to export metrics to {self.path!r}")
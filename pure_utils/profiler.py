@@ -1,16 +1,48 @@
 """Helper classes for working with the cProfile."""
 
+import sys
+import tracemalloc
 from cProfile import Profile
-from typing import Callable, Type
+from inspect import unwrap
+from sys import _getframe
+from time import perf_counter, perf_counter_ns
+from types import CodeType, coroutine
+from typing import Any, Awaitable, Callable, Generator, Optional, Type
 
+from ._internal import _memory_stats
+from ._internal._line_stats import FunctionLineStats, LineStats, LineTiming
+from ._internal._line_stats_serializers import (
+    LineStatsSerializer,
+    SerializedLineStatsT,
+)
+from ._internal._memory_stats import (
+    MemoryLineStats,
+    MemoryStats,
+    pop_peak,
+    reset_peak,
+    start_tracing,
+    stop_tracing,
+)
+from ._internal._memory_stats_serializers import (
+    MemoryStatsSerializer,
+    SerializedMemoryStatsT,
+)
 from ._internal._profile_stats import ProfileStats
 from ._internal._profile_stats_serializers import (
     ProfileStatsSerializer,
     SerializedProfileStatsT,
 )
+from ._internal._sampling import SampledProfile, get_sampler
 from .types import P, T
 
-__all__ = ["Profiler"]
+__all__ = ["LineProfiler", "MemoryProfiler", "Profiler", "SamplingProfiler"]
+
+
+DEFAULT_SAMPLING_INTERVAL: float = 0.01
+DEFAULT_MEMORY_TRACEBACK_FRAMES: int = 1
+
+# `sys.monitoring` is available since Python 3.12
+_monitoring: Any = getattr(sys, "monitoring", None)
 
 
 class Profiler:
@@ -24,6 +56,11 @@ class Profiler:
     >>> some_function_retval = profiler.profile(some_func, *func_args, **func_kwargs)
     >>> serialize_profile_result = profiler.serialize_result(SomeProfilerStatsSerializer)
 
+    Usage with coroutine function (only execution of the coroutine itself is profiled,
+    not the other tasks of the event loop, running while the coroutine is suspended):
+
+    >>> some_coroutine_retval = await profiler.aprofile(some_coroutine_func, *func_args)
+
     Usage with string serializer:
 
     >>> from pure_utils._internal._profile_stats_serializers import ProfileStatsStringSerializer
@@ -54,6 +91,24 @@ class Profiler:
         """
         return self._profile.runcall(func, *args, **kwargs)
 
+    async def aprofile(
+        self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Profile coroutine function.
+
+        The profiler is enabled only while the coroutine is running, and disabled
+        at each suspension (so time of the other tasks is not attributed to the coroutine).
+
+        Args:
+            func: Coroutine function (or any function, returning awaitable) for profiling.
+            *args: Profiling function positional arguments.
+            **kwargs: Profiling function named arguments.
+
+        Return:
+            Native profiling coroutine return value.
+        """
+        return await _profile_steps(func(*args, **kwargs).__await__(), self._profile)
+
     def serialize_result(
         self, *, serializer: Type[ProfileStatsSerializer], stack_size: int
     ) -> SerializedProfileStatsT:
@@ -67,3 +122,534 @@ class Profiler:
             Serialized profiler result.
         """
         return serializer(self.pstats, stack_size).serialize()
+
+
+class SamplingProfiler(Profiler):
+    """A statistical profiler with the same interface as `Profiler`.
+
+    Instead of instrumenting every call (as cProfile does), the call stack of the profiled
+    function is sampled by the background thread at a fixed interval, so the overhead is
+    low enough for production (~1% at the default 100Hz). The result is compatible with
+    the profile stats serializers: number of calls is the number of samples, where the
+    function was on the call stack, and times are estimated by the number of samples.
+
+    Usage:
+
+    >>> from pure_utils import SamplingProfiler
+
+    >>> profiler = SamplingProfiler(interval=0.005)
+    >>> some_function_retval = profiler.profile(some_func, *func_args, **func_kwargs)
+    >>> profile_result_as_string = profiler.serialize_result(ProfileStatsStringSerializer)
+    """
+
+    __slots__ = ("_sampler", "_samples")
+
+    def __init__(self, *, interval: float = DEFAULT_SAMPLING_INTERVAL) -> None:
+        """Initialize profiler object.
+
+        Args:
+            interval: Sampling interval in seconds (0.01 by default, i.e. 100Hz).
+
+        Raises:
+            ValueError: If sampling interval is not positive.
+        """
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive")
+
+        self._sampler = get_sampler(interval)
+        self._samples = SampledProfile()
+
+    @property
+    def pstats(self) -> ProfileStats:
+        """Get raw profile stats (empty, if no samples were taken - e.g., for short calls)."""
+        # `pstats.Stats` refuses to load a profile without entries
+        stats = ProfileStats(self._samples) if self._samples.samples else ProfileStats()
+        return stats.strip_dirs().sort_stats("cumulative", "name")
+
+    def profile(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Profile function.
+
+        Args:
+            func: Function for profiling
+            *args: Profiling function positional arguments.
+            **kwargs: Profiling function named arguments.
+
+        Return:
+            Native profiling function return value.
+        """
+        session = self._sampler.start(self._samples, _getframe(), include_root=False)
+        t0 = perf_counter()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._sampler.stop(session)
+            self._samples.elapsed += perf_counter() - t0
+
+    async def aprofile(
+        self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Profile coroutine function.
+
+        Only the samples, where the coroutine is running (is on the call stack),
+        are taken into account.
+
+        Args:
+            func: Coroutine function (or `__anext__` of async generator) for profiling.
+            *args: Profiling function positional arguments.
+            **kwargs: Profiling function named arguments.
+
+        Return:
+            Native profiling coroutine return value.
+        """
+        awaitable = func(*args, **kwargs)
+        root = getattr(awaitable, "cr_frame", None) or getattr(
+            getattr(func, "__self__", None), "ag_frame", None
+        )
+
+        if root is None:
+            return await awaitable
+
+        session = self._sampler.start(self._samples, root, include_root=True)
+        t0 = perf_counter()
+
+        try:
+            return await awaitable
+        finally:
+            self._sampler.stop(session)
+            self._samples.elapsed += perf_counter() - t0
+
+
+class LineProfiler:
+    """A line by line profiler of the chosen functions (Python 3.12+, based on 'sys.monitoring').
+
+    Monitoring events are enabled only for the code of the chosen functions, so the rest
+    of the code runs without any overhead. Time of the line includes time of the functions,
+    called from it. Generators and coroutines are supported (time of suspensions is not
+    counted), and calls from all threads are profiled.
+
+    Usage:
+
+    >>> from pure_utils import LineProfiler
+    >>> from pure_utils._internal._line_stats_serializers import LineStatsStringSerializer
+
+    >>> def some_func():
+    ...     data = [i * i for i in range(100_000)]
+    ...     return sum(data)
+
+    >>> profiler = LineProfiler(some_func)
+    >>> some_function_retval = profiler.profile(some_func)
+    >>> print(profiler.serialize_result(serializer=LineStatsStringSerializer))
+    scriptname.py:1(some_func) in 0.004 seconds
+    <BLANKLINE>
+        line      hits   time (us)  per hit (us)  % time  line contents
+           2         1      3796.2        3796.2    96.9      data = [i * i for i in range(100_000)]
+           3         1       121.5         121.5     3.1      return sum(data)
+
+    Or enable it for a code block:
+
+    >>> with LineProfiler(some_func, other_func) as profiler:
+    ...     some_func()
+    ...     other_func()
+    """
+
+    __slots__ = ("_timings", "_frames", "_tool_id", "__weakref__")
+
+    def __init__(self, *funcs: Callable) -> None:
+        """Initialize profiler object.
+
+        Args:
+            *funcs: Functions for profiling (decorated functions are unwrapped).
+
+        Raises:
+            RuntimeError: If Python version is less than 3.12.
+        """
+        if _monitoring is None:
+            raise RuntimeError("LineProfiler requires Python 3.12+ (sys.monitoring)")
+
+        # Hits and time (in nanoseconds) of the lines of each code object
+        self._timings: dict[CodeType, dict[int, list[int]]] = {}
+        # Current line and time of its start for each running frame (by frame id)
+        self._frames: dict[int, tuple[int, int]] = {}
+        self._tool_id: Optional[int] = None
+
+        for func in funcs:
+            self.add_function(func)
+
+    def __enter__(self) -> "LineProfiler":
+        """Start profiling."""
+        self.enable()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop profiling."""
+        self.disable()
+
+    @property
+    def stats(self) -> LineStats:
+        """Get raw line stats of the profiled functions (that were called)."""
+        result = []
+
+        for code, timings in self._timings.items():
+            if not timings:
+                continue
+
+            lines = [
+                LineTiming(lineno, hits, time / 1e9)
+                for lineno, (hits, time) in sorted(timings.items())
+            ]
+            total_time = sum(line.time for line in lines)
+            result.append(
+                FunctionLineStats(
+                    code.co_filename, code.co_firstlineno, code.co_qualname, total_time, lines
+                )
+            )
+
+        return result
+
+    def add_function(self, func: Callable) -> None:
+        """Add function for profiling.
+
+        Args:
+            func: Function for profiling (decorated function is unwrapped).
+
+        Raises:
+            ValueError: If the object has no Python code (e.g., built-in function).
+        """
+        code = getattr(unwrap(func), "__code__", None)
+
+        if not isinstance(code, CodeType):
+            raise ValueError(f"Object {func!r} has no Python code for line profiling")
+
+        self._timings.setdefault(code, {})
+
+        if self._tool_id is not None:
+            _monitoring.set_local_events(self._tool_id, code, _LINE_PROFILER_EVENTS)
+
+    def enable(self) -> None:
+        """Start profiling.
+
+        Raises:
+            RuntimeError: If all monitoring tools are in use.
+        """
+        if self._tool_id is not None:
+            return
+
+        self._tool_id = tool_id = _use_free_tool_id("pure_utils.LineProfiler")
+
+        for event, callback in self._callbacks():
+            _monitoring.register_callback(tool_id, event, callback)
+
+        for code in self._timings:
+            _monitoring.set_local_events(tool_id, code, _LINE_PROFILER_EVENTS)
+
+    def disable(self) -> None:
+        """Stop profiling."""
+        if self._tool_id is None:
+            return
+
+        tool_id, self._tool_id = self._tool_id, None
+
+        for code in self._timings:
+            _monitoring.set_local_events(tool_id, code, 0)
+
+        # Callbacks are not cleared by `free_tool_id` (and would keep the profiler alive)
+        for event, _ in self._callbacks():
+            _monitoring.register_callback(tool_id, event, None)
+
+        _monitoring.free_tool_id(tool_id)
+        self._frames.clear()
+
+    def profile(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Profile function (the function is added for profiling, if it was not).
+
+        If the profiler is already enabled, it is left enabled after the call.
+
+        Args:
+            func: Function for profiling
+            *args: Profiling function positional arguments.
+            **kwargs: Profiling function named arguments.
+
+        Return:
+            Native profiling function return value.
+        """
+        self.add_function(func)
+
+        if self._tool_id is not None:
+            return func(*args, **kwargs)
+
+        with self:
+            return func(*args, **kwargs)
+
+    async def aprofile(
+        self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Profile coroutine function (the function is added for profiling, if it was not).
+
+        If the profiler is already enabled, it is left enabled after the call.
+
+        Args:
+            func: Coroutine function for profiling.
+            *args: Profiling function positional arguments.
+            **kwargs: Profiling function named arguments.
+
+        Return:
+            Native profiling coroutine return value.
+        """
+        self.add_function(func)
+
+        if self._tool_id is not None:
+            return await func(*args, **kwargs)
+
+        with self:
+            return await func(*args, **kwargs)
+
+    def serialize_result(self, *, serializer: Type[LineStatsSerializer]) -> SerializedLineStatsT:
+        """Serialize profiler result with custom serializer class.
+
+        Args:
+            serializer: Serializer class.
+
+        Returns:
+            Serialized profiler result.
+        """
+        return serializer(self.stats).serialize()
+
+    def _callbacks(self) -> tuple[tuple[int, Callable], ...]:
+        events = _monitoring.events
+
+        return (
+            (events.PY_START, self._on_start),
+            (events.PY_RESUME, self._on_resume),
+            (events.LINE, self._on_line),
+            (events.PY_RETURN, self._on_exit),
+            (events.PY_YIELD, self._on_exit),
+        )
+
+    # The callbacks below are called by the interpreter from the frame of the profiled code
+    # (so they are kept as cheap as possible, with one timestamp per event)
+
+    def _on_start(self, code: CodeType, offset: int) -> None:
+        # The frame id could be reused (e.g., after the exception, unwinding is not monitored)
+        self._frames.pop(id(_getframe(1)), None)
+
+    def _on_resume(self, code: CodeType, offset: int) -> None:
+        frame = _getframe(1)
+        self._frames[id(frame)] = (frame.f_lineno, perf_counter_ns())
+
+    def _on_line(self, code: CodeType, lineno: int) -> None:
+        now = perf_counter_ns()
+        frame_id = id(_getframe(1))
+        lines = self._timings[code]
+
+        previous = self._frames.get(frame_id)
+        if previous is not None:
+            # The line of the resumed frame could be not hit yet (e.g., the generator
+            # was started before the profiler was enabled)
+            lines.setdefault(previous[0], [0, 0])[1] += now - previous[1]
+
+        timing = lines.get(lineno)
+        if timing is None:
+            timing = lines[lineno] = [0, 0]
+
+        timing[0] += 1
+        self._frames[frame_id] = (lineno, now)
+
+    def _on_exit(self, code: CodeType, offset: int, retval: Any) -> None:
+        now = perf_counter_ns()
+        previous = self._frames.pop(id(_getframe(1)), None)
+
+        if previous is not None:
+            self._timings[code].setdefault(previous[0], [0, 0])[1] += now - previous[1]
+
+
+class MemoryProfiler:
+    """A class provides a simple interface for profiling memory allocations (with 'tracemalloc').
+
+    Tracing of allocations is started on demand (and stopped after profiling, if it was not
+    started before), and is process-wide: allocations of the other threads and tasks, running
+    at the same time, get into the result too.
+
+    Usage:
+
+    >>> from pure_utils import MemoryProfiler
+
+    >>> profiler = MemoryProfiler()
+    >>> some_function_retval = profiler.profile(some_func, *func_args, **func_kwargs)
+    >>> print(profiler.stats.peak, profiler.stats.net)
+    10485760 1024
+
+    Usage as context manager with string serializer:
+
+    >>> from pure_utils._internal._memory_stats_serializers import MemoryStatsStringSerializer
+
+    >>> with MemoryProfiler() as profiler:
+    ...     data = [bytes(1024) for _ in range(1000)]
+    >>> print(profiler.serialize_result(serializer=MemoryStatsStringSerializer, top_n=1))
+    peak 1.0 MiB, net 1.0 MiB (+1001 blocks)
+    <BLANKLINE>
+    Top 1 lines by allocated memory:
+    <BLANKLINE>
+            size    blocks filename:lineno
+         1.0 MiB     +1001 scriptname.py:2
+    """
+
+    __slots__ = ("_frames", "_baseline", "_snapshot", "_stats", "__weakref__")
+
+    def __init__(self, *, frames: int = DEFAULT_MEMORY_TRACEBACK_FRAMES) -> None:
+        """Initialize profiler object.
+
+        Args:
+            frames: Number of frames of the traceback of each allocation (1 by default).
+        """
+        self._frames = frames
+        self._baseline = 0
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._stats: Optional[MemoryStats] = None
+
+    def __enter__(self) -> "MemoryProfiler":
+        """Start profiling."""
+        start_tracing(self._frames)
+        self._snapshot = tracemalloc.take_snapshot()
+        self._baseline = reset_peak(self)
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop profiling."""
+        try:
+            current, peak = pop_peak(self)
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            stop_tracing()
+
+        self._stats = _compare_memory_snapshots(
+            snapshot, self._snapshot, peak - self._baseline, current - self._baseline
+        )
+        self._snapshot = None
+
+    @property
+    def stats(self) -> MemoryStats:
+        """Get raw memory stats of the last profiling.
+
+        Raises:
+            ValueError: If the profiling was not finished yet.
+        """
+        if self._stats is None:
+            raise ValueError("Memory profiling is not finished yet")
+
+        return self._stats
+
+    def profile(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Profile function.
+
+        Args:
+            func: Function for profiling
+            *args: Profiling function positional arguments.
+            **kwargs: Profiling function named arguments.
+
+        Return:
+            Native profiling function return value.
+        """
+        with self:
+            return func(*args, **kwargs)
+
+    async def aprofile(
+        self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Profile coroutine function.
+
+        Args:
+            func: Coroutine function for profiling.
+            *args: Profiling function positional arguments.
+            **kwargs: Profiling function named arguments.
+
+        Return:
+            Native profiling coroutine return value.
+        """
+        with self:
+            return await func(*args, **kwargs)
+
+    def serialize_result(
+        self, *, serializer: Type[MemoryStatsSerializer], top_n: int
+    ) -> SerializedMemoryStatsT:
+        """Serialize profiler result with custom serializer class.
+
+        Args:
+            serializer: Serializer class.
+            top_n: Number of the top allocating source lines.
+
+        Returns:
+            Serialized profiler result.
+        """
+        return serializer(self.stats, top_n).serialize()
+
+
+_LINE_PROFILER_EVENTS: int = (
+    (
+        _monitoring.events.PY_START
+        | _monitoring.events.PY_RESUME
+        | _monitoring.events.LINE
+        | _monitoring.events.PY_RETURN
+        | _monitoring.events.PY_YIELD
+    )
+    if _monitoring
+    else 0
+)
+
+
+def _use_free_tool_id(name: str) -> int:
+    # Prefer the tool ids, not reserved for the standard tools (cProfile uses PROFILER_ID)
+    for tool_id in (3, 4, _monitoring.PROFILER_ID, _monitoring.OPTIMIZER_ID):
+        if _monitoring.get_tool(tool_id) is None:
+            _monitoring.use_tool_id(tool_id, name)
+            return tool_id
+
+    raise RuntimeError("All monitoring tools (sys.monitoring) are in use")
+
+
+_MEMORY_SNAPSHOT_FILTERS: tuple[tracemalloc.Filter, ...] = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, _memory_stats.__file__),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _compare_memory_snapshots(
+    snapshot: tracemalloc.Snapshot, baseline: Optional[tracemalloc.Snapshot], peak: int, net: int
+) -> MemoryStats:
+    snapshot = snapshot.filter_traces(_MEMORY_SNAPSHOT_FILTERS)
+    diff = (
+        snapshot.compare_to(baseline.filter_traces(_MEMORY_SNAPSHOT_FILTERS), "lineno")
+        if baseline
+        else []
+    )
+    lines = [
+        MemoryLineStats(
+            stat.traceback[0].filename, stat.traceback[0].lineno, stat.size_diff, stat.count_diff
+        )
+        for stat in diff
+        if stat.size_diff or stat.count_diff
+    ]
+    return MemoryStats(peak, net, sum(line.blocks for line in lines), lines)
+
+
+@coroutine
+def _profile_steps(steps: Generator[Any, Any, T], profile: Profile) -> Generator[Any, Any, T]:
+    # Drive the awaitable manually, enabling the profiler only for its own steps
+    value, error = None, None
+
+    while True:
+        profile.enable()
+        try:
+            yielded = steps.send(value) if error is None else steps.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            profile.disable()
+
+        value, error = None, None
+        try:
+            value = yield yielded
+        except BaseException as exc:
+            error = exc
@@ -1,6 +1,12 @@
+import asyncio
+import gc
+import os
+from threading import Barrier, Thread, Timer
+from time import sleep
+
 import pytest
 
-from pure_utils.common import Singleton
+from pure_utils.common import Multiton, ObjectPool, PoolStats, Singleton
 
 
 def test_singletone_class():
@@ -20,3 +26,323 @@ def test_singletone_class():
     assert isinstance(c, RegularClass)
     assert a == b
     assert c != a and c != b
+
+
+def test_singleton_class_in_threads():
+    created = []
+
+    class SlowSigletonClass(metaclass=Singleton):
+        def __init__(self):
+            sleep(0.01)
+            created.append(self)
+
+    barrier = Barrier(16)
+    instances = []
+
+    def target():
+        barrier.wait()
+        instances.append(SlowSigletonClass())
+
+    threads = [Thread(target=target) for _ in range(16)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(_ is created[0] for _ in instances)
+
+
+def test_singleton_subclasses():
+    class BaseSigletonClass(metaclass=Singleton):
+        pass
+
+    class DerivedSigletonClass(BaseSigletonClass):
+        pass
+
+    assert BaseSigletonClass() is BaseSigletonClass()
+    assert DerivedSigletonClass() is DerivedSigletonClass()
+    assert BaseSigletonClass() is not DerivedSigletonClass()
+
+
+class TestMultiton:
+    def test_keyed_by_normalized_arguments(self):
+        class Client(metaclass=Multiton):
+            def __init__(self, tenant, timeout=30, **options):
+                self.tenant = tenant
+
+        assert isinstance(Client, Multiton)
+        assert Client("a") is Client("a")
+        assert Client("a") is Client(tenant="a") is Client("a", 30) is Client("a", timeout=30)
+        assert Client("a") is not Client("b")
+        assert Client("a") is not Client("a", timeout=10)
+        assert Client("a", x=1, y=2) is Client("a", y=2, x=1)
+
+    def test_lru_eviction(self):
+        class Client(metaclass=Multiton, eviction="lru", maxsize=2):
+            def __init__(self, tenant):
+                self.tenant = tenant
+
+        a, b = Client("a"), Client("b")
+
+        # Recently used object is kept
+        assert Client("a") is a
+
+        Client("c")
+        assert Client("a") is a
+        assert Client("b") is not b
+
+    def test_weak_eviction(self):
+        created = []
+
+        class Client(metaclass=Multiton, eviction="weak"):
+            def __init__(self, tenant):
+                created.append(tenant)
+
+        client = Client("a")
+        assert Client("a") is client
+
+        del client
+        gc.collect()
+
+        Client("a")
+        assert created == ["a", "a"]
+
+    def test_evict_and_clear(self):
+        class Client(metaclass=Multiton):
+            def __init__(self, tenant):
+                self.tenant = tenant
+
+        a, b = Client("a"), Client("b")
+
+        Client.evict(tenant="a")
+        assert Client("a") is not a
+        assert Client("b") is b
+
+        Client.clear()
+        assert Client("b") is not b
+
+    def test_policy_inheritance(self):
+        class BaseClient(metaclass=Multiton, eviction="lru", maxsize=1):
+            pass
+
+        class DerivedClient(BaseClient):
+            pass
+
+        assert DerivedClient._multiton_eviction == "lru"
+        assert DerivedClient._multiton_maxsize == 1
+        assert DerivedClient() is not BaseClient()
+
+    def test_on_invalid_policy(self):
+        with pytest.raises(ValueError, match="Unknown eviction policy"):
+
+            class Client(metaclass=Multiton, eviction="fifo"):
+                pass
+
+        with pytest.raises(ValueError, match="Maximum number of objects must be a positive"):
+
+            class Client2(metaclass=Multiton, eviction="lru", maxsize=-1):
+                pass
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires os.fork")
+    def test_reset_in_forked_child(self):
+        class Client(metaclass=Multiton):
+            pass
+
+        client = Client()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            os.write(write_fd, b"1" if Client() is not client else b"0")
+            os._exit(0)
+
+        os.waitpid(pid, 0)
+        assert os.read(read_fd, 1) == b"1"
+
+        # Objects of the parent process are kept
+        assert Client() is client
+
+
+class TestObjectPool:
+    def test_checkout_reuses_objects(self):
+        pool = ObjectPool(object, max_size=2)
+
+        with pool.checkout() as obj1:
+            pass
+
+        with pool.checkout() as obj2:
+            pass
+
+        assert obj1 is obj2
+        assert pool.stats == PoolStats(hits=1, misses=1, waits=0, evictions=0, size=1, idle=1)
+
+    def test_reset_on_release(self):
+        pool = ObjectPool(list, reset=lambda _: _.clear())
+
+        with pool.checkout() as obj:
+            obj.append(1)
+
+        with pool.checkout() as obj:
+            assert obj == []
+
+    def test_failed_reset_evicts_object(self):
+        def reset(_):
+            raise RuntimeError("some error")
+
+        pool = ObjectPool(object, reset=reset)
+
+        with pool.checkout() as obj1:
+            pass
+
+        with pool.checkout() as obj2:
+            pass
+
+        assert obj1 is not obj2
+        assert pool.stats.evictions == 2
+        assert pool.stats.size == 0
+
+    def test_wait_for_release(self):
+        pool = ObjectPool(object, max_size=1)
+        obj = pool.acquire()
+
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.01)
+
+        Timer(0.01, pool.release, (obj,)).start()
+
+        assert pool.acquire(timeout=5) is obj
+        assert pool.stats.waits == 2
+
+    def test_idle_eviction(self, mocker):
+        monotonic_mock = mocker.patch("pure_utils.common.monotonic", return_value=100.0)
+        pool = ObjectPool(object, max_idle=10)
+
+        with pool.checkout() as obj1:
+            pass
+
+        monotonic_mock.return_value = 120.0
+
+        with pool.checkout() as obj2:
+            pass
+
+        assert obj1 is not obj2
+        assert pool.stats.evictions == 1
+
+    def test_failed_factory(self):
+        def factory():
+            raise RuntimeError("some error")
+
+        pool = ObjectPool(factory, max_size=1)
+
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+
+        assert pool.stats.size == 0
+
+    def test_clear(self):
+        pool = ObjectPool(object)
+
+        with pool.checkout():
+            pass
+
+        pool.clear()
+        assert pool.stats.idle == 0 and pool.stats.size == 0
+
+    def test_async_checkout(self):
+        pool = ObjectPool(object, max_size=1)
+
+        async def use():
+            async with pool.acheckout() as obj:
+                await asyncio.sleep(0.01)
+                return obj
+
+        async def main():
+            return await asyncio.gather(use(), use(), use())
+
+        obj1, obj2, obj3 = asyncio.run(main())
+
+        assert obj1 is obj2 is obj3
+        assert pool.stats.size == 1 and pool.stats.idle == 1
+
+    def test_async_checkout_of_idle_object(self, mocker):
+        pool = ObjectPool(object)
+
+        with pool.checkout() as obj:
+            pass
+
+        executor_mock = mocker.patch("pure_utils.common._get_create_executor")
+
+        async def use():
+            async with pool.acheckout() as obj:
+                return obj
+
+        assert asyncio.run(use()) is obj
+        executor_mock.assert_not_called()
+
+    def test_cancelled_async_checkout(self):
+        pool = ObjectPool(object, max_size=1)
+        obj = pool.acquire()
+
+        async def main():
+            async def use():
+                async with pool.acheckout():
+                    pass
+
+            task = asyncio.create_task(use())
+            await asyncio.sleep(0.01)
+            task.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        pool.release(obj)
+
+        # The object, acquired by the cancelled waiter, is returned to the pool
+        assert pool.acquire(timeout=5) is obj
+        assert pool.stats.size == 1
+
+    def test_async_checkout_timeout(self):
+        pool = ObjectPool(object, max_size=1)
+        obj = pool.acquire()
+
+        async def use():
+            async with pool.acheckout(timeout=0.01):
+                pass
+
+        with pytest.raises(TimeoutError, match="No objects were released"):
+            asyncio.run(use())
+
+        pool.release(obj)
+        assert pool.acquire(timeout=5) is obj
+
+    def test_async_waiters_of_many_pools(self):
+        pool1, pool2 = ObjectPool(object, max_size=1), ObjectPool(object, max_size=1)
+
+        async def hold():
+            async with pool1.acheckout():
+                await asyncio.sleep(0.01)
+                # Creation of the object in the other pool is not blocked by the waiters
+                async with pool2.acheckout() as obj:
+                    return obj
+
+        async def wait():
+            async with pool1.acheckout() as obj:
+                return obj
+
+        async def main():
+            holder = asyncio.create_task(hold())
+            await asyncio.sleep(0)
+            return await asyncio.wait_for(
+                asyncio.gather(holder, *(wait() for _ in range(64))), timeout=5
+            )
+
+        assert len(asyncio.run(main())) == 65
+        assert pool1.stats.size == 1 and pool1.stats.idle == 1
+
+    def test_on_invalid_max_size(self):
+        with pytest.raises(ValueError, match="Maximum size of the pool must be a positive"):
+            ObjectPool(object, max_size=0)
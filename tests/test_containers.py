@@ -1,15 +1,39 @@
+import pickle
+import sys
+from array import array
+from collections import defaultdict, deque
+
 import pytest
 
 from pure_utils.containers import (
+    BloomFilter,
+    LazySeq,
+    Path,
+    RecordBatch,
+    SequenceView,
+    Unpacker,
+    _compile_path,
     bisect,
+    deepflatten,
     first,
     flatten,
+    get_in,
     get_or_else,
+    ipaginate,
+    isymmdiff,
     omit,
+    omit_many,
     paginate,
     pick,
+    pick_many,
+    pmap,
+    split_into,
     symmdiff,
+    symmdiff_approx,
+    symmdiff_many,
+    unique,
     unpack,
+    unpack_many,
 )
 
 
@@ -97,6 +121,116 @@ class TestFlatten:
 
         assert result == (1, 2, 3, 4, 5)
 
+    def test_on_deep_nesting_level(self):
+        seq = [1]
+        for _ in range(10_000):
+            seq = [seq]
+
+        assert list(flatten(seq)) == [1]
+
+    def test_on_not_a_collection(self):
+        assert list(flatten(1)) == [1]
+
+    def test_on_cyclic_collection(self):
+        seq = [1, 2]
+        seq.append(seq)
+
+        with pytest.raises(ValueError, match="The source collection must not contain cycles"):
+            list(flatten(seq))
+
+
+class TestDeepFlatten:
+    def test_on_arbitrary_iterables(self):
+        seq = [1, (_ for _ in (2, 3)), deque([4, range(5, 7)]), {7}]
+        assert list(deepflatten(seq)) == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_on_custom_iterable(self):
+        class Node:
+            def __init__(self, *children):
+                self.children = children
+
+            def __iter__(self):
+                return iter(self.children)
+
+        assert list(deepflatten(Node(1, Node(2, Node(3)), 4))) == [1, 2, 3, 4]
+
+    def test_atomic_types_by_default(self):
+        seq = ["abc", [b"def", bytearray(b"gh"), {"k": "v"}]]
+        assert list(deepflatten(seq)) == ["abc", b"def", bytearray(b"gh"), {"k": "v"}]
+
+    def test_with_custom_atomic_types(self):
+        seq = [(1, 2), [3, (4, 5)]]
+        assert list(deepflatten(seq, atomic=(tuple,))) == [(1, 2), 3, (4, 5)]
+
+    def test_with_depth(self):
+        seq = [1, [2, [3, [4]]]]
+
+        assert list(deepflatten(seq, depth=0)) == [1, [2, [3, [4]]]]
+        assert list(deepflatten(seq, depth=1)) == [1, 2, [3, [4]]]
+        assert list(deepflatten(seq, depth=2)) == [1, 2, 3, [4]]
+        assert list(deepflatten(seq, depth=100)) == [1, 2, 3, 4]
+
+    def test_on_deep_nesting_level(self):
+        seq = [1]
+        for _ in range(10_000):
+            seq = [seq, 2]
+
+        assert list(deepflatten(seq)) == [1] + [2] * 10_000
+
+    def test_on_repeated_not_cyclic_references(self):
+        inner = [1, 2]
+        assert list(deepflatten([inner, [inner]])) == [1, 2, 1, 2]
+
+    def test_on_cyclic_collection(self):
+        seq = [1, [2]]
+        seq[1].append(seq)
+
+        with pytest.raises(ValueError, match="The source collection must not contain cycles"):
+            list(deepflatten(seq))
+
+
+class TestGetIn:
+    @pytest.fixture(scope="function")
+    def payload(self):
+        return {"users": [{"name": "Bob", "tags": ("admin", "dev")}], "meta": {0: "zero"}}
+
+    def test_on_dotted_path(self, payload):
+        assert get_in(payload, "users.0.name") == "Bob"
+        assert get_in(payload, "users.-1.tags.1") == "dev"
+        assert get_in(payload, "users") == payload["users"]
+
+    def test_on_keys_sequence(self, payload):
+        assert get_in(payload, ("users", 0, "tags", -1)) == "dev"
+        assert get_in(payload, ["meta", 0]) == "zero"
+
+    def test_on_path_object(self, payload):
+        assert get_in(payload, Path("users.0.name")) == "Bob"
+        assert get_in(payload, Path("users/0/name", separator="/")) == "Bob"
+
+    def test_on_missing_elements(self, payload):
+        assert get_in(payload, "users.1.name") is None
+        assert get_in(payload, "users.0.email", -1) == -1
+        assert get_in(payload, "users.name", "does not exists") == "does not exists"
+        assert get_in(payload, "users.0.name.first", "does not exists") == "does not exists"
+        assert get_in(None, "users") is None
+
+    def test_on_unhashable_keys(self, payload):
+        assert get_in(payload, ("users", [0])) is None
+        assert get_in(payload, ("meta", {}), "does not exists") == "does not exists"
+
+    def test_on_non_index_digit_keys(self):
+        # Only ASCII integers are treated as indexes, the other keys are looked up as is
+        assert get_in({"a": {"--1": 5}}, "a.--1") == 5
+        assert get_in({"a": {"²": 4}}, "a.²") == 4
+        assert get_in({"a": {"1-": 3}}, "a.1-") == 3
+
+    def test_path_strings_are_cached(self, payload):
+        get_in(payload, "meta.cached.path")
+        hits = _compile_path.cache_info().hits
+
+        get_in(payload, "meta.cached.path")
+        assert _compile_path.cache_info().hits == hits + 1
+
 
 class TestGetOrElse:
     def test_regular_usage(self):
@@ -109,6 +243,77 @@ class TestGetOrElse:
         assert get_or_else(seq, 5, "does not exists") == "does not exists"
 
 
+class TestSplitInto:
+    def test_on_list(self):
+        source_list = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+        chunks = split_into(source_list, 3)
+
+        assert all(isinstance(_, SequenceView) for _ in chunks)
+        assert [list(_) for _ in chunks] == [[1, 2, 3, 4], [5, 6, 7], [8, 9, 10]]
+
+        # Source list is not changed
+        assert source_list == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+    def test_balanced_sizes(self):
+        for length in range(0, 30):
+            for n in range(1, 8):
+                sizes = [len(_) for _ in split_into(list(range(length)), n)]
+
+                assert len(sizes) == n
+                assert sum(sizes) == length
+                assert max(sizes) - min(sizes) <= 1
+
+    def test_on_small_collection(self):
+        chunks = split_into((1, 2), 4)
+        assert [list(_) for _ in chunks] == [[1], [2], [], []]
+
+    def test_on_bytearray(self):
+        source = bytearray(b"abcdefg")
+        chunks = split_into(source, 2)
+
+        assert all(isinstance(_, memoryview) for _ in chunks)
+        assert [bytes(_) for _ in chunks] == [b"abcd", b"efg"]
+
+        # Chunks are views over the original buffer (no copies)
+        source[-1] = ord("z")
+        assert bytes(chunks[1]) == b"efz"
+
+    def test_on_array(self):
+        chunks = split_into(array("d", range(5)), 2)
+        assert [_.tolist() for _ in chunks] == [[0.0, 1.0, 2.0], [3.0, 4.0]]
+
+    def test_on_zero_chunks(self):
+        with pytest.raises(ValueError, match="Number of chunks must be a positive integer"):
+            split_into([1, 2], 0)
+
+
+class TestSequenceView:
+    def test_regular_usage(self):
+        source_list = [1, 2, 3, 4, 5]
+        view = SequenceView(source_list)[1:4]
+
+        assert len(view) == 3
+        assert list(view) == [2, 3, 4]
+        assert view[0] == 2 and view[-1] == 4
+        assert 3 in view and view.index(4) == 2
+
+        # View reflects changes of the source sequence (no copies)
+        source_list[1] = 20
+        assert view[0] == 20
+
+    def test_on_nested_slices(self):
+        view = SequenceView(list(range(10)))[2:9][::2]
+        assert list(view) == [2, 4, 6, 8]
+
+    def test_on_out_of_range_index(self):
+        with pytest.raises(IndexError):
+            SequenceView([1, 2, 3])[1:2][1]
+
+    def test_pickle(self):
+        view = SequenceView(list(range(1000)))[10:13]
+        assert pickle.loads(pickle.dumps(view)) == [10, 11, 12]
+
+
 class TestSymmdiff:
     def test_on_two_lists(self):
         l1 = ["a", "b", "c"]
@@ -135,6 +340,168 @@ class TestSymmdiff:
 
         assert sorted(diff) == ["c", "e"]
 
+    def test_with_count_only(self):
+        assert symmdiff(["a", "b", "c"], ["e", "b", "a"], count_only=True) == 2
+        assert symmdiff([1, 2], [1, 2], count_only=True) == 0
+
+    def test_with_side(self):
+        diff = symmdiff(["a", "b", "c"], ["e", "b", "a"], with_side=True)
+        assert sorted(diff) == [("c", 0), ("e", 1)]
+
+    def test_on_presorted_iterables(self):
+        left = (_ for _ in [1, 2, 2, 3, 5])
+        right = (_ for _ in [2, 4, 5, 5, 6])
+
+        assert symmdiff(left, right, presorted=True) == [1, 3, 4, 6]
+
+    def test_on_large_sorted_sequences(self, mocker):
+        mocker.patch("pure_utils.containers.DEFAULT_SORTED_MERGE_THRESHOLD", 4)
+        merge_mock = mocker.patch(
+            "pure_utils.containers.isymmdiff", side_effect=lambda *args, **_: iter(())
+        )
+
+        # Unsorted sequences are compared through sets
+        assert sorted(symmdiff([3, 2, 1], [2, 3, 4])) == [1, 4]
+        merge_mock.assert_not_called()
+
+        # Large enough sorted sequences are compared by merging
+        symmdiff([1, 2, 3], [2, 3, 4])
+        merge_mock.assert_called_once()
+
+    def test_on_large_sorted_sequences_of_different_types(self, mocker):
+        mocker.patch("pure_utils.containers.DEFAULT_SORTED_MERGE_THRESHOLD", 4)
+
+        # Elements of the collections are not comparable, so they are compared through sets
+        assert set(symmdiff([1, 2, 3], ["x"])) == {1, 2, 3, "x"}
+        assert symmdiff([1, 2, 3], ["x"], count_only=True) == 4
+        assert set(symmdiff([1, 2, 3], ["x"], with_side=True)) == {(1, 0), (2, 0), (3, 0), ("x", 1)}
+
+
+class TestSymmdiffMany:
+    def test_on_unsorted_collections(self):
+        diff = symmdiff_many([3, 2, 1], [4, 3, 2], [5, 3])
+
+        assert sorted(diff) == [1, 4, 5]
+
+    def test_on_presorted_collections(self):
+        diff = symmdiff_many([1, 2, 3], [2, 3, 4], [3, 5], presorted=True, with_side=True)
+
+        assert diff == [(1, 0), (4, 1), (5, 2)]
+
+    def test_with_count_only(self):
+        assert symmdiff_many([1, 2, 3], [2, 3, 4], [3, 5], count_only=True) == 3
+        assert symmdiff_many([1, 2, 3], [2, 3, 4], [3, 5], presorted=True, count_only=True) == 3
+
+    def test_with_side(self):
+        diff = symmdiff_many(["a", "b"], ["b", "c"], ["d"], with_side=True)
+
+        assert sorted(diff) == [("a", 0), ("c", 1), ("d", 2)]
+
+
+class TestSymmdiffApprox:
+    def test_regular_usage(self):
+        result = symmdiff_approx(["a", "b", "c"], ["e", "b", "a", "e"], capacity=100)
+
+        assert not isinstance(result, list)
+        assert sorted(result) == ["c", "e"]
+
+    def test_on_large_collections(self):
+        left, right = range(0, 20_000), range(10_000, 30_000)
+        result = list(symmdiff_approx(left, right, capacity=20_000, error_rate=0.01))
+        exact = set(left).symmetric_difference(right)
+
+        # No false inclusions and no duplicates, only a small share of misses
+        assert set(result) <= exact
+        assert len(result) == len(set(result))
+        assert len(result) >= len(exact) * 0.97
+
+    def test_on_invalid_arguments(self):
+        # Arguments are checked on call (not on the first iteration)
+        with pytest.raises(ValueError):
+            symmdiff_approx([1], [2], capacity=0)
+
+        with pytest.raises(ValueError):
+            symmdiff_approx([1], [2], error_rate=1.5)
+
+
+class TestISymmdiff:
+    def test_on_generators(self):
+        left = (_ for _ in range(0, 10, 2))
+        right = (_ for _ in range(0, 10, 3))
+        diff = isymmdiff(left, right)
+
+        assert not isinstance(diff, list)
+        assert list(diff) == [2, 3, 4, 8, 9]
+
+    def test_with_duplicates(self):
+        assert list(isymmdiff([1, 1, 2, 4, 4], [2, 2, 3, 3])) == [1, 3, 4]
+
+    def test_with_side(self):
+        diff = isymmdiff([1, 2, 7, 8], [2, 3, 9], with_side=True)
+
+        assert list(diff) == [(1, 0), (3, 1), (7, 0), (8, 0), (9, 1)]
+
+    def test_on_empty_collections(self):
+        assert list(isymmdiff([], [1, 1, 2])) == [1, 2]
+        assert list(isymmdiff([1, 2], [])) == [1, 2]
+        assert list(isymmdiff([], [])) == []
+
+    def test_on_multiple_collections(self):
+        diff = isymmdiff([1, 2, 3], [2, 3, 4], [3, 5, 5], [6], with_side=True)
+
+        assert list(diff) == [(1, 0), (4, 1), (5, 2), (6, 3)]
+
+
+class TestUnique:
+    def test_exact(self):
+        result = unique(_ for _ in [3, 1, 3, 2, 1, "a", "a"])
+
+        assert not isinstance(result, list)
+        assert list(result) == [3, 1, 2, "a"]
+
+    def test_approx(self):
+        assert list(unique([3, 1, 3, 2, 1, "a", "a"], approx=True, capacity=100)) == [3, 1, 2, "a"]
+
+    def test_approx_on_large_collection(self):
+        source = [_ % 10_000 for _ in range(30_000)]
+        result = list(unique(source, approx=True, capacity=10_000, error_rate=0.01))
+
+        assert len(result) == len(set(result))
+        assert len(result) >= 10_000 * 0.97
+
+
+class TestBloomFilter:
+    def test_membership(self):
+        bloom = BloomFilter(1000)
+
+        assert bloom.add("some") is False
+        assert bloom.add("some") is True
+        assert "some" in bloom
+        assert "other" not in bloom
+
+    def test_no_false_negatives_and_error_rate(self):
+        bloom = BloomFilter(10_000, 0.01)
+
+        for _ in range(10_000):
+            bloom.add(_)
+
+        assert all(_ in bloom for _ in range(10_000))
+        assert sum(_ in bloom for _ in range(10_000, 20_000)) < 10_000 * 0.02
+
+    def test_size(self):
+        bloom = BloomFilter(1_000_000, 0.01)
+
+        assert bloom.nbytes == BloomFilter.estimate_size(1_000_000, 0.01)
+        assert 1_150_000 < bloom.nbytes < 1_250_000
+        assert bloom.hashes_count == 7
+
+    def test_on_invalid_params(self):
+        with pytest.raises(ValueError, match="Capacity must be a positive integer"):
+            BloomFilter(0)
+
+        with pytest.raises(ValueError, match="Error rate must be in range"):
+            BloomFilter(10, 1.0)
+
 
 class TestOmit:
     def test_regular_usage(self):
@@ -146,6 +513,71 @@ class TestOmit:
         # The original dictionary has not changed
         assert source_dict == {"key1": "val1", "key2": "val2"}
 
+    def test_keeps_keys_order(self):
+        source_dict = {"c": 1, "a": 2, "d": 3, "b": 4}
+
+        assert list(omit(source_dict, ["a"])) == ["c", "d", "b"]
+        assert list(omit(source_dict, ["a", "x", "y", "z", "w"])) == ["c", "d", "b"]
+
+    def test_on_not_existing_keys(self):
+        source_dict = {"key1": "val1", "key2": "val2"}
+
+        assert omit(source_dict, ["key3"]) == {"key1": "val1", "key2": "val2"}
+        assert omit(source_dict, ["key3", "key4", "key5"]) == {"key1": "val1", "key2": "val2"}
+
+    def test_on_keys_view(self):
+        source_dict = {"key1": "val1", "key2": "val2", "key3": "val3"}
+        omitted_keys = {"key1": None, "key2": None, "key4": None, "key5": None}.keys()
+
+        assert omit(source_dict, omitted_keys) == {"key3": "val3"}
+
+    def test_on_all_keys(self):
+        source_dict = {"key1": "val1", "key2": "val2"}
+        assert omit(source_dict, source_dict.keys()) == {}
+
+    def test_on_iterator_keys(self):
+        source_dict = {"key1": "val1", "key2": "val2", "key3": "val3"}
+        assert omit(source_dict, iter(["key1", "key3"])) == {"key2": "val2"}
+
+    def test_result_is_not_oversized(self):
+        source_dict = {str(_): _ for _ in range(5000)}
+        result = omit(source_dict, [str(_) for _ in range(1, 5000)])
+
+        assert result == {"0": 0}
+        assert sys.getsizeof(result) == sys.getsizeof({"0": 0})
+
+
+class TestOmitMany:
+    def test_regular_usage(self):
+        source = [{"key1": "val1", "key2": "val2"}, {"key1": "val3", "key3": "val4"}]
+        result = omit_many(source, ["key1"])
+
+        assert not isinstance(result, list)
+        assert list(result) == [{"key2": "val2"}, {"key3": "val4"}]
+
+        # The original dictionaries has not changed
+        assert source == [{"key1": "val1", "key2": "val2"}, {"key1": "val3", "key3": "val4"}]
+
+    def test_keeps_keys_order(self):
+        source = [{"c": 1, "a": 2, "b": 3, "d": 4}]
+        assert list(list(omit_many(source, ["a"]))[0]) == ["c", "b", "d"]
+
+    def test_on_wide_and_narrow_dicts(self):
+        source = [{"a": 1, "b": 2, "c": 3, "d": 4}, {"b": 5}]
+        result = list(omit_many(source, ["b", "c"]))
+
+        assert result == [{"a": 1, "d": 4}, {}]
+
+    def test_result_is_not_oversized(self):
+        source = [{str(_): _ for _ in range(5000)}]
+        (result,) = omit_many(source, [str(_) for _ in range(1, 5000)])
+
+        assert sys.getsizeof(result) == sys.getsizeof({"0": 0})
+
+    def test_on_generator(self):
+        source = ({"key": _, "other": _} for _ in range(3))
+        assert list(omit_many(source, ("other",))) == [{"key": 0}, {"key": 1}, {"key": 2}]
+
 
 class TestPaginate:
     def test_on_list_with_odd_size(self):
@@ -182,6 +614,44 @@ class TestPaginate:
         assert pages == [(1, 2, 3, 4, 5), (6, 7, 8, 9, 10)]
 
 
+class TestIPaginate:
+    def test_on_generator(self):
+        pages = ipaginate((_ for _ in range(1, 11)), size=3)
+
+        assert not isinstance(pages, list)
+        assert list(pages) == [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]]
+
+    def test_on_list(self):
+        source_list = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+        assert list(ipaginate(source_list, size=5)) == [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]]
+
+    def test_on_tuple(self):
+        assert list(ipaginate((1, 2, 3), size=2)) == [(1, 2), (3,)]
+
+    def test_on_bytearray(self):
+        source = bytearray(b"abcdefg")
+        pages = list(ipaginate(source, size=3))
+
+        assert all(isinstance(_, memoryview) for _ in pages)
+        assert [bytes(_) for _ in pages] == [b"abc", b"def", b"g"]
+
+        # Pages are views over the original buffer (no copies)
+        source[0] = ord("z")
+        assert bytes(pages[0]) == b"zbc"
+
+    def test_on_array(self):
+        pages = list(ipaginate(array("i", range(7)), size=3))
+        assert [_.tolist() for _ in pages] == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_on_empty_iterable(self):
+        assert list(ipaginate(iter([]), size=2)) == []
+        assert list(ipaginate(b"", size=2)) == []
+
+    def test_on_zero_size(self):
+        with pytest.raises(ValueError, match="Page size must be a positive integer"):
+            ipaginate([1, 2], size=0)
+
+
 class TestPick:
     def test_on_existing_keys(self):
         source_dict = {"key1": "val1", "key2": "val2", "key3": "val3"}
@@ -199,6 +669,101 @@ class TestPick:
         assert modified_dict == {}
 
 
+class TestPickMany:
+    def test_on_existing_keys(self):
+        source = [{"key1": "val1", "key2": "val2"}, {"key1": "val3", "key2": "val4"}]
+        result = pick_many(source, ["key2", "key1"])
+
+        assert not isinstance(result, list)
+        assert list(result) == [{"key2": "val2", "key1": "val1"}, {"key2": "val4", "key1": "val3"}]
+
+        # The original dictionaries has not changed
+        assert source == [{"key1": "val1", "key2": "val2"}, {"key1": "val3", "key2": "val4"}]
+
+    def test_on_partially_existing_keys(self):
+        source = [{"key1": "val1", "key2": "val2"}, {"key1": "val3"}, {}]
+        result = list(pick_many(source, ["key1", "key2"]))
+
+        assert result == [{"key1": "val1", "key2": "val2"}, {"key1": "val3"}, {}]
+
+    def test_on_single_key(self):
+        source = [{"key1": "val1", "key2": "val2"}, {"key2": "val3"}]
+        assert list(pick_many(source, ["key1"])) == [{"key1": "val1"}, {}]
+
+    def test_on_empty_keys(self):
+        assert list(pick_many([{"key1": "val1"}], [])) == [{}]
+
+    def test_on_duplicated_keys(self):
+        assert list(pick_many([{"a": 1, "b": 2}], ["a", "a", "b"])) == [{"a": 1, "b": 2}]
+
+    def test_on_defaultdict(self):
+        source = defaultdict(int, key1=1)
+
+        assert list(pick_many([source], ["key1", "key2"])) == [{"key1": 1}]
+        # The missing keys are not inserted into the original dictionary
+        assert source == {"key1": 1}
+
+
+def square(x):
+    return x * x
+
+
+class TestPmap:
+    def test_ordered_results(self):
+        results = pmap(square, range(100), chunk_size=7, workers=3)
+
+        assert not isinstance(results, list)
+        assert list(results) == [_ * _ for _ in range(100)]
+
+    def test_unordered_results(self):
+        results = pmap(square, (_ for _ in range(100)), chunk_size=7, workers=3, ordered=False)
+        assert sorted(results) == [_ * _ for _ in range(100)]
+
+    def test_on_empty_iterable(self):
+        assert list(pmap(square, [])) == []
+
+    def test_process_executor(self):
+        results = pmap(square, range(20), chunk_size=5, workers=2, executor="process")
+        assert list(results) == [_ * _ for _ in range(20)]
+
+    def test_bounded_consumption(self):
+        consumed = []
+
+        def source():
+            for _ in range(1000):
+                consumed.append(_)
+                yield _
+
+        results = pmap(square, source(), chunk_size=10, workers=2)
+        assert next(results) == 0
+
+        # No more than two chunks per worker are taken from the source
+        assert len(consumed) <= 10 * 2 * 2 + 1
+        results.close()
+
+    def test_exception_propagation(self):
+        def func(x):
+            if x == 42:
+                raise RuntimeError("some error")
+            return x
+
+        with pytest.raises(RuntimeError, match="some error"):
+            list(pmap(func, range(1000), chunk_size=10, workers=2))
+
+        with pytest.raises(RuntimeError, match="some error"):
+            list(pmap(func, range(1000), chunk_size=10, workers=2, ordered=False))
+
+    def test_on_invalid_params(self):
+        with pytest.raises(ValueError, match="Chunk size must be a positive integer"):
+            pmap(square, [1], chunk_size=0)
+
+        with pytest.raises(ValueError, match="Number of workers must be a positive integer"):
+            pmap(square, [1], workers=0)
+
+        with pytest.raises(ValueError, match="Unknown executor type"):
+            pmap(square, [1], executor="fiber")
+
+
 class TestUnpack:
     def test_on_dict(self):
         d = {"a": 1, "b": True, "c": {"d": "test"}}
@@ -228,3 +793,240 @@ class TestUnpack:
         # Unpack value by non-existent attribute
         (d,) = unpack(obj, ("d"))
         assert d is None
+
+
+class TestUnpacker:
+    class Obj:
+        def __init__(self, **kwargs):
+            self.__dict__.update(kwargs)
+
+    def test_on_dict(self):
+        unpacker = Unpacker(("a", "b", "f"))
+
+        assert unpacker({"a": 1, "b": True, "f": "x"}) == (1, True, "x")
+        assert unpacker({"a": 1}) == (1, None, None)
+
+    def test_on_defaultdict(self):
+        source = defaultdict(int, a=1)
+
+        assert Unpacker(("a", "b"))(source) == (1, None)
+        # The missing keys are not inserted into the original dictionary
+        assert source == {"a": 1}
+
+    def test_on_object(self):
+        unpacker = Unpacker(("a", "b"))
+
+        assert unpacker(self.Obj(a=100, b=200)) == (100, 200)
+        assert unpacker(self.Obj(a=100)) == (100, None)
+
+    def test_on_single_and_empty_attributes(self):
+        assert Unpacker(("a",))({"a": 1}) == (1,)
+        assert Unpacker(("a",))(self.Obj(a=1)) == (1,)
+        assert Unpacker(())({"a": 1}) == ()
+
+    def test_on_dotted_paths(self):
+        unpacker = Unpacker(("id", "user.address.city"))
+
+        assert unpacker({"id": 1, "user": {"address": {"city": "Paris"}}}) == (1, "Paris")
+        assert unpacker({"id": 1, "user": {}}) == (1, None)
+        assert unpacker({"id": 1, "user": None}) == (1, None)
+
+        obj = self.Obj(id=2, user=self.Obj(address=self.Obj(city="Rome")))
+        assert unpacker(obj) == (2, "Rome")
+
+    def test_on_mixed_dict_and_object_access(self):
+        unpacker = Unpacker(("user.address.city",))
+
+        assert unpacker(self.Obj(user={"address": self.Obj(city="Oslo")})) == ("Oslo",)
+        assert unpacker({"user": self.Obj(address={"city": "Kyiv"})}) == ("Kyiv",)
+
+    def test_unpack_many(self):
+        rows = [{"a": 1, "b": 2}, self.Obj(a=3, b=4), {"a": 5}]
+        result = Unpacker(("a", "b")).unpack_many(_ for _ in rows)
+
+        assert not isinstance(result, list)
+        assert list(result) == [(1, 2), (3, 4), (5, None)]
+
+
+class TestUnpackMany:
+    def test_regular_usage(self):
+        rows = [{"id": 1, "user": {"name": "Bob"}}, {"id": 2, "user": {"name": "Alice"}}]
+        assert list(unpack_many(rows, ("id", "user.name"))) == [(1, "Bob"), (2, "Alice")]
+
+
+class TestRecordBatch:
+    @pytest.fixture(scope="function")
+    def records(self):
+        return [
+            {"id": 1, "name": "Bob", "score": 0.5, "active": True},
+            {"id": 2, "name": "Alice", "score": 0.7, "active": False},
+            {"id": 3, "name": "Eve", "score": 0.1, "active": True},
+        ]
+
+    def test_from_records_and_back(self, records):
+        batch = RecordBatch.from_records(records)
+
+        assert len(batch) == 3
+        assert batch.columns == ("id", "name", "score", "active")
+        assert batch.to_records() == records
+
+    def test_compact_numeric_columns(self, records):
+        batch = RecordBatch.from_records(records)
+
+        assert isinstance(batch.column("id"), array) and batch.column("id").typecode == "q"
+        assert isinstance(batch.column("score"), array) and batch.column("score").typecode == "d"
+        assert isinstance(batch.column("name"), list)
+        assert isinstance(batch.column("active"), list)
+
+        batch = RecordBatch.from_records([{"id": 2**64}, {"id": 1}, {"id": None}])
+        assert isinstance(batch.column("id"), list)
+
+    def test_rows(self, records):
+        batch = RecordBatch.from_records(records)
+        rows = list(batch)
+
+        assert rows[0] == (1, "Bob", 0.5, True)
+        assert rows[1].name == "Alice"
+        assert batch[2].id == 3 and batch[-1].score == 0.1
+
+    def test_pick(self, records):
+        batch = RecordBatch.from_records(records)
+        picked = batch.pick(["name", "id", "unknown"])
+
+        assert picked.columns == ("name", "id")
+        assert picked.column("id") is batch.column("id")
+        assert [tuple(_) for _ in picked] == [("Bob", 1), ("Alice", 2), ("Eve", 3)]
+
+    def test_omit(self, records):
+        batch = RecordBatch.from_records(records)
+        omitted = batch.omit(["score", "active"])
+
+        assert omitted.to_records() == [
+            {"id": 1, "name": "Bob"},
+            {"id": 2, "name": "Alice"},
+            {"id": 3, "name": "Eve"},
+        ]
+
+        # The original batch has not changed
+        assert batch.columns == ("id", "name", "score", "active")
+
+    def test_omit_all_columns(self, records):
+        batch = RecordBatch.from_records(records).omit(["id", "name", "score", "active"])
+
+        assert len(batch) == 3 and batch.columns == ()
+        assert list(batch) == [(), (), ()]
+        assert batch.to_records() == [{}, {}, {}]
+        assert len(RecordBatch.from_records(records).pick([])) == 3
+
+        with pytest.raises(IndexError):
+            batch[3]
+
+    def test_slice(self, records):
+        batch = RecordBatch.from_records(records)[1:]
+
+        assert isinstance(batch, RecordBatch) and len(batch) == 2
+        assert isinstance(batch.column("id"), array)
+        assert batch.to_records() == records[1:]
+        assert len(batch.omit(batch.columns)[::2]) == 1
+
+    def test_from_columns(self):
+        batch = RecordBatch({"a": [1, 2], "class": ["x", "y"]})
+
+        assert batch.to_records() == [{"a": 1, "class": "x"}, {"a": 2, "class": "y"}]
+        assert tuple(batch[0]) == (1, "x")
+
+        with pytest.raises(ValueError, match="All columns must have the same length"):
+            RecordBatch({"a": [1, 2], "b": [1]})
+
+    def test_on_empty_records(self):
+        batch = RecordBatch.from_records([])
+
+        assert len(batch) == 0
+        assert batch.columns == ()
+        assert batch.to_records() == []
+
+        assert len(RecordBatch.from_records([{}, {}])) == 2
+
+    def test_on_heterogeneous_records(self):
+        with pytest.raises(ValueError, match="All records must have the same keys"):
+            RecordBatch.from_records([{"a": 1, "b": 2}, {"a": 1}])
+
+        with pytest.raises(ValueError, match="All records must have the same keys"):
+            RecordBatch.from_records([{"a": 1, "b": 2}, {"a": 1, "c": 3}])
+
+
+class TestLazySeq:
+    @pytest.fixture(scope="function")
+    def source(self):
+        class Source:
+            pulled = 0
+
+            def __iter__(self):
+                for _ in range(100):
+                    self.pulled += 1
+                    yield _ * _
+
+        return Source()
+
+    def test_random_access(self, source):
+        seq = LazySeq(source)
+
+        assert seq[3] == 9
+        assert source.pulled == 4
+
+        # Cached elements are not pulled again
+        assert seq[1] == 1 and seq[3] == 9
+        assert source.pulled == 4
+
+    def test_slices(self, source):
+        seq = LazySeq(source)
+
+        assert seq[2:5] == [4, 9, 16]
+        assert source.pulled == 5
+
+        assert seq[98:200] == [9604, 9801]
+        assert seq[-2:] == [9604, 9801]
+
+    def test_negative_index_and_len(self, source):
+        seq = LazySeq(source)
+
+        assert seq[-1] == 9801
+        assert len(seq) == 100
+        assert source.pulled == 100
+
+    def test_out_of_range_index(self):
+        seq = LazySeq(iter([1, 2]))
+
+        with pytest.raises(IndexError):
+            seq[2]
+
+        assert seq.get(2) is None
+        assert seq.get(-3, "default") == "default"
+        assert seq.get(-1) == 2
+
+    def test_iteration(self, source):
+        seq = LazySeq(source)
+        seq[1]
+
+        assert list(seq) == [_ * _ for _ in range(100)]
+        assert list(seq)[:3] == [0, 1, 4]
+
+    def test_bool(self, source):
+        assert LazySeq(source)
+        assert source.pulled == 1
+        assert not LazySeq([])
+
+    def test_with_container_utilities(self, source):
+        seq = LazySeq(source)
+
+        assert first(seq) == 0
+        assert get_or_else(seq, 5) == 25
+        assert get_in({"items": seq}, "items.7") == 49
+        assert get_in({"items": seq}, "items.200", -1) == -1
+        assert next(ipaginate(LazySeq(iter(range(10))), size=4)) == [0, 1, 2, 3]
+
+    def test_nested_lookup_is_lazy(self, source):
+        seq = LazySeq(source)
+
+        assert get_in({"items": seq}, "items.7") == 49
+        assert source.pulled == 8
@@ -1,8 +1,24 @@
+import asyncio
+import json
+import os
+import re
 from logging import getLogger
+from time import perf_counter
 
 import pytest
 
-from pure_utils.debug import around, caller, deltatime, profileit
+from pure_utils._internal._latency_stats import LatencyStats
+from pure_utils._internal._lazy_copy import LazyCopyProxy
+from pure_utils._internal._profile_aggregator import _get_flush_executor
+from pure_utils.debug import (
+    around,
+    caller,
+    callers,
+    deltatime,
+    memprofile,
+    profileit,
+)
+from pure_utils.metrics import Timer
 
 
 class TestAround:
@@ -51,6 +67,168 @@ class TestAround:
             )
 
 
+class TestAroundCopy:
+    @staticmethod
+    def mutating_handler(payload, **kwargs):
+        payload["items"].append("from handler")
+        kwargs["_pipe"]["payload"] = payload
+
+    @pytest.mark.parametrize(
+        "copy, changed, nested_changed",
+        (
+            ("none", True, True),
+            ("shallow", False, True),
+            ("deep", False, False),
+            ("lazy", False, False),
+        ),
+    )
+    def test_copy_strategies(self, copy, changed, nested_changed):
+        @around(before=self.mutating_handler, copy=copy)
+        def func(payload):
+            return payload
+
+        payload = {"items": []}
+        assert func(payload) is payload
+        assert (payload["items"] == ["from handler"]) is nested_changed
+
+        payload = {"items": [], "key": 1}
+
+        @around(before=lambda payload, **_: payload.pop("key"), copy=copy)
+        def func2(payload):
+            return payload
+
+        func2(payload)
+        assert ("key" not in payload) is changed
+
+    def test_default_copy_is_not_deep(self, mocker):
+        deepcopy_mock = mocker.patch("pure_utils.debug.deepcopy")
+
+        @around(before=lambda *args, **kwargs: None)
+        def func(payload):
+            return payload
+
+        func({"items": []})
+        deepcopy_mock.assert_not_called()
+
+    def test_copy_kwargs(self):
+        @around(before=lambda **kwargs: kwargs["payload"].append(1), copy="deep")
+        def func(*, payload):
+            return payload
+
+        assert func(payload=[]) == []
+
+    def test_lazy_copy_of_immutable_arguments(self):
+        calls = []
+
+        def handler(n, name, **kwargs):
+            calls.append((n + 1, n < 10, f"{n:>3}", json.dumps(name)))
+
+        @around(before=handler, copy="lazy")
+        def func(n, name):
+            return n
+
+        assert func(5, name="x") == 5
+        assert calls == [(6, True, "  5", '"x"')]
+
+    def test_unknown_copy_strategy(self):
+        with pytest.raises(ValueError, match="Unknown copy strategy"):
+            around(before=print, copy="unknown")
+
+
+class TestLazyCopyProxy:
+    def test_copy_on_access(self, mocker):
+        deepcopy_mock = mocker.patch(
+            "pure_utils._internal._lazy_copy.deepcopy", return_value=[1, 2]
+        )
+        proxy = LazyCopyProxy([1, 2])
+
+        deepcopy_mock.assert_not_called()
+        assert len(proxy) == 2
+        assert list(proxy) == [1, 2]
+        deepcopy_mock.assert_called_once()
+
+    def test_delegation(self):
+        target = {"key": [1]}
+        proxy = LazyCopyProxy(target)
+
+        proxy["key"].append(2)
+        proxy["other"] = 3
+        del proxy["other"]
+
+        assert proxy == {"key": [1, 2]}
+        assert "key" in proxy and bool(proxy)
+        assert list(proxy.keys()) == ["key"]
+        assert repr(proxy) == str(proxy) == "{'key': [1, 2]}"
+        assert target == {"key": [1]}
+
+    def test_operators(self):
+        proxy = LazyCopyProxy([1, 2])
+
+        assert proxy + [3] == [1, 2, 3] and [0] + proxy == [0, 1, 2]
+        assert proxy < [1, 3] and proxy >= [1, 2] and proxy != [2]
+        assert f"{LazyCopyProxy(1.5):.2f}" == "1.50"
+        assert -LazyCopyProxy(2) * 3 == -6 and 7 // LazyCopyProxy(2) == 3
+        assert [10, 20][LazyCopyProxy(1)] == 20
+        assert round(LazyCopyProxy(1.25), 1) == 1.2
+        assert LazyCopyProxy(len)("abc") == 3
+
+    def test_attributes(self):
+        class Target:
+            value = 1
+
+        target = Target()
+        proxy = LazyCopyProxy(target)
+        proxy.value = 2
+
+        assert proxy.value == 2
+        assert target.value == 1
+
+
+class TestAroundAsync:
+    def test_coroutine(self):
+        calls = []
+
+        async def before_handler(*args, **kwargs):
+            kwargs["_pipe"]["key"] = "data"
+            calls.append(("before", args))
+
+        def after_handler(*args, **kwargs):
+            calls.append(("after", kwargs["_pipe"]["key"]))
+
+        @around(before=before_handler, after=after_handler)
+        async def func(value):
+            await asyncio.sleep(0)
+            calls.append("func")
+            return value
+
+        assert asyncio.run(func(1)) == 1
+        assert calls == [("before", (1,)), "func", ("after", "data")]
+
+    def test_async_generator(self):
+        calls = []
+
+        @around(after=lambda *args, **kwargs: calls.append("after"))
+        async def func():
+            for i in range(3):
+                await asyncio.sleep(0)
+                calls.append(i)
+                yield i
+
+        async def consume():
+            return [item async for item in func()]
+
+        assert asyncio.run(consume()) == [0, 1, 2]
+        assert calls == [0, 1, 2, "after"]
+
+    def test_without_handlers(self):
+        @around()
+        async def func():
+            return True
+
+        with pytest.raises(ValueError):
+            asyncio.run(func())
+
+
 class TestCaller:
     def func1(self, at_frame=2):
         return caller(at_frame=at_frame)
@@ -72,6 +250,39 @@ class TestCaller:
         assert self.func3(at_frame=3) == "func3"
         assert self.func4(at_frame=4) == "func4"
 
+    def test_with_name_options(self):
+        def func():
+            return caller(qualname=True, module=True, lineno=True)
+
+        line = func.__code__.co_firstlineno + 5
+
+        assert func() == f"{__name__}.TestCaller.test_with_name_options:{line}"
+
+    def test_not_deep_enough_stack(self):
+        with pytest.raises(IndexError):
+            caller(at_frame=10_000)
+
+
+class TestCallers:
+    def func1(self, depth, **kwargs):
+        return callers(depth, **kwargs)
+
+    def func2(self, *args, **kwargs):
+        return self.func1(*args, **kwargs)
+
+    def func3(self, *args, **kwargs):
+        return self.func2(*args, **kwargs)
+
+    def test_chain(self):
+        assert self.func3(2) == ("func2", "func3")
+        assert self.func3(3) == ("func2", "func3", "test_chain")
+        assert self.func3(2, at_frame=1) == ("func1", "func2")
+        assert self.func3(1, qualname=True) == ("TestCallers.func2",)
+
+    def test_chain_is_limited_by_stack(self):
+        assert 3 < len(self.func3(10_000)) < 10_000
+        assert self.func3(3, at_frame=10_000) == ()
+
 
 class TestDeltatime:
     @deltatime()
@@ -100,6 +311,167 @@ class TestDeltatime:
         assert isinstance(delta, float)
         log_mock.assert_not_called()
 
+    def test_aggregate(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @deltatime(aggregate=True)
+        def func():
+            return True
+
+        assert all(func() is True for _ in range(2000))
+        assert func.__name__ == "func"
+        assert isinstance(func.stats, LatencyStats)
+
+        snapshot = func.stats.snapshot()
+        assert snapshot["count"] == 2000
+        assert 0 < snapshot["min"] <= snapshot["p50"] <= snapshot["p999"] <= snapshot["max"]
+        log_mock.assert_not_called()
+
+    def test_aggregate_with_logger(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @deltatime(logger=getLogger(), aggregate=True)
+        def func():
+            raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            func()
+
+        assert func.stats.count == 1
+        log_mock.assert_called_once()
+
+
+class TestDeltatimeAsync:
+    def test_coroutine(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @deltatime(logger=getLogger())
+        async def func():
+            await asyncio.sleep(0.05)
+            return True
+
+        retval, delta = asyncio.run(func())
+
+        assert retval is True
+        assert delta >= 0.05
+        log_mock.assert_called_once()
+
+    def test_coroutine_aggregate(self):
+        @deltatime(aggregate=True)
+        async def func():
+            await asyncio.sleep(0.01)
+            return True
+
+        async def run():
+            return await asyncio.gather(func(), func())
+
+        assert asyncio.run(run()) == [True, True]
+        assert func.stats.count == 2
+        assert func.stats.min >= 10_000_000
+
+    def test_async_generator(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @deltatime(logger=getLogger(), aggregate=True)
+        async def func():
+            for i in range(3):
+                await asyncio.sleep(0.01)
+                yield i
+
+        async def consume():
+            items = []
+            async for item in func():
+                items.append(item)
+                await asyncio.sleep(0.05)
+            return items
+
+        assert asyncio.run(consume()) == [0, 1, 2]
+        assert func.stats.count == 1
+        # Time of the consumer is not counted
+        assert 30_000_000 <= func.stats.max < 150_000_000
+        log_mock.assert_called_once()
+
+
+class TestDeltatimeTimer:
+    def test_paired(self):
+        timer = Timer("func_seconds")
+
+        @deltatime(timer=timer)
+        def func():
+            return True
+
+        assert func()[0] is True
+        assert timer.stats.count == 1
+
+    def test_aggregate(self):
+        timer = Timer("func_seconds")
+
+        @deltatime(aggregate=True, timer=timer)
+        def func():
+            return True
+
+        assert all(func() is True for _ in range(10))
+        assert func.stats.count == timer.stats.count == 10
+
+    def test_async_generator(self):
+        timer = Timer("func_seconds")
+
+        @deltatime(timer=timer)
+        async def func():
+            yield 1
+
+        async def run():
+            return [item async for item in func()]
+
+        assert asyncio.run(run()) == [1]
+        assert timer.stats.count == 1
+
+
+class TestLatencyStats:
+    def test_empty(self):
+        stats = LatencyStats()
+
+        assert stats.count == 0
+        assert stats.mean == 0.0
+        assert stats.quantile(0.99) == 0
+
+    def test_quantiles(self):
+        stats = LatencyStats()
+
+        for value in range(1, 100_001):
+            stats.record(value)
+
+        assert (stats.count, stats.min, stats.max) == (100_000, 1, 100_000)
+        assert stats.mean == 50_000.5
+        assert stats.quantile(0) == 1
+        assert stats.quantile(1) == 100_000
+
+        for q, expected in ((0.5, 50_000), (0.9, 90_000), (0.99, 99_000)):
+            assert stats.quantile(q) == pytest.approx(expected, rel=1 / 16)
+
+        assert set(stats.snapshot()) == {"count", "min", "max", "mean", "p50", "p90", "p99", "p999"}
+
+    def test_exact_small_values(self):
+        stats = LatencyStats()
+
+        for value in (3, 3, 3, 7):
+            stats.record(value)
+
+        assert stats.quantile(0.5) == 3
+        assert stats.quantile(1) == 7
+
+    def test_invalid_quantile(self):
+        with pytest.raises(ValueError, match="Quantile must be in range"):
+            LatencyStats().quantile(1.5)
+
+    def test_reset(self):
+        stats = LatencyStats()
+        stats.record(100)
+        stats.reset()
+
+        assert stats.count == 0
+        assert stats.snapshot()["max"] == 0
+
 
 class TestProfileit:
     def func1(self):
@@ -157,3 +529,485 @@ class TestProfileit:
             assert _ in profile_info
 
         log_mock.assert_not_called()
+
+
+class TestProfileitTimer:
+    def test_profiled_calls(self):
+        timer = Timer("func_seconds")
+
+        @profileit(timer=timer, every_n=2)
+        def func():
+            return True
+
+        assert [func()[0] for _ in range(4)] == [True] * 4
+        assert timer.stats.count == 2
+
+    def test_not_profiled(self):
+        timer = Timer("func_seconds")
+
+        @profileit(timer=timer)
+        def func():
+            return True
+
+        retval, profile_info = func()
+
+        assert retval is True
+        assert timer.stats.count == 1
+        # The timer works outside the profiler and doesn't get into the result
+        assert "(wrapper)" not in profile_info
+        assert "(record)" not in profile_info
+
+    def test_async_generator(self):
+        timer = Timer("func_seconds")
+
+        @profileit(timer=timer)
+        async def func():
+            for i in range(3):
+                await asyncio.sleep(0.01)
+                yield i
+
+        async def consume():
+            return [item async for item in func()]
+
+        assert asyncio.run(consume()) == [0, 1, 2]
+        assert timer.stats.count == 1
+        assert timer.stats.min >= 30_000_000
+
+    def test_coroutine_aggregate(self):
+        timer = Timer("func_seconds")
+
+        @profileit(timer=timer, aggregate=True)
+        async def func():
+            await asyncio.sleep(0.01)
+            return True
+
+        assert asyncio.run(func()) is True
+        assert timer.stats.count == 1
+        assert timer.stats.min >= 10_000_000
+
+
+class TestProfileitAsync:
+    @staticmethod
+    def busy():
+        return sum(range(1000))
+
+    @staticmethod
+    def own():
+        return sum(range(10))
+
+    def test_coroutine(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @profileit(logger=getLogger())
+        async def func():
+            await asyncio.sleep(0.01)
+            return self.own()
+
+        async def other():
+            await asyncio.sleep(0)
+            return self.busy()
+
+        async def run():
+            return await asyncio.gather(func(), other())
+
+        (retval, profile_info), _ = asyncio.run(run())
+
+        assert retval == 45
+        assert "(own)" in profile_info
+        # Other tasks, running while the coroutine is suspended, are not profiled
+        assert "(busy)" not in profile_info
+        log_mock.assert_called_once()
+
+    def test_coroutine_exception(self):
+        @profileit()
+        async def func():
+            await asyncio.sleep(0)
+            raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(func())
+
+    def test_async_generator(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @profileit(logger=getLogger())
+        async def func():
+            for i in range(3):
+                await asyncio.sleep(0)
+                yield self.own() + i
+
+        async def consume():
+            return [item async for item in func()]
+
+        assert asyncio.run(consume()) == [45, 46, 47]
+        log_mock.assert_called_once()
+        assert "(own)" in log_mock.call_args.kwargs["msg"]
+
+
+class TestProfileitSampling:
+    @staticmethod
+    def busy():
+        deadline = perf_counter() + 0.05
+        while perf_counter() < deadline:
+            pass
+        return True
+
+    def test_sampling(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @profileit(logger=getLogger(), sampling=True, sampling_interval=0.002)
+        def func():
+            return self.busy()
+
+        retval, profile_info = func()
+
+        assert retval is True
+        assert "(busy)" in profile_info
+        log_mock.assert_called_once()
+
+    def test_short_call(self):
+        @profileit(sampling=True)
+        def func():
+            return 1
+
+        @profileit(sampling=True, aggregate=True)
+        def func2():
+            return 2
+
+        retval, profile_info = func()
+
+        assert retval == 1
+        assert profile_info.startswith("0 function calls")
+        assert func2() == 2
+        assert func2.flush().startswith("0 function calls")
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires os.fork")
+    def test_aggregate_in_forked_child(self):
+        @profileit(sampling=True, sampling_interval=0.002, aggregate=True)
+        def func():
+            return self.busy()
+
+        # The sampler thread is started in the parent process
+        assert func() is True
+        func.flush()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            func()
+            os.write(write_fd, b"0" if func.flush().startswith("0 function calls") else b"1")
+            os._exit(0)
+
+        os.waitpid(pid, 0)
+        assert os.read(read_fd, 1) == b"1"
+
+    def test_sampling_async_generator(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @profileit(logger=getLogger(), sampling=True, sampling_interval=0.002)
+        async def func():
+            for _ in range(2):
+                await asyncio.sleep(0)
+                yield self.busy()
+
+        async def consume():
+            return [item async for item in func()]
+
+        assert asyncio.run(consume()) == [True, True]
+        assert "(busy)" in log_mock.call_args.kwargs["msg"]
+
+
+class TestProfileitAggregate:
+    @staticmethod
+    def own():
+        return sum(range(10))
+
+    def test_accumulation(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @profileit(logger=getLogger(), aggregate=True)
+        def func():
+            return self.own()
+
+        assert [func() for _ in range(3)] == [45, 45, 45]
+        log_mock.assert_not_called()
+
+        profile_info = func.flush()
+
+        assert re.search(r"\s3(\s+[\d.]+){4} test_debug.py:\d+\(own\)", profile_info)
+        log_mock.assert_called_once()
+        # Stats are dropped after the report
+        assert func.flush() is None
+
+    def test_flush_every(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+        report_mock = mocker.patch("pure_utils.debug._report_profileit", return_value="report")
+
+        @profileit(logger=getLogger(), aggregate=True, flush_every=2)
+        def func():
+            return True
+
+        assert all(func() for _ in range(5))
+        # Wait for the background reports
+        _get_flush_executor().submit(lambda: None).result()
+
+        assert report_mock.call_count == 2
+        assert func.flush() == "report"
+        log_mock.assert_not_called()
+
+    def test_flush_interval(self, mocker):
+        mocker.patch("logging.Logger.log")
+        monotonic_mock = mocker.patch("pure_utils._internal._profile_aggregator.monotonic")
+        monotonic_mock.return_value = 0.0
+
+        @profileit(logger=getLogger(), aggregate=True, flush_interval=10)
+        def func():
+            return True
+
+        func()
+        monotonic_mock.return_value = 11.0
+        func()
+
+        assert func.flush() is None
+
+    def test_reentrant_call_is_not_profiled(self, mocker):
+        @profileit(aggregate=True)
+        def func(depth):
+            return func(depth - 1) if depth else self.own()
+
+        assert func(3) == 45
+        assert "4/1" in func.flush()
+
+    def test_coroutine(self, mocker):
+        @profileit(aggregate=True)
+        async def func():
+            await asyncio.sleep(0)
+            return self.own()
+
+        async def run():
+            return await asyncio.gather(func(), func(), func())
+
+        assert asyncio.run(run()) == [45, 45, 45]
+        assert "(own)" in func.flush()
+
+    def test_flush_during_suspended_call(self, mocker):
+        report_mock = mocker.patch("pure_utils.debug._report_profileit", return_value="report")
+
+        @profileit(aggregate=True)
+        async def func():
+            await asyncio.sleep(0.01)
+            return self.own()
+
+        async def run():
+            task = asyncio.create_task(func())
+            await asyncio.sleep(0)
+            # The report is deferred until the end of the profiled call (without blocking)
+            assert func.flush() is None
+            return await task
+
+        assert asyncio.run(asyncio.wait_for(run(), timeout=5)) == 45
+        _get_flush_executor().submit(lambda: None).result()
+
+        report_mock.assert_called_once()
+        assert func.flush() is None
+
+    def test_async_generator(self):
+        with pytest.raises(ValueError, match="doesn't support async generators"):
+
+            @profileit(aggregate=True)
+            async def func():
+                yield True
+
+    @pytest.mark.parametrize(
+        "params",
+        (
+            {"flush_every": 10},
+            {"aggregate": True, "flush_every": 10},
+            {"logger": getLogger(), "aggregate": True, "flush_every": 0},
+            {"logger": getLogger(), "aggregate": True, "flush_interval": -1},
+        ),
+    )
+    def test_invalid_flush_params(self, params):
+        with pytest.raises(ValueError, match="Periodic reports"):
+            profileit(**params)
+
+
+class TestCallSampling:
+    def test_deltatime_every_n(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @deltatime(logger=getLogger(), every_n=3)
+        def func(value):
+            return value
+
+        results = [func(i) for i in range(7)]
+
+        assert [retval for retval, _ in results] == list(range(7))
+        assert [delta is not None for _, delta in results] == [False, False, True] * 2 + [False]
+        assert log_mock.call_count == 2
+
+    def test_deltatime_aggregate_sample_rate(self, mocker):
+        mocker.patch("pure_utils.debug.random", side_effect=[0.5] * 1000)
+
+        @deltatime(aggregate=True, sample_rate=0.5)
+        def func():
+            return True
+
+        assert all(func() for _ in range(100))
+        # With fixed random value the gaps are constant: int(log(0.5) / log(0.5)) + 1 == 2
+        assert func.stats.count == 50
+
+    def test_sample_rate_distribution(self):
+        @deltatime(aggregate=True, sample_rate=0.1)
+        def func():
+            return True
+
+        for _ in range(20_000):
+            func()
+
+        assert 1_600 < func.stats.count < 2_400
+
+    def test_profileit_every_n(self, mocker):
+        profile_mock = mocker.patch("pure_utils.debug.Profiler")
+
+        @profileit(every_n=2)
+        def func():
+            return True
+
+        assert func() == (True, None)
+        profile_mock.assert_not_called()
+
+        retval, _ = func()
+        profile_mock.assert_called_once()
+
+    def test_profileit_aggregate(self):
+        @profileit(aggregate=True, every_n=2)
+        def func():
+            return sum(range(10))
+
+        assert [func() for _ in range(4)] == [45] * 4
+        assert re.search(r"\s2(\s+[\d.]+){4} test_debug.py:\d+\(func\)", func.flush())
+
+    def test_coroutine(self):
+        @deltatime(every_n=2)
+        async def func():
+            await asyncio.sleep(0)
+            return True
+
+        async def run():
+            return [await func() for _ in range(2)]
+
+        (retval1, delta1), (retval2, delta2) = asyncio.run(run())
+
+        assert retval1 is retval2 is True
+        assert delta1 is None and isinstance(delta2, float)
+
+    def test_async_generator(self):
+        @deltatime(aggregate=True, every_n=2)
+        async def func():
+            yield 1
+            yield 2
+
+        async def run():
+            return [[item async for item in func()] for _ in range(4)]
+
+        assert asyncio.run(run()) == [[1, 2]] * 4
+        assert func.stats.count == 2
+
+    @pytest.mark.parametrize(
+        "params, message",
+        (
+            ({"sample_rate": 0.5, "every_n": 2}, "Only one of"),
+            ({"every_n": 0}, "must be positive"),
+            ({"sample_rate": 0}, "must be in range"),
+            ({"sample_rate": 1.5}, "must be in range"),
+        ),
+    )
+    def test_invalid_params(self, params, message):
+        with pytest.raises(ValueError, match=message):
+            deltatime(**params)
+
+        with pytest.raises(ValueError, match=message):
+            profileit(**params)
+
+
+class TestMemprofile:
+    @staticmethod
+    def allocate():
+        return [bytes(1024) for _ in range(100)]
+
+    def test_decorator(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        @memprofile(logger=getLogger(), top_n=1)
+        def func():
+            return self.allocate()
+
+        retval, profile_info = func()
+
+        assert len(retval) == 100
+        assert profile_info.startswith("peak ")
+        assert re.search(r"\+10[01] ", profile_info)
+        log_mock.assert_called_once()
+
+    def test_coroutine(self):
+        @memprofile()
+        async def func():
+            await asyncio.sleep(0)
+            return self.allocate()
+
+        retval, profile_info = asyncio.run(func())
+
+        assert len(retval) == 100
+        assert re.search(r"\+10[01] ", profile_info)
+
+    def test_context_manager(self, mocker):
+        log_mock = mocker.patch("logging.Logger.log")
+
+        with memprofile(logger=getLogger()) as profiler:
+            data = self.allocate()
+
+        assert profiler.stats.net >= len(data) * 1024
+        log_mock.assert_called_once()
+
+    def test_context_manager_sampling(self):
+        profiling = memprofile(every_n=2)
+        profilers = []
+
+        for _ in range(4):
+            with profiling as profiler:
+                profilers.append(profiler)
+
+        assert [profiler is not None for profiler in profilers] == [False, True, False, True]
+
+    def test_inline_context_manager_sampling(self):
+        profilers = []
+
+        for _ in range(4):
+            with memprofile(every_n=2) as profiler:
+                profilers.append(profiler)
+
+        assert [profiler is not None for profiler in profilers] == [False, True, False, True]
+
+    def test_nested_context_managers(self):
+        with memprofile() as outer:
+            with memprofile(every_n=1) as inner:
+                pass
+
+        assert outer is not None and inner is not None
+        assert outer.stats and inner.stats
+
+    def test_decorator_sampling(self):
+        @memprofile(every_n=2)
+        def func():
+            return True
+
+        assert [func()[1] is not None for _ in range(4)] == [False, True, False, True]
+
+    def test_async_generator(self):
+        with pytest.raises(ValueError, match="doesn't support async generators"):
+
+            @memprofile()
+            async def func():
+                yield True
@@ -0,0 +1,258 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+import pytest
+
+from pure_utils._internal._metrics_serializers import (
+    MetricsDictSerializer,
+    MetricsJSONSerializer,
+    MetricsPrometheusSerializer,
+)
+from pure_utils.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsExporter,
+    MetricsRegistry,
+    Timer,
+    export_metrics,
+    get_registry,
+)
+
+
+class TestCounter:
+    def test_inc(self):
+        counter = Counter("requests_total")
+        counter.inc()
+        counter.inc(2.5)
+
+        assert counter.value == 3.5
+
+    def test_concurrent_inc(self):
+        counter = Counter("requests_total")
+
+        def work(_):
+            for _ in range(10_000):
+                counter.inc()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(work, range(4)))
+
+        assert counter.value == 40_000
+
+    def test_negative_amount(self):
+        with pytest.raises(ValueError, match="can't be decreased"):
+            Counter("requests_total").inc(-1)
+
+    @pytest.mark.parametrize(
+        "name, labels", (("1requests", None), ("requests-total", None), ("ok", {"__x": "1"}))
+    )
+    def test_invalid_names(self, name, labels):
+        with pytest.raises(ValueError, match="Invalid"):
+            Counter(name, labels=labels)
+
+
+class TestGauge:
+    def test_updates_are_applied_in_order(self):
+        gauge = Gauge("in_progress")
+        gauge.inc()
+        gauge.inc(2)
+        gauge.set(10)
+        gauge.dec(3)
+
+        assert gauge.value == 7
+
+        gauge.set(1)
+        assert gauge.snapshot().value == 1
+
+
+class TestTimer:
+    def test_time(self):
+        timer = Timer("handle_seconds", quantiles=(0.5,))
+
+        with timer.time():
+            pass
+        timer.record(2_000_000_000)
+
+        value = timer.snapshot().value
+        assert value["count"] == 2
+        assert value["max"] == 2.0
+        assert 2.0 <= value["sum"] < 2.1
+        assert list(value["quantiles"]) == ["0.5"]
+
+    def test_invalid_quantiles(self):
+        with pytest.raises(ValueError, match="Quantile"):
+            Timer("handle_seconds", quantiles=(1.5,))
+
+    def test_negative_duration(self):
+        timer = Timer("handle_seconds")
+        timer.record(1_000)
+
+        with pytest.raises(ValueError, match="must not be negative"):
+            timer.record(-1)
+
+        # The stats are not corrupted
+        assert timer.snapshot().value["count"] == 1
+        assert timer.stats.min == timer.stats.max == 1_000
+
+
+class TestHistogram:
+    def test_buckets(self):
+        histogram = Histogram("response_bytes", buckets=(100, 1000))
+
+        for value in (10, 100, 500, 5000):
+            histogram.observe(value)
+
+        assert histogram.snapshot().value == {
+            "count": 4,
+            "sum": 5610,
+            "buckets": {"100.0": 2, "1000.0": 3, "+Inf": 4},
+        }
+
+    @pytest.mark.parametrize("buckets", ((), (1, 1), (2, 1)))
+    def test_invalid_buckets(self, buckets):
+        with pytest.raises(ValueError, match="Buckets"):
+            Histogram("response_bytes", buckets=buckets)
+
+
+class TestMetricsRegistry:
+    def test_get_or_create(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", labels={"method": "GET"})
+
+        assert registry.counter("requests_total", labels={"method": "GET"}) is counter
+        assert registry.counter("requests_total", labels={"method": "POST"}) is not counter
+        assert len(registry.snapshot()) == 2
+
+    def test_type_conflict(self):
+        registry = MetricsRegistry()
+        registry.counter("requests_total")
+
+        with pytest.raises(ValueError, match="already registered with type 'counter'"):
+            registry.gauge("requests_total", labels={"method": "GET"})
+
+    def test_register(self):
+        registry = MetricsRegistry()
+        timer = Timer("handle_seconds")
+        registry.register(timer)
+
+        assert registry.timer("handle_seconds") is timer
+
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register(Timer("handle_seconds"))
+
+    def test_default_registry(self):
+        assert get_registry() is get_registry()
+
+
+@pytest.fixture(scope="function")
+def registry():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Number of\nrequests", labels={"path": 'a"b'}).inc(3)
+    registry.counter("requests_total", labels={"path": "/"}).inc()
+    registry.gauge("temperature").set(-1.5)
+    registry.timer("handle_seconds", quantiles=(0.5, 0.99)).record(1_000_000)
+    registry.histogram("size_bytes", buckets=(10,)).observe(5)
+    return registry
+
+
+class TestSerializers:
+    def test_prometheus(self, registry):
+        result = MetricsPrometheusSerializer(registry.snapshot()).serialize()
+
+        assert result.splitlines() == [
+            "# HELP handle_seconds ",
+            "# TYPE handle_seconds summary",
+            'handle_seconds{quantile="0.5"} 0.001',
+            'handle_seconds{quantile="0.99"} 0.001',
+            "handle_seconds_sum 0.001",
+            "handle_seconds_count 1",
+            "# HELP requests_total Number of\\nrequests",
+            "# TYPE requests_total counter",
+            'requests_total{path="/"} 1',
+            'requests_total{path="a\\"b"} 3',
+            "# HELP size_bytes ",
+            "# TYPE size_bytes histogram",
+            'size_bytes_bucket{le="10.0"} 1',
+            'size_bytes_bucket{le="+Inf"} 1',
+            "size_bytes_sum 5",
+            "size_bytes_count 1",
+            "# HELP temperature ",
+            "# TYPE temperature gauge",
+            "temperature -1.5",
+        ]
+
+    def test_dict(self, registry):
+        result = MetricsDictSerializer(registry.snapshot()).serialize()
+
+        assert result["requests_total"]["type"] == "counter"
+        assert result["requests_total"]["metrics"] == [
+            {"labels": {"path": "/"}, "value": 1},
+            {"labels": {"path": 'a"b'}, "value": 3},
+        ]
+        assert result["handle_seconds"]["metrics"][0]["value"]["count"] == 1
+
+    def test_json(self, registry):
+        result = json.loads(MetricsJSONSerializer(registry.snapshot()).serialize())
+
+        assert result["temperature"]["metrics"][0]["value"] == -1.5
+        assert result["size_bytes"]["metrics"][0]["value"]["buckets"] == {"10.0": 1, "+Inf": 1}
+
+
+class TestExport:
+    def test_export_metrics(self, registry, tmp_path):
+        path = str(tmp_path / "app.prom")
+        export_metrics(path, registry=registry)
+
+        with open(path) as file:
+            assert "requests_total" in file.read()
+
+        assert os.listdir(tmp_path) == ["app.prom"]
+
+    def test_export_failure_cleans_up(self, registry, tmp_path, mocker):
+        mocker.patch("os.replace", side_effect=OSError)
+
+        with pytest.raises(OSError):
+            export_metrics(str(tmp_path / "app.prom"), registry=registry)
+
+        assert os.listdir(tmp_path) == []
+
+    def test_invalid_serializer(self, registry, tmp_path):
+        with pytest.raises(ValueError, match="string or bytes"):
+            export_metrics(str(tmp_path / "app.json"), serializer=MetricsDictSerializer)
+
+    def test_exporter(self, registry, tmp_path):
+        path = str(tmp_path / "app.json")
+
+        with MetricsExporter(
+            path, registry=registry, serializer=MetricsJSONSerializer, interval=0.01
+        ):
+            registry.counter("late_total").inc()
+
+        with open(path) as file:
+            assert json.load(file)["late_total"]["metrics"][0]["value"] == 1
+
+    def test_exporter_logs_errors(self, registry, tmp_path, mocker):
+        logger = getLogger()
+        log_mock = mocker.patch.object(logger, "exception")
+        exporter = MetricsExporter(str(tmp_path / "app.prom"), registry=registry, logger=logger)
+        exporter.start()
+
+        mocker.patch("pure_utils.metrics.export_metrics", side_effect=OSError)
+        exporter.stop()
+
+        log_mock.assert_called_once()
+
+    def test_exporter_invalid_params(self, tmp_path):
+        with pytest.raises(ValueError, match="interval"):
+            MetricsExporter(str(tmp_path / "app.prom"), interval=0)
+
+        exporter = MetricsExporter(str(tmp_path / "app.prom"))
+        exporter.start()
+        try:
+            with pytest.raises(RuntimeError, match="already started"):
+                exporter.start()
+        finally:
+            exporter.stop()
@@ -1,9 +1,30 @@
+import asyncio
+import gc
+import re
+import sys
+import tracemalloc
+import weakref
+from time import perf_counter
+
 import pytest
 
+from pure_utils._internal._line_stats_serializers import (
+    LineStatsStringSerializer,
+)
+from pure_utils._internal._memory_stats_serializers import (
+    MemoryStatsDictSerializer,
+    MemoryStatsStringSerializer,
+)
 from pure_utils._internal._profile_stats_serializers import (
     ProfileStatsSerializer,
+    ProfileStatsStringSerializer,
+)
+from pure_utils.profiler import (
+    LineProfiler,
+    MemoryProfiler,
+    Profiler,
+    SamplingProfiler,
 )
-from pure_utils.profiler import Profiler
 
 
 class DummuStringPStatsSerializer(ProfileStatsSerializer):
@@ -27,3 +48,306 @@ class TestProfiler:
 
         assert retval is True
         assert profiling_result == "Some serialized data"
+
+
+def busy_leaf(seconds):
+    deadline = perf_counter() + seconds
+    while perf_counter() < deadline:
+        pass
+
+
+def busy_func(seconds):
+    return busy_leaf(seconds) or True
+
+
+class TestSamplingProfiler:
+    def test_profiling(self):
+        profiler = SamplingProfiler(interval=0.002)
+        retval = profiler.profile(busy_func, 0.2)
+
+        stats = profiler.pstats.stats
+        leaf = next(label for label in stats if label[2] == "busy_leaf")
+        func = next(label for label in stats if label[2] == "busy_func")
+
+        assert retval is True
+        assert stats[leaf][0] > 10
+        # Time is attributed to the innermost function
+        assert stats[leaf][2] > 0.1
+        assert stats[func][2] < stats[leaf][2] <= stats[func][3]
+        assert func in stats[leaf][4]
+        # Frames above the profiled function are not sampled
+        assert not any(label[2] == "test_profiling" for label in stats)
+
+    def test_serialization(self):
+        profiler = SamplingProfiler(interval=0.002)
+        profiler.profile(busy_func, 0.05)
+
+        result = profiler.serialize_result(serializer=ProfileStatsStringSerializer, stack_size=10)
+
+        assert "(busy_leaf)" in result
+        assert "(busy_func)" in result
+
+    def test_no_samples(self):
+        # The call is shorter than the sampling interval
+        profiler = SamplingProfiler(interval=1)
+        retval = profiler.profile(func_for_profiling)
+        result = profiler.serialize_result(serializer=ProfileStatsStringSerializer, stack_size=10)
+
+        assert retval is True
+        assert profiler.pstats.stats == {}
+        assert result.startswith("0 function calls")
+
+    def test_coroutine(self):
+        profiler = SamplingProfiler(interval=0.002)
+
+        async def func():
+            await asyncio.sleep(0.05)
+            return busy_func(0.05)
+
+        async def other():
+            await asyncio.sleep(0.01)
+            busy_leaf(0.1)
+
+        async def run():
+            return await asyncio.gather(profiler.aprofile(func), other())
+
+        retval, _ = asyncio.run(run())
+        stats = profiler.pstats.stats
+
+        assert retval is True
+        assert any(label[2] == "busy_func" for label in stats)
+        # Samples of the other tasks are ignored
+        assert all(label[2] != "other" for label in stats)
+        assert sum(stat[2] for stat in stats.values()) < 0.1
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError, match="Sampling interval must be positive"):
+            SamplingProfiler(interval=0)
+
+
+def allocate(n):
+    return [bytes(1024) for _ in range(n)]
+
+
+def allocate_temporary(n):
+    return len(allocate(n))
+
+
+class TestMemoryProfiler:
+    def test_profiling(self):
+        profiler = MemoryProfiler()
+        data = profiler.profile(allocate, 1000)
+        stats = profiler.stats
+
+        assert len(data) == 1000
+        assert stats.net >= 1000 * 1024
+        assert stats.peak >= stats.net
+        assert stats.blocks >= 1000
+        assert stats.lines[0].filename.endswith("test_profiler.py")
+        assert 1000 <= stats.lines[0].blocks <= 1001
+        assert not tracemalloc.is_tracing()
+
+    def test_peak(self):
+        with MemoryProfiler() as profiler:
+            allocate_temporary(1000)
+
+        assert profiler.stats.peak >= 1000 * 1024
+        assert abs(profiler.stats.net) < 1024
+
+    def test_tracing_started_before(self):
+        tracemalloc.start()
+        try:
+            with MemoryProfiler() as profiler:
+                data = allocate(10)
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+        assert profiler.stats.net >= len(data) * 1024
+
+    def test_nested(self):
+        with MemoryProfiler() as outer:
+            with MemoryProfiler() as inner:
+                data = allocate(10)
+            data += allocate(20)
+
+        assert 10 <= inner.stats.blocks < 20
+        assert 30 <= outer.stats.blocks < 40
+        assert not tracemalloc.is_tracing()
+
+    def test_nested_peak(self):
+        with MemoryProfiler() as outer:
+            allocate_temporary(1000)
+
+            with MemoryProfiler() as inner:
+                allocate(1)
+
+        # The peak of the outer session is kept after reset of the peak by the nested one
+        assert outer.stats.peak >= 1000 * 1024
+        assert inner.stats.peak < 1000 * 1024
+
+    def test_coroutine(self):
+        async def func():
+            await asyncio.sleep(0)
+            return allocate(10)
+
+        profiler = MemoryProfiler()
+        asyncio.run(profiler.aprofile(func))
+
+        assert profiler.stats.blocks >= 10
+
+    def test_not_finished(self):
+        with pytest.raises(ValueError, match="not finished"):
+            MemoryProfiler().stats
+
+    def test_serializers(self):
+        profiler = MemoryProfiler()
+        data = profiler.profile(allocate, 100)
+
+        result = profiler.serialize_result(serializer=MemoryStatsStringSerializer, top_n=1)
+        assert result.startswith("peak ")
+        assert re.search(r"\+10[01] .*test_profiler.py", result)
+        assert result.count("test_profiler.py") == 1
+
+        result = profiler.serialize_result(serializer=MemoryStatsDictSerializer, top_n=1)
+        assert result["net"] >= len(data) * 1024
+        assert 100 <= result["lines"][0]["blocks"] <= 101
+        assert len(result["lines"]) == 1
+
+    @pytest.mark.parametrize(
+        "size, expected", ((100, "100 B"), (-2048, "-2.0 KiB"), (3 * 1024**2, "3.0 MiB"))
+    )
+    def test_format_size(self, size, expected):
+        profiler = MemoryProfiler()
+        profiler.profile(int)
+        serializer = MemoryStatsStringSerializer(profiler.stats, 1)
+
+        assert serializer.format_size(size) == expected
+
+
+def lines_for_profiling(n):
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+def generator_for_profiling(n):
+    for i in range(n):
+        yield i
+
+
+requires_monitoring = pytest.mark.skipif(
+    sys.version_info < (3, 12), reason="sys.monitoring is available in Python 3.12+"
+)
+
+
+class TestLineProfiler:
+    @requires_monitoring
+    def test_profiling(self):
+        profiler = LineProfiler()
+        retval = profiler.profile(lines_for_profiling, 10)
+        (stats,) = profiler.stats
+        first = lines_for_profiling.__code__.co_firstlineno
+
+        assert retval == 45
+        assert stats.name == "lines_for_profiling"
+        assert stats.firstlineno == first
+        assert [(line.lineno - first, line.hits) for line in stats.lines] == [
+            (1, 1),
+            (2, 11),
+            (3, 10),
+            (4, 1),
+        ]
+        assert stats.total_time == pytest.approx(sum(line.time for line in stats.lines))
+        assert all(line.time >= 0 for line in stats.lines)
+
+    @requires_monitoring
+    def test_only_chosen_functions(self):
+        with LineProfiler(lines_for_profiling) as profiler:
+            lines_for_profiling(1)
+            allocate(1)
+
+        assert [stats.name for stats in profiler.stats] == ["lines_for_profiling"]
+
+    @requires_monitoring
+    def test_generator(self):
+        with LineProfiler(generator_for_profiling) as profiler:
+            assert list(generator_for_profiling(3)) == [0, 1, 2]
+
+        (stats,) = profiler.stats
+        assert [line.hits for line in stats.lines] == [4, 3]
+
+    @requires_monitoring
+    def test_generator_started_before_enabling(self):
+        gen = generator_for_profiling(3)
+        assert next(gen) == 0
+
+        with LineProfiler(generator_for_profiling) as profiler:
+            assert list(gen) == [1, 2]
+
+        (stats,) = profiler.stats
+        assert [line.hits for line in stats.lines] == [3, 2]
+
+    @requires_monitoring
+    def test_profile_when_enabled(self):
+        with LineProfiler() as profiler:
+            profiler.profile(lines_for_profiling, 1)
+            lines_for_profiling(1)
+            lines_for_profiling(1)
+
+        (stats,) = profiler.stats
+        assert stats.lines[0].hits == 3
+
+    @requires_monitoring
+    def test_coroutine(self):
+        async def func():
+            await asyncio.sleep(0.05)
+            return 1
+
+        profiler = LineProfiler()
+        asyncio.run(profiler.aprofile(func))
+        (stats,) = profiler.stats
+
+        # Time of the suspension is not counted
+        assert [line.hits for line in stats.lines] == [1, 1]
+        assert stats.total_time < 0.05
+
+    @requires_monitoring
+    def test_serialization(self):
+        profiler = LineProfiler(lines_for_profiling)
+        profiler.profile(lines_for_profiling, 10)
+        result = profiler.serialize_result(serializer=LineStatsStringSerializer)
+
+        assert result.startswith(f"{__file__}:{lines_for_profiling.__code__.co_firstlineno}")
+        assert "line contents" in result
+        assert re.search(r"\s11\s.*for i in range\(n\):", result)
+
+    @requires_monitoring
+    def test_no_python_code(self):
+        with pytest.raises(ValueError, match="no Python code"):
+            LineProfiler(len)
+
+    @requires_monitoring
+    def test_disabled(self):
+        profiler = LineProfiler(lines_for_profiling)
+        lines_for_profiling(10)
+
+        assert profiler.stats == []
+
+    @requires_monitoring
+    def test_garbage_collected_after_disabling(self):
+        with LineProfiler(lines_for_profiling) as profiler:
+            lines_for_profiling(10)
+
+        ref = weakref.ref(profiler)
+        del profiler
+        gc.collect()
+
+        # Callbacks are unregistered and don't keep the profiler alive
+        assert ref() is None
+
+    @pytest.mark.skipif(sys.version_info >= (3, 12), reason="sys.monitoring is available")
+    def test_unsupported_version(self):
+        with pytest.raises(RuntimeError, match="requires Python 3.12"):
+            LineProfiler()